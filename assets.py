@@ -0,0 +1,157 @@
+import io
+import os
+import pygame
+from simulation.masks import Mask
+
+_MISSING = object()
+
+# --- DECODIFICADORES (SE PUEDEN LLAMAR DESDE HILOS: NO TOCAN LA PANTALLA) ---
+def decode_image(path):
+    if not os.path.exists(path):
+        print(f"Advertencia: No se encontró {path}")
+        return None
+    return pygame.image.load(path)
+
+def decode_sound(path):
+    if not os.path.exists(path) or not pygame.mixer.get_init(): return None
+    return pygame.mixer.Sound(path)
+
+def read_bytes(path):
+    if not os.path.exists(path): return None
+    with open(path, "rb") as f: return f.read()
+
+# --- CACHE GLOBAL DE IMAGENES (CADA HOJA SE DECODIFICA UNA SOLA VEZ) ---
+class AssetCache:
+    def __init__(self):
+        self._sheets = {}
+        self._surfaces = {}
+        self._sounds = {}
+        self._music = {}
+        self._masks = {}
+        self.hits = 0
+        self.misses = 0
+        # Cuenta cada Surface creada; en juego estable no debería moverse
+        self.allocations = 0
+
+    def _sheet(self, path):
+        sheet = self._sheets.get(path)
+        if sheet is None: sheet = self.put_sheet(path, decode_image(path))
+        return None if sheet is _MISSING else sheet
+
+    def put_sheet(self, path, surf):
+        """Guarda una hoja ya decodificada (la usa el precargador de states/loading.py)."""
+        # Sin ventana no se puede convertir (el Game se arma antes del set_mode)
+        if surf is not None and pygame.display.get_surface() is not None: surf = surf.convert_alpha()
+        self._sheets[path] = _MISSING if surf is None else surf
+        return self._sheets[path]
+
+    def has_sheet(self, path):
+        return path in self._sheets
+
+    def get(self, path, subrect=None, size=None, flip=False):
+        key = (path, subrect, size, flip)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return None if surf is _MISSING else surf
+
+        self.misses += 1
+        surf = self._sheet(path)
+        if surf is not None:
+            if subrect: surf = surf.subsurface(subrect)
+            if size: surf = pygame.transform.scale(surf, size)
+            if flip: surf = pygame.transform.flip(surf, True, False)
+            self.allocations += 1
+        self._surfaces[key] = _MISSING if surf is None else surf
+        return surf
+
+    def frame(self, path, index, count, size=None, flip=False):
+        """Cuadro `index` de una tira horizontal de `count` cuadros iguales."""
+        sheet = self._sheet(path)
+        if sheet is None: return None
+        fw = sheet.get_width() // count
+        return self.get(path, (index * fw, 0, fw, sheet.get_height()), size, flip)
+
+    def strip(self, path, count, size=None, flip=False):
+        if self._sheet(path) is None: return []
+        return [self.frame(path, i, count, size, flip) for i in range(count)]
+
+    def opaque(self, path, size=None):
+        """Fondo sin canal alfa (se pega más rápido a pantalla completa)."""
+        key = (path, None, size, "opaque")
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        surf = self.get(path, size=size)
+        if surf is not None and pygame.display.get_surface() is not None:
+            surf = surf.convert()
+            self.allocations += 1
+            self._surfaces[key] = surf
+        return surf
+
+    # --- MASCARAS DE COLISION ---
+    def mask(self, surf):
+        """Máscara por píxel (simulation.masks.Mask) de un cuadro del cache; se arma una sola vez."""
+        mask = self._masks.get(id(surf))
+        if mask is None:
+            pm = pygame.mask.from_surface(surf)
+            w, h = pm.get_size()
+            rows = []
+            for y in range(h):
+                row = 0
+                for x in range(w):
+                    if pm.get_at((x, y)): row |= 1 << x
+                rows.append(row)
+            mask = self._masks[id(surf)] = Mask(w, h, rows)
+        return mask
+
+    # --- SONIDOS ---
+    def sound(self, path):
+        snd = self._sounds.get(path)
+        if snd is None: snd = self.put_sound(path, decode_sound(path))
+        return None if snd is _MISSING else snd
+
+    def put_sound(self, path, snd):
+        self._sounds[path] = _MISSING if snd is None else snd
+        return self._sounds[path]
+
+    def load_music(self, path):
+        """Carga la música desde memoria (los bytes se leen una sola vez). False si no existe."""
+        data = self._music.get(path)
+        if data is None: data = self.put_music(path, read_bytes(path))
+        if data is _MISSING or not pygame.mixer.get_init(): return False
+        pygame.mixer.music.load(io.BytesIO(data), os.path.splitext(path)[1][1:])
+        return True
+
+    def put_music(self, path, data):
+        self._music[path] = _MISSING if data is None else data
+        return self._music[path]
+
+    def blank(self, size):
+        key = (None, None, size, False)
+        surf = self._surfaces.get(key)
+        if surf is None:
+            self.misses += 1
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            self.allocations += 1
+            self._surfaces[key] = surf
+        else:
+            self.hits += 1
+        return surf
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "allocations": self.allocations,
+                "sheets": len(self._sheets), "surfaces": len(self._surfaces),
+                "sounds": len(self._sounds), "music": len(self._music), "masks": len(self._masks)}
+
+    def clear(self):
+        self._sheets.clear()
+        self._surfaces.clear()
+        self._sounds.clear()
+        self._music.clear()
+        self._masks.clear()
+        self.hits = self.misses = self.allocations = 0
+
+
+ASSETS = AssetCache()
@@ -0,0 +1,114 @@
+import json
+import pygame
+from assets import ASSETS
+
+# --- MEZCLADOR: CANALES FIJOS POR CATEGORIA ---
+# Cada categoría tiene sus propios canales (la UI nunca le quita un canal al
+# juego ni al revés) y la alarma de tiempo tiene uno sólo para ella, así el
+# loop no queda en un canal cualquiera. Los volúmenes se aplican a los canales
+# cuando cambia la configuración, no en cada sonido: cada Sound guarda su
+# ganancia fija (p. ej. 0.15 para el "select") desde la primera vez que suena.
+# Si todos los canales de la categoría están ocupados, se le quita el canal
+# a la voz de menor prioridad (y entre iguales, a la más vieja).
+CATEGORIES = (("ui", 2), ("game", 6), ("warning", 1))
+MUSIC_GAIN = 0.2
+DEFAULT_BUFFER = 512  # muestras; menos = menos latencia (y más riesgo de cortes)
+
+def pre_init_mixer(config_path, frequency=44100):
+    """Tamaño de buffer del mezclador antes de pygame.init() (clave "audio_buffer" de config.json)."""
+    buffer = DEFAULT_BUFFER
+    try:
+        with open(config_path, "r") as f: buffer = int(json.load(f).get("audio_buffer", DEFAULT_BUFFER))
+    except (OSError, ValueError, TypeError, AttributeError):
+        pass
+    pygame.mixer.pre_init(frequency, -16, 2, buffer)
+    return buffer
+
+
+class AudioManager:
+    def __init__(self):
+        self.channels = {}   # categoría -> [Channel]
+        self.voices = {}     # Channel -> (prioridad, orden en que empezó)
+        self.volumes = {"music": 1.0, "sfx": 1.0}
+        self.gains = {}      # Sound -> ganancia ya aplicada
+        self.steals = 0
+        self.drops = 0
+        self._order = 0
+        self._ready = False
+
+    def _ensure(self):
+        # El mezclador puede iniciarse después del Game: los canales se arman al primer uso
+        if self._ready: return True
+        if not pygame.mixer.get_init(): return False
+        total = sum(n for _, n in CATEGORIES)
+        pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+        pygame.mixer.set_reserved(total)  # Sound.play() suelto nunca usa estos
+        i = 0
+        for name, n in CATEGORIES:
+            self.channels[name] = [pygame.mixer.Channel(i + k) for k in range(n)]
+            i += n
+        self._ready = True
+        self._apply_volumes()
+        return True
+
+    # --- VOLUMENES (SOLO AL CAMBIAR LA CONFIG) ---
+    def set_volumes(self, music, sfx):
+        if self.volumes["music"] == music and self.volumes["sfx"] == sfx: return
+        self.volumes["music"], self.volumes["sfx"] = music, sfx
+        self._apply_volumes()
+
+    def _apply_volumes(self):
+        if not self._ensure(): return
+        for chans in self.channels.values():
+            for ch in chans: ch.set_volume(self.volumes["sfx"])
+        pygame.mixer.music.set_volume(self.volumes["music"] * MUSIC_GAIN)
+
+    # --- EFECTOS ---
+    def play(self, sound, category="game", priority=0, gain=1.0, loops=0):
+        """Reproduce `sound` en un canal de `category`. Devuelve el Channel o None si se descartó."""
+        if sound is None or not self._ensure(): return None
+        if self.gains.get(sound) != gain:
+            sound.set_volume(gain)
+            self.gains[sound] = gain
+        ch = self._voice(category, priority)
+        if ch is None:
+            self.drops += 1
+            return None
+        self._order += 1
+        self.voices[ch] = (priority, self._order)
+        ch.play(sound, loops)
+        return ch
+
+    def _voice(self, category, priority):
+        victim, victim_key = None, None
+        for ch in self.channels[category]:
+            if not ch.get_busy(): return ch
+            key = self.voices.get(ch, (0, 0))
+            if key[0] <= priority and (victim is None or key < victim_key):
+                victim, victim_key = ch, key
+        if victim is not None:
+            self.steals += 1
+            victim.stop()
+        return victim
+
+    def loop(self, sound, category="warning", priority=0, gain=1.0):
+        return self.play(sound, category, priority, gain, loops=-1)
+
+    def stop(self, category):
+        if not self._ready: return
+        for ch in self.channels[category]: ch.stop()
+
+    # --- MUSICA (STREAMING, FUERA DE LOS CANALES) ---
+    def play_music(self, path, loops=-1):
+        if not ASSETS.load_music(path): return False
+        self._ensure()
+        pygame.mixer.music.play(loops)
+        return True
+
+    def stop_music(self):
+        if pygame.mixer.get_init(): pygame.mixer.music.stop()
+
+    def pause_music(self, paused):
+        if not pygame.mixer.get_init(): return
+        if paused: pygame.mixer.music.pause()
+        else: pygame.mixer.music.unpause()
@@ -0,0 +1,137 @@
+# --- GUARDA DE ASIGNACIONES (TRACEMALLOC) ---
+# Juega juego estable (nivel fijo, modo dios, la rana saltando de lado a
+# lado, sin monedas nuevas) bajo tracemalloc: una foto al terminar el
+# calentamiento y después dos tramos de N ticks, con SAMPLES fotos cada uno.
+# Lo que el código del juego retiene en una foto cualquiera es ruido chato
+# (los floats que justo están en los atributos): da lo mismo a los 1500 que
+# a los 12000 ticks. Una fuga en cambio crece con los ticks, así que lo que
+# se mide es la diferencia entre las medianas de los dos tramos: cuánto más
+# retuvo el segundo que el primero. Tampoco debe correr el recolector de basura (sus
+# pausas son tirones en pantalla). Con --deaths la rana sale sin modo dios:
+# muere en el tránsito, reaparece y nacen monedas, así también se miden las
+# cajas de la rana y de la cabeza del cocodrilo que se reusan al reaparecer.
+# La prueba es tests/test_allocs.py.
+#
+#   python -m bench.allocs --ticks 3000 --level 4
+#   python -m bench.allocs --render --vector
+#   python -m bench.allocs --deaths
+#
+# Sale con código 1 si hubo crecimiento o recolecciones durante la medición.
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.frames import make_game
+from constants import BASE_PATH, SIM_DT
+
+SAMPLES = 5  # fotos por tramo (se compara la mediana de cada uno)
+
+
+def run_guard(game, level, ticks, warmup, seed, render=False, move_every=30, deaths=False):
+    """Bloques/bytes que el código del juego retuvo a los `ticks` y a los 2*`ticks` ticks estables, y la diferencia.
+
+    Con `deaths` la rana también salta hacia el tránsito: muere, reaparece y recarga vidas
+    (tecla L) antes del fin de partida, con las monedas naciendo como siempre.
+    """
+    game.session.reset(seed)
+    game.level = level
+    game.change_state("PLAYING")
+    game.god_mode = not deaths
+    state = game.states["PLAYING"]
+    world = state.world
+    if not deaths: world.next_coin_spawn_time = sys.maxsize  # nacer una moneda sí es memoria nueva (y legítima)
+    moves = ("LEFT", "UP", "RIGHT", "UP") if deaths else ("LEFT", "RIGHT")
+
+    def tick(i):
+        if move_every and i % move_every == 0: world.apply(moves[(i // move_every) % len(moves)])
+        if deaths and game.lives <= 1: world.apply("LIVES")
+        state.update(SIM_DT)
+        if render: game.render()
+
+    # Se rastrea desde antes del calentamiento: lo que sólo se reemplaza da neto 0
+    tracemalloc.start()
+    for i in range(warmup): tick(i)
+    ours = [tracemalloc.Filter(True, os.path.join(BASE_PATH, "*")), tracemalloc.Filter(False, __file__)]
+
+    def snapshot():
+        # La foto crea muchos objetos: se barren sin recolección completa (ésa vacía
+        # las listas libres de CPython y cambia floats sin rastrear, de antes de
+        # tracemalloc.start, por rastreados: parece que el juego crece) y no cuentan
+        # como recolección del juego
+        shot = tracemalloc.take_snapshot().filter_traces(ours)
+        gc.collect(1)
+        return shot
+
+    gc.collect()
+    before = snapshot()
+    peak, collections, shots = 0, 0, []
+    for w in range(2):
+        # Varias fotos por tramo y se queda la mediana: una sola cae justo cuando
+        # hay o no hay floats vivos en las partículas o los carriles
+        window = []
+        for k in range(SAMPLES):
+            gc0 = gc.get_stats()[0]["collections"]
+            for i in range(warmup + w * ticks + k * ticks // SAMPLES, warmup + w * ticks + (k + 1) * ticks // SAMPLES):
+                current = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                tick(i)
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+            collections += gc.get_stats()[0]["collections"] - gc0
+            diff = snapshot().compare_to(before, "lineno")
+            window.append((sum(d.count_diff for d in diff), sum(d.size_diff for d in diff), diff))
+        window.sort(key=lambda shot: shot[0])
+        shots.append(window[SAMPLES // 2])
+    tracemalloc.stop()
+
+    first, second = ({str(d.traceback): d for d in diff} for _, _, diff in shots)
+    grew = sorted(((d.count_diff - (first[k].count_diff if k in first else 0), k) for k, d in second.items()), reverse=True)
+    net = [n for n, _, _ in shots]
+    return {
+        "net_blocks": net,
+        "net_bytes": [b for _, b, _ in shots],
+        "growth_blocks": net[1] - net[0],
+        "gc_gen0": collections,
+        "peak_tick_bytes": peak,
+        "growth": [(n, k) for n, k in grew if n > 0][:10],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comprueba que los ticks estables no asignan memoria")
+    parser.add_argument("--ticks", type=int, default=3000)
+    # Más de una vuelta del reloj de la rana (30 s): así los caches de texto ya tienen el pulso del TIME
+    parser.add_argument("--warmup", type=int, default=2400)
+    parser.add_argument("--level", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1234)
+    # Entre las medianas de los dos tramos el ruido chato va y viene en ±8 bloques;
+    # una fuga de un bloque cada 100 ticks ya suma 30 en el segundo tramo de 3000
+    parser.add_argument("--tolerance", type=int, default=12, help="bloques de crecimiento tolerados entre los dos tramos")
+    parser.add_argument("--render", action="store_true", help="incluir el render de cada frame")
+    parser.add_argument("--vector", action="store_true", help="usar el motor de carriles NumPy (simulation/soa.py)")
+    parser.add_argument("--deaths", action="store_true", help="sin modo dios: muertes, reapariciones y monedas")
+    args = parser.parse_args(argv)
+
+    game = make_game()
+    game.vector_lanes = args.vector
+    res = run_guard(game, args.level, args.ticks, args.warmup, args.seed, render=args.render, deaths=args.deaths)
+    (n1, n2), (b1, b2) = res["net_blocks"], res["net_bytes"]
+    print(f"{args.ticks} + {args.ticks} ticks (nivel {args.level}{', render' if args.render else ''}{', numpy' if args.vector else ''}{', muertes' if args.deaths else ''}): "
+          f"neto {n1} -> {n2} bloques ({b1} -> {b2} B), crecimiento {res['growth_blocks']}, GC gen0 {res['gc_gen0']}, "
+          f"pico por tick {res['peak_tick_bytes']} B")
+    for n, where in res["growth"]: print(f"  + {n} bloques  {where}")
+    if res["growth_blocks"] > args.tolerance or res["gc_gen0"] > 0:
+        print("FALLA: el juego estable asigna memoria")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# --- PARTIDAS EN LOTE (VARIOS NUCLEOS) ---
+# Juega miles de partidas con semilla, sin ventana ni audio, para ver cómo
+# se reparten puntajes, niveles alcanzados, causas de muerte y el costo del
+# tick en cada nivel. Cada proceso del pool arma su propio Game una sola vez y
+# maneja GameplayState como en el juego: las teclas entran por handle_events,
+# ya sea del piloto automático (bot) o de una secuencia al azar con la semilla
+# (script). Cada partida devuelve un resumen chico; el proceso principal los
+# va juntando a medida que llegan en un único informe.
+#
+#   python -m bench.batch --runs 1000 --out batch.json
+#   python -m bench.batch --runs 200 --input script --workers 4 --jsonl runs.jsonl
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Que SDL no se quede con SIGTERM/SIGINT: el pool tiene que poder cortar a sus procesos
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.frames import percentile
+
+# Lo que cada proceso arma una vez (ver _init_worker)
+_worker = {}
+
+
+def _init_worker(opts):
+    import pygame
+    from bench.frames import make_game
+    game = make_game()
+    game.vector_lanes = opts["vector"]
+    _worker.update(game=game, opts=opts, pygame=pygame)
+
+
+def run_one(seed):
+    """Una partida completa (o hasta --max-ticks). Devuelve su resumen."""
+    from constants import SIM_DT
+    from simulation.autopilot import Autopilot
+    game, opts, pygame = _worker["game"], _worker["opts"], _worker["pygame"]
+    rng = random.Random(seed)
+    keys = [game.controls["UP"]] * 4 + [game.controls["LEFT"], game.controls["RIGHT"], game.controls["DOWN"]]
+
+    game.session.reset(seed)
+    game.change_state("PLAYING")
+    state = game.states["PLAYING"]
+    world = state.world
+    if opts["input"] == "bot": state.autopilot = Autopilot(world, max_nodes=opts["nodes"])
+
+    levels = {}  # nivel -> [ticks, µs totales, µs del peor tick] (update + render, sin la entrada)
+    start = time.perf_counter()
+    input_time = 0.0
+    ticks = 0
+    # La partida termina al entrar en la transición de fin: GameOverState no llega a correr (ni toca la tabla)
+    while ticks < opts["max_ticks"] and world.pause_state != "GAME_OVER_TRANSITION":
+        events = []
+        if opts["input"] == "script" and ticks % 12 == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=rng.choice(keys)))
+        level = game.level
+        t0 = time.perf_counter()
+        game.handle_events(events)  # acá planea el piloto
+        t1 = time.perf_counter()
+        state.update(SIM_DT)
+        if opts["render"]: game.render()
+        us = (time.perf_counter() - t1) * 1e6
+        input_time += t1 - t0
+        acc = levels.get(level)
+        if acc is None: acc = levels[level] = [0, 0.0, 0.0]
+        acc[0] += 1
+        acc[1] += us
+        if us > acc[2]: acc[2] = us
+        ticks += 1
+
+    return {"seed": seed, "score": game.score, "level": game.level, "ticks": ticks,
+            "finished": world.pause_state == "GAME_OVER_TRANSITION", "deaths": dict(world.deaths),
+            "levels": levels, "seconds": time.perf_counter() - start, "input_seconds": input_time}
+
+
+class BatchReport:
+    """Junta los resúmenes de las partidas a medida que llegan."""
+    def __init__(self):
+        self.runs = 0
+        self.unfinished = 0
+        self.ticks = 0
+        self.busy = 0.0  # suma de lo que tardó cada partida (para ver cuánto rinde el paralelismo)
+        self.input = 0.0
+        self.scores = []
+        self.level_reached = Counter()
+        self.deaths = Counter()
+        self.levels = {}
+
+    def add(self, run):
+        self.runs += 1
+        self.unfinished += not run["finished"]
+        self.ticks += run["ticks"]
+        self.busy += run["seconds"]
+        self.input += run["input_seconds"]
+        self.scores.append(run["score"])
+        self.level_reached[run["level"]] += 1
+        self.deaths.update(run["deaths"])
+        for level, (ticks, total, worst) in run["levels"].items():
+            acc = self.levels.setdefault(int(level), [0, 0.0, 0.0])
+            acc[0] += ticks
+            acc[1] += total
+            acc[2] = max(acc[2], worst)
+
+    def summary(self, elapsed, workers):
+        n = max(1, self.runs)
+        scores = self.scores
+        return {
+            "runs": self.runs, "workers": workers, "unfinished": self.unfinished,
+            "seconds": round(elapsed, 2), "runs_per_s": round(self.runs / max(elapsed, 1e-9), 2),
+            "ticks_per_s": round(self.ticks / max(elapsed, 1e-9)),
+            "parallel_speedup": round(self.busy / max(elapsed, 1e-9), 2),
+            "input_us_per_tick": round(self.input * 1e6 / max(1, self.ticks), 1),
+            "score": {"mean": round(sum(scores) / n, 1), "p10": percentile(scores, 10), "p50": percentile(scores, 50),
+                      "p90": percentile(scores, 90), "max": max(scores, default=0)},
+            "level_reached": {lv: self.level_reached[lv] for lv in sorted(self.level_reached)},
+            "deaths": dict(self.deaths.most_common()),
+            "deaths_per_run": round(sum(self.deaths.values()) / n, 2),
+            "tick_cost": {lv: {"ticks": t, "mean_us": round(total / t, 1), "max_us": round(worst, 1)}
+                          for lv, (t, total, worst) in sorted(self.levels.items())},
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Muchas partidas con semilla en paralelo, con informe conjunto")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1, help="primera semilla (las demás son consecutivas)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--input", choices=("bot", "script"), default="bot", help="piloto automático o teclas al azar")
+    parser.add_argument("--nodes", type=int, default=1500, help="nodos por búsqueda del piloto")
+    parser.add_argument("--max-ticks", type=int, default=36000, help="corte por partida (36000 = 10 min de juego)")
+    parser.add_argument("--render", action="store_true", help="incluir el render de cada tick")
+    parser.add_argument("--vector", action="store_true", help="usar el motor de carriles NumPy (simulation/soa.py)")
+    parser.add_argument("--jsonl", help="ir escribiendo el resumen de cada partida en este archivo")
+    parser.add_argument("--out", help="guardar el informe conjunto en este JSON")
+    args = parser.parse_args(argv)
+
+    opts = {"vector": args.vector, "input": args.input, "nodes": args.nodes, "max_ticks": args.max_ticks, "render": args.render}
+    seeds = range(args.seed, args.seed + args.runs)
+    report = BatchReport()
+    stream = open(args.jsonl, "w") if args.jsonl else None
+    start = time.perf_counter()
+    try:
+        with multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(opts,)) as pool:
+            # Sin orden: cada resumen se suma apenas termina su partida
+            for run in pool.imap_unordered(run_one, seeds):
+                report.add(run)
+                if stream: stream.write(json.dumps(run) + "\n")
+                if report.runs % max(1, args.runs // 10) == 0:
+                    print(f"  {report.runs}/{args.runs} partidas ({time.perf_counter() - start:.1f} s)")
+            pool.close()
+            pool.join()
+    finally:
+        if stream: stream.close()
+    res = report.summary(time.perf_counter() - start, args.workers)
+
+    s = res["score"]
+    print(f"{res['runs']} partidas en {res['seconds']} s con {args.workers} procesos: {res['runs_per_s']} partidas/s, "
+          f"{res['ticks_per_s']} ticks/s, paralelismo x{res['parallel_speedup']}"
+          + (f" ({res['unfinished']} cortadas en --max-ticks)" if res["unfinished"] else ""))
+    print(f"puntaje: media {s['mean']}  p10 {s['p10']}  p50 {s['p50']}  p90 {s['p90']}  máx {s['max']}")
+    print("nivel alcanzado: " + "  ".join(f"{lv}:{n}" for lv, n in res["level_reached"].items()))
+    print(f"muertes ({res['deaths_per_run']} por partida): " + "  ".join(f"{k} {v}" for k, v in res["deaths"].items()))
+    print(f"costo del tick por nivel (update{' + render' if args.render else ''}; la entrada aparte: {res['input_us_per_tick']} µs/tick)")
+    for lv, c in res["tick_cost"].items():
+        print(f"  nivel {lv:>3}: {c['ticks']:>8} ticks  media {c['mean_us']:>7.1f} µs  peor {c['max_us']:>8.1f} µs")
+
+    if args.out:
+        with open(args.out, "w") as f: json.dump(res, f, indent=2)
+        print(f"Informe guardado en {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
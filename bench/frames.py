@@ -0,0 +1,173 @@
+# --- BENCHMARK DE FRAMES (UPDATE + RENDER) ---
+# Corre GameplayState sin ventana ni audio durante un número fijo de ticks en
+# varios niveles/dificultades y mide el costo de cada frame.
+#
+#   python -m bench.frames --out bench/baseline.json
+#   python -m bench.frames --compare bench/baseline.json --threshold 0.15
+#
+# En modo --compare sale con código 1 si alguna métrica empeoró más que el umbral.
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arcade_machine_sdk import GameMeta, BASE_RESOLUTION
+from constants import SIM_DT
+
+# (nombre, nivel, multiplicador de dificultad)
+SCENARIOS = [
+    ("level1", 1, 1.0),
+    ("level2", 2, 1.0),   # aparece el cocodrilo y la primera serpiente
+    ("level3", 3, 1.0),   # segunda serpiente
+    ("level4", 4, 1.0),   # serpiente sobre el tronco
+    ("level4_x2", 4, 2.0),
+    ("level4_x3", 4, 3.0),
+]
+
+# Métricas que se comparan contra la línea base (más alto = peor)
+COMPARED = ["frame_p50_ms", "frame_p95_ms", "frame_p99_ms", "update_p95_ms", "render_p95_ms",
+            "collision_checks_per_tick", "net_blocks_per_tick", "surface_allocs_per_tick"]
+
+
+def make_game():
+    from engine import Game
+    pygame.init()
+    screen = pygame.display.set_mode(BASE_RESOLUTION)
+    meta = (GameMeta().with_title("Frogger bench").with_description("bench")
+            .with_release_date("-").with_group_number(2).add_tag("bench").add_author("bench"))
+    game = Game(meta)
+    game.record_replays = False
+    game.start(screen)
+    # Sin jugador de verdad: la espera del buffer de saltos corre en tiempo simulado (partidas repetibles)
+    state = game.states["PLAYING"]
+    state.moves.clock = lambda: state.world.clock.ticks * SIM_DT
+    return game
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered: return 0.0
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def run_scenario(game, level, multiplier, ticks, seed, render=True):
+    from assets import ASSETS
+    rng = random.Random(seed)
+    keys = [game.controls["UP"]] * 4 + [game.controls["LEFT"], game.controls["RIGHT"], game.controls["DOWN"]]
+
+    game.session.reset(seed)
+    game.level, game.difficulty_multiplier = level, multiplier
+    game.lives = 10**6  # que nunca termine la partida durante la medición
+    game.change_state("PLAYING")
+    state = game.states["PLAYING"]
+    world = state.world
+
+    frame_ms, update_ms, render_ms = [], [], []
+    checks0 = world.collision_checks
+    surf0 = ASSETS.allocations
+    blocks_growth = 0
+    gc0 = gc.get_stats()[0]["collections"]
+
+    for i in range(ticks):
+        events = []
+        if i % 12 == 0: events.append(pygame.event.Event(pygame.KEYDOWN, key=rng.choice(keys)))
+        blocks = sys.getallocatedblocks()
+        t0 = time.perf_counter()
+        game.handle_events(events)
+        state.update(SIM_DT)
+        t1 = time.perf_counter()
+        if render: game.render()
+        t2 = time.perf_counter()
+        blocks_growth += max(0, sys.getallocatedblocks() - blocks)
+        update_ms.append((t1 - t0) * 1000)
+        render_ms.append((t2 - t1) * 1000)
+        frame_ms.append((t2 - t0) * 1000)
+
+    return {
+        "ticks": ticks,
+        "frame_p50_ms": percentile(frame_ms, 50),
+        "frame_p95_ms": percentile(frame_ms, 95),
+        "frame_p99_ms": percentile(frame_ms, 99),
+        "update_p50_ms": percentile(update_ms, 50),
+        "update_p95_ms": percentile(update_ms, 95),
+        "render_p50_ms": percentile(render_ms, 50),
+        "render_p95_ms": percentile(render_ms, 95),
+        "collision_checks_per_tick": (world.collision_checks - checks0) / ticks,
+        "net_blocks_per_tick": blocks_growth / ticks,
+        "surface_allocs_per_tick": (ASSETS.allocations - surf0) / ticks,
+        "gc_gen0_per_1k_ticks": (gc.get_stats()[0]["collections"] - gc0) * 1000 / ticks,
+        "entities": sum(len(g) for g in world.obstacle_groups()),
+    }
+
+
+def compare(current, baseline, threshold):
+    """Lista de (escenario, métrica, antes, ahora) que empeoraron más que `threshold`."""
+    regressions = []
+    for name, metrics in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base: continue
+        for key in COMPARED:
+            before, now = base.get(key), metrics.get(key)
+            if before is None or now is None: continue
+            # Tolerancia mínima para métricas que valen ~0 (evita falsos positivos)
+            if now > before * (1 + threshold) and now - before > 0.01:
+                regressions.append((name, key, before, now))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de update/render de GameplayState")
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--only", help="correr sólo estos escenarios (separados por coma)")
+    parser.add_argument("--vector", action="store_true", help="usar el motor de carriles NumPy (simulation/soa.py)")
+    parser.add_argument("--no-render", action="store_true", help="medir sólo la simulación")
+    parser.add_argument("--out", help="guardar los resultados en este JSON (línea base)")
+    parser.add_argument("--compare", help="JSON de línea base contra el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.15, help="empeoramiento tolerado (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    game = make_game()
+    game.vector_lanes = args.vector
+    wanted = set(args.only.split(",")) if args.only else None
+    results = {"meta": {"ticks": args.ticks, "seed": args.seed, "render": not args.no_render, "vector": args.vector,
+                        "python": platform.python_version(), "pygame": pygame.version.ver,
+                        "machine": platform.machine()},
+               "scenarios": {}}
+
+    for name, level, multiplier in SCENARIOS:
+        if wanted and name not in wanted: continue
+        res = run_scenario(game, level, multiplier, args.ticks, args.seed, render=not args.no_render)
+        results["scenarios"][name] = res
+        print(f"{name:<10} p50 {res['frame_p50_ms']:.3f}  p95 {res['frame_p95_ms']:.3f}  p99 {res['frame_p99_ms']:.3f} ms"
+              f"  checks/tick {res['collision_checks_per_tick']:.1f}  blocks/tick {res['net_blocks_per_tick']:.2f}"
+              f"  surfaces/tick {res['surface_allocs_per_tick']:.3f}")
+
+    if args.out:
+        with open(args.out, "w") as f: json.dump(results, f, indent=2)
+        print(f"Resultados guardados en {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f: baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, key, before, now in regressions:
+            print(f"REGRESION {name}.{key}: {before:.3f} -> {now:.3f}")
+        if regressions: return 1
+        print("Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
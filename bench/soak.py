@@ -0,0 +1,112 @@
+# --- SOAK CON PILOTO AUTOMATICO ---
+# Deja que el piloto automático (simulation/autopilot.py) juegue una partida
+# larga sin ventana: pasa nivel tras nivel y la dificultad sube un 15% con
+# cada uno, que es donde aparecen los problemas de rendimiento. Cuando quedan
+# pocas vidas aprieta la tecla de depuración de vidas (como un jugador con L).
+# Informa, por nivel, cuánto tardó, muertes, chequeos de colisión por tick y
+# el costo (en µs) del tick y del planificador.
+# Por defecto juega como en pantalla: choques por píxel y el mismo tope de
+# tiempo por búsqueda que el piloto en vivo. Con tope de tiempo las
+# decisiones dependen de la máquina; `--budget-ms 0` corta sólo por nodos y
+# la partida se repite igual con la misma semilla.
+#
+#   python -m bench.soak --ticks 200000
+#   python -m bench.soak --until-level 40 --vector --out soak.json
+#   python -m bench.soak --rect --budget-ms 0
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.frames import percentile
+from simulation.session import Session
+from simulation.world import World
+from simulation.autopilot import Autopilot, LIVE_BUDGET
+from simulation.layout import SIM_DT
+
+
+def run_soak(ticks, seed, vector=False, until_level=None, max_nodes=1500, budget=LIVE_BUDGET, pixel=True):
+    session = Session(seed)
+    world = World(session, vector_lanes=vector)
+    if pixel:
+        # Las máscaras salen de las imágenes: sólo así hace falta pygame
+        from entities.shapes import make_shapes
+        world.shapes = make_shapes()
+    world.start()
+    pilot = Autopilot(world, max_nodes=max_nodes, budget=budget)
+
+    levels = []
+    current = None
+    for i in range(ticks):
+        if current is None or current["level"] != session.level:
+            if until_level and session.level >= until_level: break
+            current = {"level": session.level, "multiplier": round(session.difficulty_multiplier, 2), "ticks": 0,
+                       "deaths": 0, "slots": 0, "step_us": [], "pilot_us": [], "checks": world.collision_checks}
+            levels.append(current)
+        t0 = time.perf_counter()
+        action = pilot.next_action()
+        t1 = time.perf_counter()
+        if action: world.apply(action)
+        world.step(SIM_DT)
+        t2 = time.perf_counter()
+        for ev in world.drain_events():
+            if ev[0] == "squash": current["deaths"] += 1
+            elif ev[0] == "slot": current["slots"] += 1
+        if session.lives <= 1: world.apply("LIVES")
+        current["ticks"] += 1
+        current["step_us"].append((t2 - t1) * 1e6)
+        current["pilot_us"].append((t1 - t0) * 1e6)
+
+    report = []
+    for k, lv in enumerate(levels):
+        step, pilot_us = lv.pop("step_us"), lv.pop("pilot_us")
+        n = max(1, lv["ticks"])
+        checks_end = levels[k + 1]["checks"] if k + 1 < len(levels) else world.collision_checks
+        lv.update({"checks": round((checks_end - lv["checks"]) / n, 1), "seconds": round(lv["ticks"] * SIM_DT, 1),
+                   "step_p50_us": round(percentile(step, 50), 1), "step_p99_us": round(percentile(step, 99), 1),
+                   "step_max_us": round(max(step, default=0), 1),
+                   "pilot_mean_us": round(sum(pilot_us) / n, 1), "pilot_max_ms": round(max(pilot_us, default=0) / 1000, 2)})
+        report.append(lv)
+    return {"seed": seed, "vector": vector, "pixel": pixel, "ticks": sum(lv["ticks"] for lv in report), "level": session.level,
+            "multiplier": round(session.difficulty_multiplier, 2), "score": session.score,
+            "searches": pilot.searches, "plans_to_goal": pilot.goals_found,
+            "nodes_per_search": round(pilot.nodes / max(1, pilot.searches), 1), "levels": report}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partida larga sin ventana jugada por el piloto automático")
+    parser.add_argument("--ticks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--until-level", type=int, help="cortar al llegar a este nivel")
+    parser.add_argument("--nodes", type=int, default=1500, help="nodos por búsqueda del planificador")
+    parser.add_argument("--budget-ms", type=float, default=LIVE_BUDGET * 1000,
+                        help="además, tope de tiempo por búsqueda (por defecto el de pantalla; 0 = sólo nodos)")
+    parser.add_argument("--vector", action="store_true", help="usar el motor de carriles NumPy (simulation/soa.py)")
+    parser.add_argument("--rect", action="store_true", help="choques por hitbox en vez de por píxel (sin pygame)")
+    parser.add_argument("--out", help="guardar el informe en este JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    res = run_soak(args.ticks, args.seed, args.vector, args.until_level, args.nodes,
+                   args.budget_ms / 1000 if args.budget_ms else None, not args.rect)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'nivel':>5} {'x dif':>6} {'seg':>6} {'muertes':>7} {'choques':>7} {'tick p50':>9} {'p99':>7} {'max':>7} {'piloto':>7} {'max ms':>7}")
+    for lv in res["levels"]:
+        print(f"{lv['level']:>5} {lv['multiplier']:>6.2f} {lv['seconds']:>6.1f} {lv['deaths']:>7} {lv['checks']:>7.1f} {lv['step_p50_us']:>9.1f} "
+              f"{lv['step_p99_us']:>7.1f} {lv['step_max_us']:>7.1f} {lv['pilot_mean_us']:>7.1f} {lv['pilot_max_ms']:>7.2f}")
+    print(f"{res['ticks']} ticks en {elapsed:.1f} s ({res['ticks'] / max(elapsed, 1e-9):.0f} ticks/s): nivel {res['level']}, "
+          f"dificultad x{res['multiplier']}, puntaje {res['score']}, {res['searches']} búsquedas "
+          f"({res['plans_to_goal']} hasta la meta, {res['nodes_per_search']} nodos de media)")
+
+    if args.out:
+        with open(args.out, "w") as f: json.dump(res, f, indent=2)
+        print(f"Informe guardado en {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,13 @@
 import os
 from arcade_machine_sdk import BASE_WIDTH, BASE_HEIGHT
+# Dimensiones, tiempo de vida de la rana y paso de simulación
+from simulation.layout import GAME_WIDTH, MARGIN_X, OFFSET_Y, TILE_SIZE, ROWS, MAX_TIME, SIM_HZ, SIM_DT, MAX_FRAME_TIME
 
 # Directorios
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
 IMG_DIR = os.path.join(BASE_PATH, "assest", "images")
 SOUND_DIR = os.path.join(BASE_PATH, "assest", "sounds") 
 
-# Dimensiones
-GAME_WIDTH = 640
-MARGIN_X = (BASE_WIDTH - GAME_WIDTH) // 2
-OFFSET_Y = 8
-TILE_SIZE = 40
-
-#Tiempo de vida de la rana
-MAX_TIME = 30  #Segundos
-
 # Rutas de Imágenes
 MAP_PATH = os.path.join(IMG_DIR, "Map.png")
 GOAL_PATH = os.path.join(IMG_DIR, "goal.png")
@@ -37,4 +30,15 @@ TIME_SOUND_PATH = os.path.join(SOUND_DIR, "time_frog.wav")
 EXTRALIFE_SOUND_PATH = os.path.join(SOUND_DIR, "frog_extralife.wav")
 SELECT_SOUND_PATH = os.path.join(SOUND_DIR, "select_option.mp3") 
 SLOT_SOUND_PATH = os.path.join(SOUND_DIR, "frog_slot.wav") # <--- NUEVO SONIDO DE META
-GAME_OVER_SOUND_PATH = os.path.join(SOUND_DIR, "Game_over.mp3")
\ No newline at end of file
+GAME_OVER_SOUND_PATH = os.path.join(SOUND_DIR, "Game_over.mp3")
+
+# --- PRECARGA AL ARRANCAR (states/loading.py) ---
+PRELOAD_IMAGES = [MAP_PATH, GOAL_PATH, FROG_PATH, DEATH_PATH, MENU_IMG_PATH, OPTIONS_IMG_PATH, COIN_PATH,
+                  os.path.join(IMG_DIR, "cars.png"), os.path.join(IMG_DIR, "turtle.png"),
+                  os.path.join(IMG_DIR, "Serpiente.png"), os.path.join(IMG_DIR, "cocodrilo.png"),
+                  os.path.join(IMG_DIR, "FondoGameOver.png")] + \
+                 [os.path.join(IMG_DIR, f"log{i}.png") for i in range(1, 4)] + \
+                 [os.path.join(IMG_DIR, f"gameover_{i}.png") for i in range(1, 8)]
+PRELOAD_SOUNDS = [COIN_SOUND_PATH, JUMP_SOUND_PATH, SQUASH_SOUND_PATH, TIME_SOUND_PATH,
+                  EXTRALIFE_SOUND_PATH, SELECT_SOUND_PATH, SLOT_SOUND_PATH]
+PRELOAD_MUSIC = [MENU_MUSIC_PATH, GAME_MUSIC_PATH, GAME_OVER_SOUND_PATH]
@@ -0,0 +1,108 @@
+import math
+import random
+import pygame
+
+# --- EFECTOS: TEXTOS FLOTANTES Y PARTICULAS (POOL FIJO) ---
+# Todos los efectos salen de un arreglo de objetos creado una sola vez: los
+# vivos ocupan items[:count] y al morir uno se intercambia con el último vivo,
+# así actualizar y dibujar no crea listas ni diccionarios. El desvanecido no
+# llama a set_alpha en cada frame: cada superficie (texto o partícula de un
+# color) tiene FADE_STEPS copias con el alpha ya puesto, armadas la primera
+# vez que se usan, y se elige la que toca según el tiempo que le queda.
+FADE_STEPS = 16
+
+class Effect:
+    __slots__ = ("x", "y", "vx", "vy", "gravity", "timer", "life", "frames")
+
+    def __init__(self):
+        self.x = self.y = self.vx = self.vy = self.gravity = 0.0
+        self.timer = self.life = 0.0
+        self.frames = None
+
+
+class EffectPool:
+    def __init__(self, capacity=128, particle_size=4):
+        self.items = [Effect() for _ in range(capacity)]
+        self.count = 0
+        self.dropped = 0  # efectos pedidos con el pool lleno
+        self.particle_size = particle_size
+        self._fades = {}
+        self._rng = random.Random(0xF0)  # sólo visual: no toca el azar de la simulación
+
+    def _fade(self, key, surf):
+        frames = self._fades.get(key)
+        if frames is None:
+            frames = self._fades[key] = []
+            per_pixel = surf.get_flags() & pygame.SRCALPHA
+            for i in range(FADE_STEPS + 1):
+                f = surf.copy()
+                a = 255 * i // FADE_STEPS
+                # Con alpha por píxel se multiplica ahí mismo: el blit sale igual de barato que uno opaco
+                if per_pixel: f.fill((255, 255, 255, a), special_flags=pygame.BLEND_RGBA_MULT)
+                else: f.set_alpha(a)
+                frames.append(f)
+        return frames
+
+    def _spawn(self, frames, x, y, vx, vy, gravity, life):
+        if self.count == len(self.items):
+            self.dropped += 1
+            return None
+        e = self.items[self.count]
+        self.count += 1
+        e.x, e.y, e.vx, e.vy, e.gravity = x, y, vx, vy, gravity
+        e.timer = e.life = life
+        e.frames = frames
+        return e
+
+    def text(self, key, surf, x, y, speed=40.0, life=1.0):
+        """Texto que sube y se desvanece. `key` identifica a `surf` (ya compuesta) en el cache de fundidos."""
+        return self._spawn(self._fade(key, surf), x, y, 0.0, -speed, 0.0, life)
+
+    def burst(self, x, y, color, n=12, speed=90.0, gravity=160.0, life=0.6):
+        """Estallido de `n` partículas cuadradas desde (x, y)."""
+        frames = self._dots(color)
+        rng = self._rng
+        for i in range(n):
+            ang = (i + rng.random()) * (2 * math.pi / n)
+            v = speed * (0.5 + rng.random() * 0.5)
+            if self._spawn(frames, x, y, math.cos(ang) * v, math.sin(ang) * v, gravity, life * (0.7 + rng.random() * 0.3)) is None:
+                break
+
+    def _dots(self, color):
+        frames = self._fades.get(color)
+        if frames is None:
+            dot = pygame.Surface((self.particle_size, self.particle_size))
+            dot.fill(color)
+            frames = self._fade(color, dot)
+        return frames
+
+    def prepare(self, colors=(), texts=()):
+        """Arma antes de jugar los fundidos de estos colores de partícula y (clave, superficie) de texto."""
+        for color in colors: self._dots(color)
+        for key, surf in texts: self._fade(key, surf)
+
+    def update(self, dt):
+        items = self.items
+        i = 0
+        while i < self.count:
+            e = items[i]
+            e.timer -= dt
+            if e.timer <= 0:
+                # Se cambia de lugar con el último vivo (sin crear nada)
+                self.count -= 1
+                items[i], items[self.count] = items[self.count], e
+                continue
+            e.vy += e.gravity * dt
+            e.x += e.vx * dt
+            e.y += e.vy * dt
+            i += 1
+
+    def draw(self, surface, rects):
+        items = self.items
+        for i in range(self.count):
+            e = items[i]
+            step = int(e.timer / e.life * FADE_STEPS + 0.5)
+            rects.append(surface.blit(e.frames[step], (int(e.x), int(e.y))))
+
+    def clear(self):
+        self.count = 0
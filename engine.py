@@ -1,14 +1,34 @@
 import pygame
 import os
-import json 
-from arcade_machine_sdk import GameBase, GameMeta, BASE_WIDTH, BASE_HEIGHT
-from constants import MAX_TIME, BASE_PATH
+from arcade_machine_sdk import GameBase, GameMeta, BASE_WIDTH, BASE_HEIGHT, DEFAULT_FPS
+from constants import BASE_PATH, SIM_DT, MAX_FRAME_TIME
 from states.menu import MenuState
 from states.gameplay import GameplayState
 from states.game_over import GameOverState
 from states.options import OptionsState
+from states.loading import LoadingState
+from fonts import TextRenderer
+from profiler import FrameProfiler
+from simulation.session import Session
+from simulation.timelines import AnimClock
+from settings import SettingsStore
+from leaderboard import Leaderboard
+from audio import AudioManager, DEFAULT_BUFFER
+from upscale import PixelUpscaler
+
+def _session_attr(name):
+    # Los datos de la partida viven en la simulación; Game los expone tal cual
+    return property(lambda self: getattr(self.session, name), lambda self, value: setattr(self.session, name, value))
 
 class Game(GameBase):
+    lives = _session_attr("lives")
+    level = _session_attr("level")
+    score = _session_attr("score")
+    time_left = _session_attr("time_left")
+    difficulty_multiplier = _session_attr("difficulty_multiplier")
+    god_mode = _session_attr("god_mode")
+    slots_ocupados = _session_attr("slots_ocupados")
+
     def __init__(self, metadata: GameMeta) -> None:
         super().__init__(metadata)
         pygame.font.init()
@@ -22,20 +42,61 @@ class Game(GameBase):
             self.font_ui = pygame.font.SysFont("Arial", 20, bold=True)
             self.font_menu = pygame.font.SysFont("Arial", 30, bold=True)
             self.font_big = pygame.font.SysFont("Arial", 40, bold=True)
+        # Atlas de glifos de las tres fuentes con cache de textos ya compuestos
+        self.text = TextRenderer({"ui": self.font_ui, "menu": self.font_menu, "big": self.font_big})
+        
+        self.session = Session()
         
-        self.lives = 5
-        self.level = 1
-        self.score = 0
-        self.time_left = MAX_TIME
-        self.difficulty_multiplier = 1.0
-        self.god_mode = False 
-        self.slots_ocupados = [False] * 5
+        # Pulsos y parpadeos de pantalla: líneas de tiempo en milisegundos, evaluadas una vez por frame
+        self.ui_clock = AnimClock()
+        
+        # Tiempos por subsistema para el panel de depuración (F3); apagado no mide nada
+        self.profiler = FrameProfiler()
         
         self.config_path = os.path.join(BASE_PATH, "config.json")
+        # Config + high score en memoria; se guardan en segundo plano (nunca en el frame)
+        self.settings = SettingsStore(self.config_path)
+        self.high_score = 0
+        # Todas las partidas terminadas, con puesto y top-10 al instante (se carga en LoadingState)
+        self.leaderboard = Leaderboard(os.path.join(BASE_PATH, "scores.dat"))
         
         # --- AHORA TENEMOS DOS VOLÚMENES SEPARADOS ---
         self.volume = 1.0      # Para la música de fondo
         self.sfx_volume = 1.0  # Para los efectos de sonido (saltos, monedas, etc)
+        # Canales fijos por categoría; los volúmenes se aplican sólo al cambiar la config
+        self.audio = AudioManager()
+        self.audio_buffer = DEFAULT_BUFFER  # lo usa main.py antes de pygame.init()
+        
+        # Render por rectángulos sucios (False = redibujar toda la pantalla cada frame)
+        self.dirty_rendering = True
+        self.dirty_rects = None  # None = el frame se presenta completo
+        
+        # Pantallas de al menos el doble de la base: dibujar en un lienzo de resolución base y
+        # escalarlo entero al final (upscale.py). Con la pantalla base del Core no cambia nada.
+        self.lowres_render = False
+        self.window_scale = 1  # sólo run_independently: ventana de N veces la base (como un gabinete grande)
+        self.upscaler = None
+        
+        # Paso fijo: el tiempo real se acumula y se consume en ticks de SIM_DT.
+        # `alpha` es la fracción de tick pendiente, para interpolar al dibujar.
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.render_fps = DEFAULT_FPS
+        
+        # Autos/troncos/tortugas/cocodrilos en arreglos NumPy (si está instalado)
+        self.vector_lanes = False
+        
+        # Choques por píxel (máscaras de cada cuadro) en vez de los hitbox ajustados a mano
+        self.pixel_collisions = True
+        
+        # Segundos de historia que guarda el rebobinado (una foto por tick); 0 = apagado
+        self.rewind_seconds = 5.0
+        
+        # Cada partida se graba (semilla + acciones por tick) en replays/
+        self.record_replays = True
+        
+        # Demo: tras un rato sin tocar el menú, la partida la juega el piloto automático
+        self.attract = False
         
         self.controls = {
             "UP": pygame.K_UP,
@@ -50,73 +111,140 @@ class Game(GameBase):
             "START": MenuState(self),
             "PLAYING": GameplayState(self),
             "GAME_OVER": GameOverState(self),
-            "OPTIONS": OptionsState(self) 
+            "OPTIONS": OptionsState(self),
+            "LOADING": LoadingState(self, "START")
         }
         
-        self.current_state = self.states["START"]
+        # Arranca precargando todo en segundo plano; al terminar pasa al menú
+        self.current_state = self.states["LOADING"]
         if hasattr(self.current_state, "on_enter"):
             self.current_state.on_enter()
 
     def load_config(self):
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, "r") as f:
-                    data = json.load(f)
-                    self.volume = data.get("volume", 1.0)
-                    self.sfx_volume = data.get("sfx_volume", 1.0) # <--- CARGA EL NUEVO VOLUMEN
-                    saved_controls = data.get("controls", {})
-                    for key, val in saved_controls.items():
-                        if key in self.controls:
-                            self.controls[key] = val
-            except Exception as e:
-                print(f"Error cargando config: {e}")
+        data = self.settings
+        self.volume = data.get("volume", 1.0)
+        self.sfx_volume = data.get("sfx_volume", 1.0) # <--- CARGA EL NUEVO VOLUMEN
+        self.dirty_rendering = data.get("dirty_rendering", True)
+        self.lowres_render = data.get("lowres_render", False)
+        self.window_scale = data.get("window_scale", 1)
+        self.render_fps = data.get("render_fps", DEFAULT_FPS)
+        self.record_replays = data.get("record_replays", True)
+        self.vector_lanes = data.get("vector_lanes", False)
+        self.pixel_collisions = data.get("pixel_collisions", True)
+        self.rewind_seconds = data.get("rewind_seconds", 5.0)
+        self.audio_buffer = data.get("audio_buffer", DEFAULT_BUFFER)
+        self.high_score = data.get("high_score", 0)
+        saved_controls = data.get("controls", {})
+        for key, val in saved_controls.items():
+            if key in self.controls:
+                self.controls[key] = val
+        self.audio.set_volumes(self.volume, self.sfx_volume)
 
     def save_config(self):
-        data = {
+        # Sólo actualiza la memoria: el disco lo toca el escritor de SettingsStore
+        self.settings.update({
             "volume": self.volume,
             "sfx_volume": self.sfx_volume, # <--- GUARDA EL NUEVO VOLUMEN
+            "dirty_rendering": self.dirty_rendering,
+            "lowres_render": self.lowres_render,
+            "window_scale": self.window_scale,
+            "render_fps": self.render_fps,
+            "record_replays": self.record_replays,
+            "vector_lanes": self.vector_lanes,
+            "pixel_collisions": self.pixel_collisions,
+            "rewind_seconds": self.rewind_seconds,
+            "audio_buffer": self.audio_buffer,
             "controls": self.controls
-        }
-        try:
-            with open(self.config_path, "w") as f:
-                json.dump(data, f)
-        except Exception as e:
-            print(f"Error guardando config: {e}")
+        })
+        self.audio.set_volumes(self.volume, self.sfx_volume)
+
+    def record_high_score(self, score):
+        """True si `score` es nuevo récord (queda guardado junto con la config)."""
+        if score <= self.high_score or score <= 0: return False
+        self.high_score = score
+        self.settings.set("high_score", score)
+        return True
 
     def _add_score(self, points):
-        old_score = self.score
-        self.score += points
-        if (self.score // 5000) > (old_score // 5000):
-            self.lives += (self.score // 5000) - (old_score // 5000)
+        self.session.add_score(points)
+
+    def start(self, surface):
+        super().start(surface)
+        self.upscaler = PixelUpscaler(surface) if self.lowres_render and PixelUpscaler.fits(surface) else None
 
     def change_state(self, state_name):
+        self.current_state.on_exit()
         if state_name == "START" or (state_name == "PLAYING" and self.lives <= 0):
-            self.lives = 5
-            self.level = 1
-            self.score = 0
-            self.difficulty_multiplier = 1.0
-            self.slots_ocupados = [False] * 5
+            self.session.reset()
             
         self.current_state = self.states[state_name]
         if hasattr(self.current_state, "on_enter"):
             self.current_state.on_enter()
 
     def update(self, dt):
-        self.current_state.update(dt)
+        self.profiler.push("update")
+        self.accumulator += min(dt, MAX_FRAME_TIME)
+        while self.accumulator >= SIM_DT:
+            self.current_state.update(SIM_DT)
+            self.accumulator -= SIM_DT
+        self.alpha = self.accumulator / SIM_DT
+        self.profiler.pop()
 
     def handle_events(self, events):
+        self.profiler.push("events")
         self.current_state.handle_events(events)
+        self.profiler.pop()
 
     def render(self, surface=None):
-        if surface is None: surface = self.surface
+        up = self.upscaler if surface is None else None
+        if surface is None: surface = up.canvas if up else self.surface
+        # Los estados que soportan rect-sucio dejan aquí la lista de zonas cambiadas
+        self.dirty_rects = None
+        self.ui_clock.set(pygame.time.get_ticks())
+        self.profiler.push("render")
         self.current_state.render(surface)
+        self.profiler.pop()
+        if up:
+            # Un solo escalado por frame; las zonas sucias pasan a coordenadas de pantalla
+            self.profiler.push("upscale")
+            self.dirty_rects = up.present(self.dirty_rects)
+            self.profiler.pop()
+        self.profiler.end_frame()
+
+    def run_independently(self):
+        # Mismo loop que el del SDK, pero presentando sólo los rects sucios cuando los hay
+        screen = pygame.display.set_mode((BASE_WIDTH * self.window_scale, BASE_HEIGHT * self.window_scale))
+        pygame.display.set_caption(self.metadata.title)
+        clock = pygame.time.Clock()
+        self.start(screen)
+
+        try:
+            while self._running:
+                events = pygame.event.get()
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        self.stop()
+                        break
+
+                if self._running: self.handle_events(events)
+                if self._running: self.update(clock.get_time() / 1000.0)
+                if self._running:
+                    self.render()
+                    if self.dirty_rects is None: pygame.display.flip()
+                    elif self.dirty_rects: pygame.display.update(self.dirty_rects)
+
+                # Bajar render_fps no frena el juego: se simulan más ticks por frame
+                clock.tick(self.render_fps)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # Cierra lo que el estado tenga abierto (p. ej. la grabación de la partida)
+            self.current_state.on_exit()
+            self.settings.flush()
+            self.leaderboard.flush()
+            self.stop()
+            pygame.quit()
 
     def _draw_text_with_shadow(self, surface, text, pos, color=(255, 255, 255)):
-        txt_borde = self.font_ui.render(text, False, (0, 0, 0))
-        offsets = [(-2, -2), (2, -2), (-2, 2), (2, 2), (0, -2), (0, 2), (-2, 0), (2, 0)]
-        for ox, oy in offsets:
-            surface.blit(txt_borde, (pos[0] + ox, pos[1] + oy))
-        
-        surface.blit(txt_borde, (pos[0] + 4, pos[1] + 4))
-        txt_color = self.font_ui.render(text, False, color)
-        surface.blit(txt_color, pos)
\ No newline at end of file
+        # Borde y sombra vienen horneados en el atlas: un solo blit por texto
+        return self.text.draw(surface, text, pos, color)
\ No newline at end of file
@@ -0,0 +1,58 @@
+import os
+from assets import ASSETS
+from constants import IMG_DIR, FROG_PATH
+from entities.obstacles import CarSprite, SnakeSprite, CrocodileSprite, TurtleSprite
+from simulation.masks import Mask, ShapeSet
+
+# --- MASCARAS DE LOS CUERPOS (LADO VISTA) ---
+# Para cada clave de forma (Body.shape_key()) busca el mismo cuadro que
+# dibuja su sprite (tortugas y cocodrilo: el de su línea de tiempo en ese
+# tick) y saca la máscara del cache de imágenes. Se arma la primera vez que
+# la simulación la pide; si falta la imagen, vale el rect.
+FROG_FRAMES = {"UP": 0, "DOWN": 2, "LEFT": 4, "RIGHT": 6}
+TURTLE_FRAMES = 9
+
+
+def _surface(key):
+    kind, size = key[0], (key[1], key[2])
+    if kind == "car": return ASSETS.frame(CarSprite.path, key[3], 4, size, flip=key[4])
+    if kind == "log": return ASSETS.get(os.path.join(IMG_DIR, f"log{key[3]}.png"), size=size)
+    if kind == "turtle": return ASSETS.frame(TurtleSprite.path, key[3], TURTLE_FRAMES, size)
+    if kind == "snake": return ASSETS.frame(SnakeSprite.path, key[3], 3, size, flip=key[4])
+    # Cocodrilo: cuadro 1 = boca cerrada, 0 = abierta; la hoja mira a la derecha
+    if kind == "croc": return ASSETS.frame(CrocodileSprite.path, 1 if key[4] == "CLOSED" else 0, 2, size, flip=not key[3])
+    if kind == "croc_head": return ASSETS.frame(CrocodileSprite.path, 0, 2, size, flip=not key[3])
+    if kind == "frog": return ASSETS.frame(FROG_PATH, FROG_FRAMES[key[3]] + key[4], 8, size)
+    return None
+
+
+def build_mask(key):
+    # Tortuga bajo el agua (cuadro -1): no se dibuja, así que no hay nada que pisar
+    if key[0] == "turtle" and key[3] < 0: return Mask(key[1], key[2], [0] * key[2])
+    surf = _surface(key)
+    mask = ASSETS.mask(surf) if surf is not None else Mask.box(key[1], key[2])
+    if key[0] == "croc_head":
+        # Sólo la mandíbula: los 40 px del extremo hacia donde avanza
+        mask = mask.clip(mask.w - 40, mask.w) if key[3] else mask.clip(0, 40)
+    return mask
+
+
+def make_shapes():
+    return ShapeSet(build_mask)
+
+
+def warm(shapes, world):
+    """Arma de antemano las máscaras de todo lo que hay en `world` (así no se arman en pleno juego)."""
+    for group in world.obstacle_groups():
+        for body in group: shapes.get(body.shape_key())
+    for turtle in world.turtles:
+        for frame in range(-1, TURTLE_FRAMES): shapes.get(turtle.shape[:3] + (frame,))
+    for croc in world.crocodiles:
+        for state in ("CLOSED", "OPEN"): shapes.get(croc.shape[:4] + (state,))
+        shapes.get(croc.head_shape)
+    for snake in world.snakes:
+        for i in range(snake.frame_count):
+            for right in (False, True): shapes.get(("snake", snake.rect.w, snake.rect.h, i, right))
+    frog = world.frog
+    for direction in FROG_FRAMES:
+        for index in (0, 1): shapes.get(("frog", frog.rect.w, frog.rect.h, direction, index))
@@ -0,0 +1,160 @@
+import pygame
+from collections import OrderedDict
+
+GLYPHS = "".join(chr(c) for c in range(32, 127))
+
+# Desplazamientos de la sombra negra de cada estilo (el color va en (0, 0))
+STYLES = {
+    "outline": ((-2, -2), (2, -2), (-2, 2), (2, 2), (0, -2), (0, 2), (-2, 0), (2, 0), (4, 4)),
+    "shadow": ((3, 3),),
+    "shadow_small": ((2, 2),),
+    "plain": (),
+}
+
+# --- ATLAS DE GLIFOS DE UNA FUENTE ---
+# Todos los caracteres se rasterizan una vez en una hoja blanca. Cada color es
+# una copia teñida de esa hoja y cada estilo tiene su hoja de sombra ya horneada.
+class GlyphAtlas:
+    def __init__(self, font, max_colors=32):
+        self.font = font
+        self.height = font.get_height()
+        self.max_colors = max_colors
+        self.rects, self.advance = {}, {}
+
+        glyphs = [(ch, font.render(ch, False, (255, 255, 255))) for ch in GLYPHS]
+        x = 0
+        for ch, surf in glyphs:
+            self.rects[ch] = pygame.Rect(x, 0, surf.get_width(), self.height)
+            self.advance[ch] = surf.get_width()
+            x += surf.get_width()
+        self.white = pygame.Surface((max(1, x), self.height), pygame.SRCALPHA)
+        for ch, surf in glyphs: self.white.blit(surf, self.rects[ch])
+
+        self._tinted = OrderedDict()
+        self._shadows = {}
+
+    def covers(self, text):
+        return all(ch in self.rects for ch in text)
+
+    def text_width(self, text):
+        return sum(self.advance[ch] for ch in text)
+
+    def tinted(self, color):
+        color = tuple(color)
+        sheet = self._tinted.get(color)
+        if sheet is None:
+            sheet = self.white.copy()
+            sheet.fill((*color[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+            self._tinted[color] = sheet
+            if len(self._tinted) > self.max_colors: self._tinted.popitem(last=False)
+        else:
+            self._tinted.move_to_end(color)
+        return sheet
+
+    def shadow(self, style):
+        """Hoja de sombras de `style`: cada celda trae la sombra completa del glifo."""
+        entry = self._shadows.get(style)
+        if entry is None:
+            offsets = STYLES[style]
+            min_x, min_y = _bounds(offsets)[:2]
+            pad_w, pad_h = _padding(offsets)
+            black = self.tinted((0, 0, 0))
+            sheet = pygame.Surface((self.white.get_width() + len(self.rects) * pad_w, self.height + pad_h), pygame.SRCALPHA)
+            cells = {}
+            x = 0
+            for ch, area in self.rects.items():
+                for ox, oy in offsets: sheet.blit(black, (x + ox - min_x, oy - min_y), area)
+                cells[ch] = pygame.Rect(x, 0, area.width + pad_w, self.height + pad_h)
+                x += area.width + pad_w
+            entry = self._shadows[style] = (sheet, cells)
+        return entry
+
+
+def _bounds(offsets):
+    xs = [0] + [ox for ox, _ in offsets]
+    ys = [0] + [oy for _, oy in offsets]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _padding(offsets):
+    min_x, min_y, max_x, max_y = _bounds(offsets)
+    return max_x - min_x, max_y - min_y
+
+
+# --- RENDER DE TEXTO CON CACHE ---
+# `surface` compone un texto una sola vez por (texto, color, fuente, estilo).
+# `draw` además recuerda qué hay en cada posición de pantalla, así el HUD sólo
+# recompone una entrada cuando cambia su texto o su color.
+class TextRenderer:
+    def __init__(self, fonts, max_strings=256, max_slots=512):
+        self.fonts = fonts
+        self.atlases = {name: GlyphAtlas(font) for name, font in fonts.items()}
+        self.max_strings, self.max_slots = max_strings, max_slots
+        self._strings = OrderedDict()
+        self._slots = {}
+        self.composed = 0
+        self.hits = 0
+
+    def _compose(self, text, color, size, style):
+        atlas = self.atlases[size]
+        offsets = STYLES[style]
+        min_x, min_y = _bounds(offsets)[:2]
+        pad_w, pad_h = _padding(offsets)
+        if not atlas.covers(text):
+            # Caracteres fuera del atlas (acentos, etc): se renderiza a la antigua
+            font = self.fonts[size]
+            txt = font.render(text, False, color)
+            surf = pygame.Surface((txt.get_width() + pad_w, txt.get_height() + pad_h), pygame.SRCALPHA)
+            if offsets:
+                border = font.render(text, False, (0, 0, 0))
+                for ox, oy in offsets: surf.blit(border, (ox - min_x, oy - min_y))
+            surf.blit(txt, (-min_x, -min_y))
+            return surf
+
+        surf = pygame.Surface((max(1, atlas.text_width(text) + pad_w), atlas.height + pad_h), pygame.SRCALPHA)
+        if offsets:
+            shadow_sheet, cells = atlas.shadow(style)
+            x = 0
+            for ch in text:
+                surf.blit(shadow_sheet, (x, 0), cells[ch])
+                x += atlas.advance[ch]
+        sheet = atlas.tinted(color)
+        x = -min_x
+        for ch in text:
+            surf.blit(sheet, (x, -min_y), atlas.rects[ch])
+            x += atlas.advance[ch]
+        return surf
+
+    def surface(self, text, color=(255, 255, 255), size="ui", style="outline"):
+        """Superficie compuesta (cacheada). El color del texto queda en (-min_x, -min_y)."""
+        key = (text, tuple(color), size, style)
+        surf = self._strings.get(key)
+        if surf is None:
+            surf = self._compose(text, color, size, style)
+            self.composed += 1
+            self._strings[key] = surf
+            if len(self._strings) > self.max_strings: self._strings.popitem(last=False)
+        else:
+            self.hits += 1
+            self._strings.move_to_end(key)
+        return surf
+
+    def origin(self, style):
+        """Corrimiento para que el texto (sin sombra) quede justo en la posición pedida."""
+        return _bounds(STYLES[style])[:2]
+
+    def draw(self, surface, text, pos, color=(255, 255, 255), size="ui", style="outline"):
+        key = (size, style, pos[0], pos[1])
+        entry = self._slots.get(key)
+        if entry is not None and entry[0] == text and entry[1] == color:
+            surf = entry[2]
+            self.hits += 1
+        else:
+            surf = self.surface(text, color, size, style)
+            if entry is None and len(self._slots) >= self.max_slots: self._slots.clear()
+            self._slots[key] = (text, color, surf)
+        min_x, min_y = self.origin(style)
+        return surface.blit(surf, (pos[0] + min_x, pos[1] + min_y))
+
+    def stats(self):
+        return {"composed": self.composed, "hits": self.hits, "strings": len(self._strings), "slots": len(self._slots)}
@@ -0,0 +1,57 @@
+import time
+from collections import deque
+
+# --- BUFFER DE SALTOS CON MARCA DE TIEMPO ---
+# Cada tecla de dirección entra acá con la hora en que se leyó, en vez de
+# aplicarse (o perderse) en el acto. La escena saca a lo sumo un salto por
+# tick de simulación, y sólo cuando la rana puede saltar. Así dos toques en
+# el mismo frame son dos saltos seguidos, y un toque apenas antes de que
+# termine una transición (meta, reaparición) no se pierde. Un salto que
+# esperó más de `hold` se descarta: no vale saltar solo medio segundo
+# después. Los saltos siguen entrando a la simulación por World.apply en un
+# tick concreto, así que las grabaciones no cambian.
+class MoveBuffer:
+    def __init__(self, size=3, hold=0.15, clock=time.perf_counter):
+        self.moves = deque(maxlen=size)   # (llegada, dirección)
+        self.hold = hold
+        self.clock = clock
+        self.dropped = 0                  # vencidos o pisados por el buffer lleno
+        # Latencia tecla -> frame dibujado, en segundos
+        self.latencies = deque(maxlen=120)
+        self._shown = []                  # llegadas de saltos aplicados que todavía no se dibujaron
+
+    def clear(self):
+        self.moves.clear()
+        self._shown.clear()
+
+    def push(self, direction, stamp=None):
+        if len(self.moves) == self.moves.maxlen: self.dropped += 1
+        self.moves.append((self.clock() if stamp is None else stamp, direction))
+
+    def pop(self, now=None):
+        """El salto vigente más viejo como (llegada, dirección), o None. Los vencidos se tiran."""
+        now = self.clock() if now is None else now
+        moves = self.moves
+        while moves:
+            stamp, direction = moves.popleft()
+            if now - stamp <= self.hold: return stamp, direction
+            self.dropped += 1
+        return None
+
+    def applied(self, stamp):
+        self._shown.append(stamp)
+
+    def presented(self, now=None):
+        """Fin del frame dibujado: cierra la latencia de los saltos aplicados desde el anterior."""
+        if not self._shown: return
+        now = self.clock() if now is None else now
+        for stamp in self._shown: self.latencies.append(now - stamp)
+        self._shown.clear()
+
+    def latency(self):
+        """(promedio, máximo) en ms de los últimos saltos dibujados, o None."""
+        if not self.latencies: return None
+        return 1000.0 * sum(self.latencies) / len(self.latencies), 1000.0 * max(self.latencies)
+
+    def __len__(self):
+        return len(self.moves)
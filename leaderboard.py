@@ -0,0 +1,235 @@
+import atexit
+import os
+import queue
+import struct
+import tempfile
+import threading
+import time
+from bisect import insort
+from collections import namedtuple
+
+# --- TABLA DE PUNTAJES LOCAL ---
+# Cada partida terminada se agrega al final de un archivo binario (14 bytes).
+# En memoria se indexa así:
+#   * un árbol de Fenwick con cuántas partidas hay por escalón de puntaje
+#     (de a 10, que es el mínimo que suma el juego): el puesto de un puntaje
+#     sale en O(log n) sin recorrer las partidas;
+#   * la lista ordenada de las `keep` mejores, con todos sus datos.
+# Cada `compact_every` partidas el archivo se reescribe como cabecera +
+# mejores + histograma (escalón, cantidad) + archivo de todas las partidas.
+# El archivo guarda cada partida completa pero apretada: varints de puntaje,
+# nivel, duración y la diferencia de fecha con la anterior (unos 9 bytes en
+# vez de 14). Al cargar no hace falta leerlo: mejores e histograma alcanzan
+# para el índice; runs() lo recorre cuando se quiere el historial entero.
+# Lo que toca el disco lo hace un hilo aparte; add() sólo cambia la memoria.
+Run = namedtuple("Run", "score level duration_ms date")
+
+MAGIC = b"FRLB"
+VERSION = 2
+HEADER = struct.Struct("<4sBQHIIq")  # magia, versión, total, mejores, escalones, bytes del archivo, última fecha
+RECORD = struct.Struct("<IHII")      # puntaje, nivel, duración (ms), fecha (unix)
+BUCKET = struct.Struct("<II")        # escalón, cantidad
+STEP = 10
+
+
+def _put(out, v):
+    while v >= 0x80:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+
+
+def _pack_run(out, run, last_date):
+    d = run.date - last_date
+    _put(out, run.score)
+    _put(out, run.level)
+    _put(out, run.duration_ms)
+    _put(out, d << 1 if d >= 0 else (-d << 1) - 1)  # zigzag: el reloj puede ir para atrás
+
+class Fenwick:
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, i, delta):
+        i += 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        """Suma de los escalones 0..i."""
+        i = min(i, self.size - 1) + 1
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class Leaderboard:
+    def __init__(self, path, keep=100, compact_every=5000):
+        self.path = path
+        self.keep, self.compact_every = keep, compact_every
+        self.total = 0
+        self.best = []      # (-puntaje, fecha, orden, Run) ordenado: el primero es el mejor
+        self.counts = {}    # escalón -> partidas (para compactar)
+        self.index = Fenwick(1 << 12)
+        self.appended = 0   # registros sueltos desde la última compactación
+        self.archive = bytearray()  # todas las partidas, apretadas (ver arriba)
+        self._last_date = 0
+        self._rewrite = False       # el archivo en disco no sirve: la próxima escritura lo reemplaza
+        self.loaded = False
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._thread = None
+
+    # --- CARGA ---
+    def load(self):
+        with self._lock:
+            if self.loaded: return self
+            self.loaded = True
+            if not os.path.exists(self.path): return self
+            try:
+                with open(self.path, "rb") as f: data = f.read()
+                if data[:4] != MAGIC or data[4] != VERSION:
+                    self._rewrite = True
+                    raise ValueError("formato desconocido")
+                magic, version, total, n_best, n_buckets, n_archive, last_date = HEADER.unpack_from(data)
+                pos = HEADER.size
+                best = [Run(*r) for r in RECORD.iter_unpack(data[pos:pos + n_best * RECORD.size])]
+                pos += n_best * RECORD.size
+                for bucket, count in BUCKET.iter_unpack(data[pos:pos + n_buckets * BUCKET.size]):
+                    self._count(bucket, count)
+                pos += n_buckets * BUCKET.size
+                self.archive += data[pos:pos + n_archive]
+                self._last_date = last_date
+                pos += n_archive
+                self.total = total
+                for run in best: self._insert_best(run)
+                tail = len(data) - pos
+                for r in RECORD.iter_unpack(data[pos:pos + tail - tail % RECORD.size]):
+                    self._add(Run(*r))
+                    self.appended += 1
+            except Exception as e:
+                print(f"Error leyendo la tabla de puntajes: {e}")
+            return self
+
+    # --- INDICE ---
+    def _count(self, bucket, count):
+        while bucket >= self.index.size:
+            # Crece al doble y se rearma desde el histograma (pasa muy pocas veces)
+            self.index = Fenwick(self.index.size * 2)
+            for b, c in self.counts.items(): self.index.add(b, c)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.index.add(bucket, count)
+
+    def _insert_best(self, run):
+        self._seq += 1
+        entry = (-run.score, run.date, self._seq, run)
+        if len(self.best) < self.keep or entry < self.best[-1]:
+            insort(self.best, entry)
+            if len(self.best) > self.keep: self.best.pop()
+
+    def _add(self, run):
+        self.total += 1
+        self._count(run.score // STEP, 1)
+        self._insert_best(run)
+        _pack_run(self.archive, run, self._last_date)
+        self._last_date = run.date
+
+    # --- CONSULTAS ---
+    def rank(self, score):
+        """Puesto que ocupa `score` (1 = el mejor; los empates comparten puesto)."""
+        self.load()
+        return self.total - self.index.prefix(score // STEP) + 1
+
+    def top(self, k=10):
+        self.load()
+        return [e[3] for e in self.best[:k]]
+
+    def runs(self):
+        """Todas las partidas terminadas, en el orden en que se jugaron."""
+        self.load()
+        with self._lock: data = bytes(self.archive)
+        fields, v, shift, date = [], 0, 0, 0
+        for byte in data:
+            v |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            fields.append(v)
+            v, shift = 0, 0
+            if len(fields) == 4:
+                score, level, duration_ms, d = fields
+                date += d >> 1 if not d & 1 else -((d + 1) >> 1)
+                yield Run(score, level, duration_ms, date)
+                fields = []
+
+    def __len__(self):
+        return self.total
+
+    # --- ALTA DE UNA PARTIDA ---
+    def add(self, score, level, duration_ms, date=None):
+        """Agrega una partida terminada. Devuelve (Run, puesto)."""
+        self.load()
+        run = Run(max(0, int(score)), int(level), int(duration_ms), int(date if date is not None else time.time()))
+        with self._lock:
+            self._add(run)
+            self.appended += 1
+            if self._rewrite:
+                self._rewrite = False
+                self.appended = 0
+                self._submit(("compact", self._snapshot()))
+            else: self._submit(("append", RECORD.pack(*run)))
+            if self.appended >= self.compact_every:
+                self.appended = 0
+                self._submit(("compact", self._snapshot()))
+        return run, self.rank(run.score)
+
+    def _snapshot(self):
+        best = [e[3] for e in self.best]
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.total, len(best), len(self.counts), len(self.archive), self._last_date))
+        for run in best: out += RECORD.pack(*run)
+        for bucket in sorted(self.counts): out += BUCKET.pack(bucket, self.counts[bucket])
+        out += self.archive
+        return bytes(out)
+
+    # --- ESCRITOR EN SEGUNDO PLANO ---
+    def _submit(self, job):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, name="leaderboard-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+        self._jobs.put(job)
+
+    def _writer(self):
+        while True:
+            kind, data = self._jobs.get()
+            try:
+                if kind == "append":
+                    fresh = not os.path.exists(self.path)
+                    with open(self.path, "ab") as f:
+                        if fresh: f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0, 0))
+                        f.write(data)
+                else:
+                    fd, tmp = tempfile.mkstemp(prefix=".scores-", suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.path)))
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, self.path)
+            except Exception as e:
+                print(f"Error guardando la tabla de puntajes: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def compact(self):
+        with self._lock:
+            self.appended = 0
+            self._submit(("compact", self._snapshot()))
+
+    def flush(self):
+        """Espera a que el escritor termine lo pendiente."""
+        if self._thread is not None: self._jobs.join()
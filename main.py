@@ -1,7 +1,13 @@
+import os
 import pygame
 from engine import Game
+from audio import pre_init_mixer
+from constants import BASE_PATH
 from arcade_machine_sdk import GameMeta
 
+# Buffer chico = menos latencia en los efectos; tiene que ir antes de pygame.init()
+pre_init_mixer(os.path.join(BASE_PATH, "config.json"))
+
 if not pygame.get_init():
     pygame.init()
 
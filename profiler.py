@@ -0,0 +1,126 @@
+import os
+import time
+from collections import deque
+import pygame
+
+# --- PERFILADOR DE FRAMES ---
+# Mide cuánto se lleva cada subsistema en cada frame. Las secciones se anidan
+# con push()/pop() y el tiempo es exclusivo: lo que corre dentro de
+# "collision" no se cuenta también en "update". Apagado, push/pop no hacen nada.
+SECTIONS = ("events", "update", "collision", "render", "hud", "upscale", "audio", "autopilot")
+BUDGET_MS = 1000.0 / 60
+
+class FrameProfiler:
+    def __init__(self, history=600):
+        self.enabled = False
+        self._wanted = False
+        self.history = deque(maxlen=history)  # (frame_ms, {sección: ms})
+        self.current = dict.fromkeys(SECTIONS, 0.0)
+        self.frames = 0
+        self._stack = []
+        self._mark = 0.0
+        self._last_frame = None
+
+    def toggle(self):
+        # Se aplica al cerrar el frame para no dejar secciones a medias
+        self._wanted = not self._wanted
+        return self._wanted
+
+    def push(self, name):
+        if not self.enabled: return
+        now = time.perf_counter()
+        if self._stack: self.current[self._stack[-1]] += now - self._mark
+        self._stack.append(name)
+        self._mark = now
+
+    def pop(self):
+        if not self.enabled: return
+        now = time.perf_counter()
+        self.current[self._stack.pop()] += now - self._mark
+        self._mark = now
+
+    def end_frame(self):
+        now = time.perf_counter()
+        if self.enabled and self._last_frame is not None:
+            self.history.append(((now - self._last_frame) * 1000, {k: v * 1000 for k, v in self.current.items()}))
+            self.frames += 1
+        self._last_frame = now if self._wanted else None
+        if self._wanted and not self.enabled: self.history.clear()
+        self.enabled = self._wanted
+        self._stack.clear()
+        for k in self.current: self.current[k] = 0.0
+
+    def averages(self):
+        n = len(self.history)
+        if not n: return 0.0, 0.0, dict.fromkeys(SECTIONS, 0.0)
+        frame = [f for f, _ in self.history]
+        per = {k: sum(s[k] for _, s in self.history) / n for k in SECTIONS}
+        return sum(frame) / n, max(frame), per
+
+    def export_csv(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, time.strftime("profile_%Y%m%d_%H%M%S.csv"))
+        first = self.frames - len(self.history)
+        with open(path, "w") as f:
+            f.write("frame,frame_ms," + ",".join(f"{k}_ms" for k in SECTIONS) + "\n")
+            for i, (frame_ms, sections) in enumerate(self.history):
+                f.write(f"{first + i},{frame_ms:.3f}," + ",".join(f"{sections[k]:.3f}" for k in SECTIONS) + "\n")
+        return path
+
+
+# --- PANEL EN PANTALLA ---
+# Gráfico de barras apiladas por sección (la línea es el presupuesto de 16 ms)
+# y conteo de entidades / surfaces distintas por grupo. Se recompone 4 veces
+# por segundo; entre medio sólo se vuelve a pegar.
+COLORS = {"events": (120, 120, 255), "update": (80, 220, 80), "collision": (255, 160, 0),
+          "render": (220, 80, 220), "hud": (0, 220, 220), "audio": (255, 255, 80),
+          "upscale": (160, 160, 160), "autopilot": (255, 120, 120)}
+
+class ProfilerOverlay:
+    def __init__(self, profiler, font, size=(184, 336)):
+        self.profiler = profiler
+        self.font = font
+        self.panel = pygame.Surface(size)
+        self.refresh_every = 15
+        self._age = self.refresh_every
+
+    def draw(self, surface, pos, groups, extra=()):
+        self._age += 1
+        if self._age >= self.refresh_every:
+            self._age = 0
+            self._compose(groups, extra)
+        return surface.blit(self.panel, pos)
+
+    def _compose(self, groups, extra):
+        p, font = self.panel, self.font
+        p.fill((10, 10, 20))
+        w = p.get_width()
+        graph_h, scale = 70, 70 / (2 * BUDGET_MS)  # el gráfico llega a 2 presupuestos
+
+        # Barras de los últimos `w` frames, de derecha a izquierda
+        hist = list(self.profiler.history)[-(w - 4):]
+        x = w - 2
+        for _, sections in reversed(hist):
+            y = graph_h + 2
+            for k in SECTIONS:
+                h = sections[k] * scale
+                if h >= 0.5:
+                    h = min(int(h + 0.5), y - 2)
+                    if h > 0: p.fill(COLORS[k], (x, y - h, 1, h))
+                    y -= h
+            x -= 1
+        budget_y = graph_h + 2 - int(BUDGET_MS * scale)
+        p.fill((255, 60, 60), (2, budget_y, w - 4, 1))
+
+        avg, worst, per = self.profiler.averages()
+        lines = [(f"frame {avg:5.2f} ms  max {worst:5.2f}", (255, 255, 255))]
+        lines += [(f"{k:<9} {per[k]:6.3f} ms", COLORS[k]) for k in SECTIONS]
+        lines.append(("grupo   ent  surf", (180, 180, 180)))
+        for name, group in groups:
+            lines.append((f"{name:<8}{len(group):>4}{len({id(s.image) for s in group}):>6}", (200, 200, 200)))
+        lines += [(text, (180, 180, 180)) for text in extra]
+
+        y = graph_h + 8
+        for text, color in lines:
+            p.blit(font.render(text, False, color), (4, y))
+            y += font.get_linesize()
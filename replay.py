@@ -0,0 +1,114 @@
+# --- REPRODUCTOR DE PARTIDAS GRABADAS ---
+#   python replay.py replays/20250101_120000_1a2b3c4d.rep          (sin ventana, a toda velocidad)
+#   python replay.py --latest --show [--fps 60]                     (en pantalla; --fps 0 = sin tope)
+#   python replay.py --crash crashes/20250101_120000_1a2b3c4d.snap  (volcado de un error, ver simulation/rewind.py)
+# Al terminar compara el CRC del estado final con el grabado.
+import argparse
+import os
+import sys
+import time
+from simulation.replay import Recording, Replayer, replay_headless
+from simulation.rewind import Dump, reproduce
+from simulation.session import Session
+from simulation.world import World
+from simulation.layout import SIM_DT
+
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replays")
+
+
+def latest():
+    files = sorted(f for f in os.listdir(REPLAY_DIR) if f.endswith(".rep")) if os.path.isdir(REPLAY_DIR) else []
+    if not files: sys.exit("No hay grabaciones en replays/")
+    return os.path.join(REPLAY_DIR, files[-1])
+
+
+def show(rec, fps, vector_lanes=False):
+    import pygame
+    from arcade_machine_sdk import BASE_RESOLUTION
+    from main import game
+
+    screen = pygame.display.set_mode(BASE_RESOLUTION)
+    pygame.display.set_caption(f"Replay {rec.seed:08x}")
+    game.start(screen)
+    game.record_replays = False
+    game.vector_lanes = vector_lanes
+    game.pixel_collisions = rec.pixel
+    rec.restore(game.session)
+    state = game.states["PLAYING"]
+    game.change_state("PLAYING")
+    player = Replayer(rec, state.world)
+    clock = pygame.time.Clock()
+    game.alpha = 1.0
+
+    while game.current_state is state:
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT or (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE):
+                return state.world
+        player.feed()
+        if player.done: break
+        state.update(SIM_DT)
+        game.render()
+        pygame.display.flip()
+        if fps: clock.tick(fps)
+    return state.world
+
+
+def crash(path, vector=False):
+    """Vuelve a jugar las fotos de un volcado y después el tick en que se cortó la partida."""
+    dump = Dump.load(path)
+    ticks = dump.ticks()
+    print(f"{os.path.basename(path)}: semilla {dump.seed:08x}, {len(ticks)} fotos (ticks {ticks[0]}-{ticks[-1]})")
+    world = World(Session(dump.seed), vector_lanes=vector or dump.vector)
+    if dump.pixel:
+        from entities.shapes import make_shapes
+        world.shapes = make_shapes()
+    # Si el error era de la simulación, vuelve a saltar acá con su traceback
+    bad = reproduce(dump, world)
+    if bad is not None:
+        print(f"DIVERGENCIA: el tick {bad} no coincide con su foto")
+        return 1
+    print(f"OK: cada tick coincide con su foto y el tick {world.clock.ticks} corrió sin error")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduce una partida grabada")
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--latest", action="store_true", help="la grabación más reciente de replays/")
+    parser.add_argument("--show", action="store_true", help="dibujar en pantalla")
+    parser.add_argument("--vector", action="store_true", help="usar el motor de carriles NumPy")
+    parser.add_argument("--fps", type=int, default=60, help="tope de frames en pantalla (0 = sin tope)")
+    parser.add_argument("--crash", metavar="SNAP", help="reproducir un volcado de crashes/ en vez de una grabación")
+    args = parser.parse_args(argv)
+    if args.crash: return crash(args.crash, args.vector)
+
+    path = latest() if args.latest or not args.path else args.path
+    rec = Recording.load(path)
+    print(f"{os.path.basename(path)}: semilla {rec.seed:08x}, {len(rec.events)} acciones, {rec.end_tick} ticks")
+
+    t0 = time.perf_counter()
+    if args.show: world = show(rec, args.fps, args.vector)
+    else:
+        # Las máscaras salen de las imágenes: sólo entonces hace falta pygame
+        shapes = None
+        if rec.pixel:
+            from entities.shapes import make_shapes
+            shapes = make_shapes()
+        world = replay_headless(rec, args.vector, shapes)
+    elapsed = time.perf_counter() - t0
+    ticks = world.clock.ticks
+    print(f"{ticks} ticks en {elapsed:.2f} s ({ticks / max(elapsed, 1e-9):.0f} ticks/s) - "
+          f"puntaje {world.session.score}, nivel {world.session.level}, vidas {world.session.lives}")
+
+    if ticks < rec.end_tick:
+        print("Reproducción interrumpida")
+        return 0
+    if world.digest() == rec.digest:
+        print("OK: estado final idéntico al grabado")
+        return 0
+    print(f"DIVERGENCIA: CRC {world.digest():08x}, grabado {rec.digest:08x}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+
+# --- CONFIGURACION Y PERFIL EN MEMORIA (ESCRITURA DIFERIDA) ---
+# Todo lo que se guarda en config.json (volúmenes, controles, high score...)
+# vive en un solo diccionario. set() sólo cambia la memoria; un hilo escritor
+# espera `debounce` segundos sin cambios y vuelca todo de una vez a un archivo
+# temporal que reemplaza al original (os.replace es atómico). Así el loop del
+# juego nunca espera al disco y nadie pisa los datos de otro.
+class SettingsStore:
+    def __init__(self, path, debounce=0.5):
+        self.path = path
+        self.debounce = debounce
+        self.data = {}
+        self.writes = 0
+        self._lock = threading.Lock()
+        self._io = threading.Lock()  # un solo volcado a la vez (escritor o flush)
+        self._wake = threading.Event()
+        self._dirty_at = None  # momento del último cambio sin guardar
+        self._thread = None
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self):
+        if not os.path.exists(self.path): return
+        try:
+            with open(self.path, "r") as f: self.data = json.load(f)
+        except Exception as e:
+            print(f"Error cargando config: {e}")
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        # Copia de dicts/listas para que el escritor no vea un objeto a medio cambiar
+        if isinstance(value, dict): value = dict(value)
+        elif isinstance(value, list): value = list(value)
+        with self._lock:
+            if key in self.data and self.data[key] == value: return
+            self.data[key] = value
+            self._dirty_at = time.monotonic()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, name="settings-writer", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def update(self, values):
+        for key, value in values.items(): self.set(key, value)
+
+    @property
+    def dirty(self):
+        return self._dirty_at is not None
+
+    # --- ESCRITOR ---
+    def _writer(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # Debounce: mientras sigan llegando cambios, se sigue esperando
+            while True:
+                with self._lock: dirty_at = self._dirty_at
+                if dirty_at is None: break
+                wait = dirty_at + self.debounce - time.monotonic()
+                if wait <= 0:
+                    self._write()
+                    break
+                self._wake.wait(wait)
+                self._wake.clear()
+
+    def _write(self):
+        with self._io:
+            with self._lock:
+                if self._dirty_at is None: return
+                text = json.dumps(self.data, indent=4)
+                self._dirty_at = None
+            tmp = None
+            try:
+                fd, tmp = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.path)))
+                with os.fdopen(fd, "w") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self.writes += 1
+            except Exception as e:
+                print(f"Error guardando config: {e}")
+                with self._lock:
+                    if self._dirty_at is None: self._dirty_at = time.monotonic()  # se reintenta con el próximo cambio
+                if tmp and os.path.exists(tmp): os.remove(tmp)
+
+    def flush(self):
+        """Guarda ya lo pendiente (al salir del juego)."""
+        self._write()
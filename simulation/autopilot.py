@@ -0,0 +1,382 @@
+import heapq
+import time
+from simulation.layout import MARGIN_X, OFFSET_Y, TILE_SIZE, ROWS, GAME_WIDTH
+from simulation.bodies import Car, Turtle, Crocodile, Snake, Frog
+
+# --- PILOTO AUTOMATICO ---
+# Juega solo, con las mismas acciones que un jugador (world.apply / teclas).
+# Todo lo que se mueve en un carril es periódico: cada cuerpo avanza a
+# velocidad fija y da la vuelta siempre en el mismo punto, y tortugas y
+# cocodrilos siguen líneas de tiempo precompiladas (simulation/timelines.py).
+# Con una foto del nivel se sabe dónde estará cada cosa n ticks adelante sin
+# simular nada, y con eso se busca (A*) sobre una grilla expandida en el
+# tiempo: (tick, fila, x de la rana), una decisión cada STEP_TICKS ticks
+# (saltar hacia un lado o esperar) hasta meter la rana en una meta libre.
+#
+# Por fila y tick se arman dos máscaras de bits sobre el rect.x de la rana
+# (bit i = rect.x en _BASE + i): dónde la atropellan y dónde la sostiene algo
+# en el río. Se guardan mientras dure la foto, así que replanificar casi no
+# recalcula nada. La búsqueda corta por nodos (determinista: soak/replays) y,
+# si se le da, por tiempo (el cuadro en vivo). Ese tope es por llamada a
+# next_action y cubre todo: armar la foto (que entonces se arma de a partes,
+# en varios cuadros), las máscaras de fila y la búsqueda.
+STEP_TICKS = 4
+HORIZON = 60     # decisiones hacia adelante (4 s)
+SAFE_DEPTH = 15  # un plan parcial que sobrevive tantas decisiones (1 s) ya no es una trampa
+MARGIN = 3       # píxeles de holgura: obstáculos más anchos, plataformas más angostas
+LIVE_BUDGET = 0.004  # segundos de CPU por búsqueda en pantalla (demo y F2)
+MOVES = ("UP", "LEFT", "RIGHT", None, "DOWN")  # None = esperar
+
+_BASE = MARGIN_X - 64
+_LO, _HI = MARGIN_X - 16, MARGIN_X + GAME_WIDTH - Frog.display_size + 16  # fuera de esto la rana se pierde
+_WIDTH = GAME_WIDTH + 128
+_FROG_DX = -int(Frog.inset[0] / 2)
+_FROG_W = Frog.display_size + Frog.inset[0]
+
+
+def _span(lo, hi):
+    """Bits de los rect.x de la rana entre lo y hi (inclusive)."""
+    lo, hi = max(lo, _BASE), min(hi, _BASE + _WIDTH - 1)
+    if hi < lo: return 0
+    return ((1 << (hi - lo + 1)) - 1) << (lo - _BASE)
+
+
+_BLOCKED = (-1, 0)  # (atropella, sostiene) de una fila que ya no hubo tiempo de armar
+
+_unsafe_tables = {}
+
+def _unsafe(table, test, slack):
+    """Por tick de la línea: ¿`test` vale en ese tick o a `slack` ticks o menos? (holgura en los bordes)"""
+    key = (id(table), test, slack)
+    res = _unsafe_tables.get(key)
+    if res is None:
+        n, hit = len(table), [test(v) for v in table]
+        res = _unsafe_tables[key] = tuple(any(hit[(k + d) % n] for d in range(-slack, slack + 1)) for k in range(n))
+    return res
+
+
+def _submerged(value): return value[1]
+def _open(value): return value == "OPEN"
+
+
+def _first_out(x, s, out):
+    # Primer tick en que el cuerpo, saliendo de x, queda fuera de pantalla (y se recoloca)
+    n = max(1, int((out.limit - x) / s) - 1)
+    while n > 1 and out(x + (n - 1) * s): n -= 1
+    while not out(x + n * s): n += 1
+    return n
+
+
+class _Out:
+    __slots__ = ("edge", "w", "right", "limit")
+
+    def __init__(self, edge, w, right):
+        self.edge, self.w, self.right = edge, w, right
+        self.limit = edge if right else edge - w  # x a partir de la cual queda fuera
+
+    def __call__(self, x):
+        if self.right: return round(x) > self.edge
+        return round(x) + self.w < self.edge
+
+
+class _Track:
+    """x de un cuerpo que da la vuelta (auto, tronco, tortuga, cocodrilo) n ticks después de la foto."""
+    __slots__ = ("n0", "x0", "s", "first", "reset", "period", "dx", "hw")
+
+    def __init__(self, body, n0=0):
+        w, s = body.rect.width, body.speed
+        self.n0 = n0  # tick de la foto en que se leyó el cuerpo (la foto se arma de a partes)
+        self.x0, self.s = body.x, s
+        self.dx, self.hw = -int(body.inset[0] / 2), w + body.inset[0]  # hitbox respecto al rect
+        self.first = self.period = None
+        if s == 0: return
+        if s > 0:
+            self.reset = body.margin_x - body.wrap_gap - w
+            out = _Out(body.margin_x + body.game_width, w, True)
+        else:
+            self.reset = body.margin_x + body.game_width + body.wrap_gap
+            out = _Out(body.margin_x, w, False)
+        self.first = _first_out(self.x0, s, out)
+        self.period = _first_out(self.reset, s, out)
+
+    def rect_x(self, n):
+        n -= self.n0
+        if self.first is None or n < self.first: return round(self.x0 + n * self.s)
+        return round(self.reset + ((n - self.first) % self.period) * self.s)
+
+
+class _Bouncer:
+    """Serpiente que rebota en los bordes: su recorrido se simula una vez y se guarda."""
+    __slots__ = ("n0", "x", "s", "w", "xs", "dx", "hw")
+
+    def __init__(self, body, n0=0):
+        self.n0 = n0
+        self.x, self.s, self.w = body.x, body.speed, body.rect.width
+        self.dx, self.hw = -int(body.inset[0] / 2), self.w + body.inset[0]
+        self.xs = [body.rect.x]
+
+    def rect_x(self, n):
+        n -= self.n0
+        xs = self.xs
+        while len(xs) <= n:
+            # Snake.update y después el ajuste de World.step
+            self.x += self.s
+            rx = round(self.x)
+            if rx + self.w > MARGIN_X + GAME_WIDTH or rx < MARGIN_X: self.s = -self.s
+            if rx <= MARGIN_X: self.s = abs(self.s)
+            elif rx + self.w >= MARGIN_X + GAME_WIDTH: self.s = -abs(self.s)
+            xs.append(rx)
+        return xs[n]
+
+
+class _Rider:
+    """Serpiente sobre un tronco: va donde va el tronco."""
+    __slots__ = ("log", "dx", "hw")
+
+    def __init__(self, body, log):
+        self.log = log
+        # Su hitbox va un tick atrasado respecto del tronco: se ensancha un paso hacia cada lado
+        slack = int(abs(log.s)) + 1
+        self.dx, self.hw = 10 - int(body.inset[0] / 2) - slack, body.rect.width + body.inset[0] + 2 * slack
+
+    def rect_x(self, n):
+        return self.log.rect_x(n)
+
+
+class Autopilot:
+    def __init__(self, world, step_ticks=STEP_TICKS, horizon=HORIZON, max_nodes=1500, budget=None):
+        self.world = world
+        self.step_ticks, self.horizon = step_ticks, horizon
+        self.max_nodes = max_nodes  # nodos por búsqueda
+        self.budget = budget        # segundos por búsqueda (None = sólo nodos)
+        self.greed = 2              # peso de las filas que faltan en A* (>1: menos nodos, planes un poco más largos)
+        self.plan = []              # (tick, acción, (fila, rect.x) esperado) de cada decisión pendiente
+        self._key = None
+        self._masks = {}
+        self._pending = []          # cuerpos que faltan leer para completar la foto
+        self._supports = {}         # (forma, línea de tiempo, fila) -> (dx, ancho) que sostiene
+        self._shapes = None
+        self._deadline = None       # tope de la llamada en curso a next_action
+        # Estadísticas para el soak
+        self.searches = self.nodes = self.goals_found = 0
+        self.search_time = 0.0
+
+    def reset(self):
+        self.plan.clear()
+        self._pending.clear()
+        self._key = None
+
+    # --- FOTO DEL NIVEL ---
+    def _snapshot(self):
+        """Empieza una foto nueva; los cuerpos se leen en _build, de a partes si hay tope de tiempo."""
+        w = self.world
+        self.t0 = w.clock.ticks
+        self._masks.clear()
+        self.plan.clear()
+        self.hazards = [[] for _ in range(ROWS)]
+        self.platforms = [[] for _ in range(ROWS)]
+        self.ride = [0.0] * ROWS
+        self.pixel = w.shapes is not None
+        if self._shapes is not w.shapes: self._supports.clear()
+        self._shapes = w.shapes
+        self.a0 = w.anim.ticks  # tick de las líneas de tiempo en la foto
+        self._tracks = {}
+        self._bouncers = []
+        # Serpientes al final: la del tronco necesita el recorrido de su tronco
+        pending = [b for group in (w.cars, w.logs, w.turtles, w.crocodiles) for b in group] + w.snakes
+        pending.reverse()
+        self._pending = pending
+        # Con máscaras por píxel lo que choca es el sprite entero de la rana y sin el tick de atraso
+        self.frog_dx, self.frog_w = (0, Frog.display_size) if self.pixel else (_FROG_DX, _FROG_W)
+        self._key = (w.generation, w.frog)
+
+    def _build(self):
+        """Lee cuerpos pendientes hasta completar la foto o agotar el tope. True = foto completa."""
+        pending = self._pending
+        if not pending: return True
+        w = self.world
+        w.sync_bodies()
+        n0 = w.clock.ticks - self.t0  # lo que se lee ahora está n0 ticks después de la foto
+        tracks, deadline, count = self._tracks, self._deadline, len(pending)
+        while pending:
+            # Al menos un cuerpo por llamada, así la foto termina aunque el tope sea mínimo
+            if deadline and len(pending) < count and time.perf_counter() > deadline: return False
+            b = pending.pop()
+            row = (b.rect.y - OFFSET_Y) // TILE_SIZE
+            if isinstance(b, Snake):
+                if b is w.trunk_snake and w.target_log is not None: self.hazards[row].append(_Rider(b, tracks[id(w.target_log)]))
+                else:
+                    bouncer = _Bouncer(b, n0)
+                    self._bouncers.append(bouncer)
+                    self.hazards[row].append(bouncer)
+                continue
+            t = tracks[id(b)] = _Track(b, n0)
+            if isinstance(b, Car): self.hazards[row].append(t)
+            else:
+                self.ride[row] = b.speed
+                if isinstance(b, Turtle): extra = (_unsafe(b.anim.table, _submerged, 2),)
+                elif isinstance(b, Crocodile): extra = (_unsafe(b.anim.table, _open, 1), 0 if b.speed < 0 else b.rect.width - 40, 40)  # dónde está la cabeza
+                else: extra = None
+                if self.pixel: t.dx, t.hw = self._pixel_support(b, row)
+                self.platforms[row].append((type(b), t, extra))
+        return True
+
+    def _pixel_support(self, body, row):
+        # Con máscaras, lo que sostiene es la parte opaca que cae bajo los pies de la rana (su hitbox).
+        # La máscara sigue al cuadro de la animación y la foto vale para muchos ticks, así que
+        # cuenta sólo lo que está opaco en todos los cuadros en que el cuerpo sostiene.
+        # Cocodrilo: con la boca abierta la rana entre las mandíbulas no pisa nada; la zona
+        # letal sigue siendo la franja entera de la cabeza. No cambia entre fotos: se guarda
+        y0 = OFFSET_Y + row * TILE_SIZE + 2 + _FROG_DX - body.rect.y
+        key = (body.shape, body.anim_key, y0)
+        support = self._supports.get(key)
+        if support is not None: return support
+        shapes = self.world.shapes
+        if isinstance(body, Turtle): keys = {body.shape[:3] + (f,) for f, sunk in body.anim.table if not sunk}
+        elif isinstance(body, Crocodile): keys = {body.shape[:4] + (state,) for state in body.anim.table}
+        else: keys = (body.shape,)
+        lo, hi = 0, _WIDTH
+        for k in keys:
+            cols = shapes.get(k).columns(y0, y0 + _FROG_W) or (0, -1)
+            lo, hi = max(lo, cols[0]), min(hi, cols[1])
+        support = self._supports[key] = (lo, max(0, hi - lo + 1))
+        return support
+
+    def _mask(self, n, row):
+        """(atropella, sostiene) para la rana en `row` durante el tick n de la foto."""
+        key = n * ROWS + row
+        m = self._masks.get(key)
+        if m is not None: return m
+        # Se acabó el tope: sin armar nada, la fila cuenta como mortal y la búsqueda se corta sola
+        if self._deadline and time.perf_counter() > self._deadline: return _BLOCKED
+        hazard = 0
+        for h in self.hazards[row]:
+            x = h.rect_x(n) + h.dx
+            hazard |= _span(x - self.frog_dx - self.frog_w + 1 - MARGIN, x + h.hw - self.frog_dx - 1 + MARGIN)
+        support = None
+        if 1 <= row <= 5:
+            support = 0
+            for kind, t, extra in self.platforms[row]:
+                rx = t.rect_x(n)
+                x = rx + t.dx
+                # Bajo el agua (con un par de ticks de holgura en cada borde del ciclo)
+                if kind is Turtle and extra[0][(self.a0 + n) % len(extra[0])]: continue
+                support |= _span(x - _FROG_DX - _FROG_W + 1 + MARGIN, x + t.hw - _FROG_DX - 1 - MARGIN)
+                if kind is Crocodile and extra[0][(self.a0 + n) % len(extra[0])]:
+                    # Boca abierta: la cabeza no sostiene, mata
+                    head = rx + extra[1]
+                    support &= ~_span(head - _FROG_DX - _FROG_W + 1 - MARGIN, head + extra[2] - _FROG_DX - 1 + MARGIN)
+        m = self._masks[key] = (hazard, support)
+        return m
+
+    # --- UNA DECISION ---
+    def _advance(self, n, row, x, action):
+        """(fila, x) de la rana después de `action` y STEP_TICKS ticks; "GOAL" si entra a una meta, None si muere."""
+        hrow, hx = row, round(x)  # el hitbox recién se actualiza al final del tick del salto
+        if action is not None:
+            x = round(x)
+            if action == "UP":
+                if row == 1:
+                    cx = x + Frog.display_size // 2
+                    w = self.world
+                    for i, (s, e) in enumerate(w.slots_rangos):
+                        if s + 1 <= cx <= e - 1 and not w.session.slots_ocupados[i]: return "GOAL"
+                    return None  # sin meta libre debajo: el salto no hace nada
+                row -= 1
+            elif action == "DOWN":
+                if row >= ROWS - 1: return None
+                row += 1
+            elif action == "LEFT":
+                if x - TILE_SIZE < MARGIN_X: return None
+                x -= TILE_SIZE
+            elif x + Frog.display_size + TILE_SIZE > MARGIN_X + GAME_WIDTH: return None
+            else: x += TILE_SIZE
+        for j in range(self.step_ticks):
+            if not _LO <= hx <= _HI: return None
+            hazard, support = self._mask(n + j, hrow)
+            bit = 1 << (hx - _BASE)
+            if self.pixel:
+                if self._mask(n + j, row)[0] & (1 << (round(x) - _BASE)): return None
+            elif hazard & bit: return None
+            if support is not None:
+                if not support & bit: return None
+                x += self.ride[hrow]
+            hrow, hx = row, round(x)
+        return row, x
+
+    def _search(self, n0, row, x):
+        """A* sobre (decisión, fila, x). Devuelve (acciones, completo)."""
+        deadline = self._deadline
+        k = self.step_ticks
+        nodes = [(n0, row, x, -1, None, 0)]  # (tick, fila, x, padre, acción, profundidad)
+        heap = [(row, row, 0)]
+        seen = {(0, row, round(x))}
+        # Además de las filas, cuántas columnas faltan hasta la meta libre más cercana
+        free = [(s + e) // 2 - Frog.display_size // 2 for i, (s, e) in enumerate(self.world.slots_rangos)
+                if not self.world.session.slots_ocupados[i]] or [x]
+        best, best_key = 0, (0, row)
+        goal = None
+        expanded = 0
+        while heap and expanded < self.max_nodes:
+            if deadline and time.perf_counter() > deadline: break
+            _, _, i = heapq.heappop(heap)
+            n, r, fx, _, _, depth = nodes[i]
+            expanded += 1
+            # Para un plan parcial sirve el nodo más adelantado entre los que sobreviven lo suficiente
+            if (-min(depth, SAFE_DEPTH), r) < best_key and (depth >= self.horizon or depth >= SAFE_DEPTH or
+                                                             any(self._advance(n, r, fx, a) for a in MOVES)):
+                best, best_key = i, (-min(depth, SAFE_DEPTH), r)
+            if depth >= self.horizon: continue
+            for action in MOVES:
+                res = self._advance(n, r, fx, action)
+                if res is None: continue
+                if res == "GOAL":
+                    goal = len(nodes)
+                    nodes.append((n + k, 0, fx, i, action, depth + 1))
+                    break
+                nr, nx = res
+                key = (depth + 1, nr, round(nx))
+                if key in seen: continue
+                seen.add(key)
+                nodes.append((n + k, nr, nx, i, action, depth + 1))
+                h = self.greed * nr + min(abs(nx - c) for c in free) / TILE_SIZE
+                heapq.heappush(heap, (depth + 1 + h, nr, len(nodes) - 1))
+            if goal is not None: break
+        self.searches += 1
+        self.nodes += expanded
+        end = goal if goal is not None else best
+        path = []
+        while nodes[end][3] >= 0:
+            n, r, fx, parent, action, _ = nodes[end]
+            pn, pr, px = nodes[parent][:3]
+            path.append((pn, action, (pr, round(px))))
+            end = parent
+        path.reverse()
+        if goal is not None: self.goals_found += 1
+        return path, goal is not None
+
+    def next_action(self):
+        """Acción para aplicar antes del próximo tick (None = nada). Se llama una vez por tick o por cuadro."""
+        w = self.world
+        frog = w.frog
+        if w.pause_state is not None or frog.state != "ALIVE":
+            self.plan.clear()
+            return None
+        self._deadline = time.perf_counter() + self.budget if self.budget else None
+        if self._key != (w.generation, frog): self._snapshot()
+        if not self._build(): return None  # la foto sigue en el próximo cuadro
+        n = w.clock.ticks - self.t0
+        # El recorrido de las serpientes avanza con el reloj, un paso por tick: si no, la primera
+        # máscara de su fila después de mucho rato tendría que simular todo lo que faltó
+        for b in self._bouncers: b.rect_x(n)
+        here = ((frog.rect.y - OFFSET_Y) // TILE_SIZE, frog.rect.x)
+        plan = self.plan
+        if plan and plan[0][0] > n: return None  # entre dos decisiones
+        if not (plan and plan[0][0] == n and plan[0][2] == here):
+            start = time.perf_counter()
+            path, complete = self._search(n, here[0], frog.x)
+            self.search_time += time.perf_counter() - start
+            # Un plan parcial llega hasta el nodo más adelantado que todavía tenía salida
+            plan[:] = path
+            if not plan: return None
+        return plan.pop(0)[1]
@@ -0,0 +1,260 @@
+from simulation.geometry import Box
+from simulation.layout import TILE_SIZE, MARGIN_X, OFFSET_Y, GAME_WIDTH
+from simulation.timelines import DEATH, still
+
+# --- CUERPOS DE LA SIMULACION ---
+# Sólo posición, velocidad, hitbox y fase de animación; las imágenes las pone
+# la vista (entities/). `x` es la posición real en float y `prev_x` la del
+# tick anterior, para que la vista dibuje interpolando. La fase sale de una
+# línea de tiempo compartida (`anim`, ver simulation/timelines.py) que el
+# World engancha a su reloj de animación al crear el cuerpo.
+class Body:
+    inset = (0, 0)  # inflate del hitbox respecto al rect
+    shape = None    # clave de su máscara por píxel (simulation/masks.py); None = sin máscara
+    anim_key = None # clave de su línea de tiempo; None = no se anima
+    wrap_gap = 0    # distancia extra fuera de pantalla al dar la vuelta
+
+    def __init__(self, x, y, w, h, speed, margin_x, game_width):
+        self.rect = Box(0, y, w, h)
+        self.x = self.prev_x = float(x)
+        self.rect.x = round(self.x)
+        self.speed, self.margin_x, self.game_width = speed, margin_x, game_width
+        self.alive = True
+        self.hitbox = self.rect.inflate(*self.inset)
+
+    def advance(self, dx):
+        self.prev_x = self.x
+        self.x += dx
+        self.rect.x = round(self.x)
+
+    def place(self, x):
+        # Salto de posición (wrap, teletransporte): no se interpola
+        self.x = self.prev_x = float(x)
+        self.rect.x = round(self.x)
+
+    def follow(self, other, offset):
+        self.prev_x, self.x = other.prev_x + offset, other.x + offset
+        self.rect.x = round(self.x)
+
+    def shape_key(self):
+        return self.shape
+
+    def draw_x(self, alpha):
+        return round(self.prev_x + (self.x - self.prev_x) * alpha)
+
+    def _wrap(self):
+        if self.speed > 0 and self.rect.left > self.margin_x + self.game_width: self.place(self.margin_x - self.wrap_gap - self.rect.width)
+        elif self.speed < 0 and self.rect.right < self.margin_x: self.place(self.margin_x + self.game_width + self.wrap_gap)
+
+    def update(self):
+        self.advance(self.speed)
+        self._wrap()
+        self.hitbox.inflate_from(self.rect, *self.inset)
+
+
+class Snake(Body):
+    inset = (-10, -5)
+    frame_count = 3
+
+    def __init__(self, x, y, speed, margin_x, game_width):
+        super().__init__(x, y + 8, 100, 25, speed, margin_x, game_width)
+        self.anim_key = ("snake",)
+        self.anim = still(self.anim_key)
+
+    @property
+    def index(self):
+        return self.anim.value
+
+    def shape_key(self):
+        return ("snake", self.rect.w, self.rect.h, self.anim.value, self.speed > 0)
+
+    def update(self):
+        self.advance(self.speed)
+        if self.rect.right > self.margin_x + self.game_width or self.rect.left < self.margin_x:
+            self.speed *= -1
+        self.hitbox.inflate_from(self.rect, *self.inset)
+
+
+class Crocodile(Body):
+    inset = (-15, -10)
+    wrap_gap = 180 - 120  # da la vuelta como si midiera lo mismo que un tronco grande
+
+    def __init__(self, x, y, speed, margin_x, game_width):
+        super().__init__(x, y, 120, 40, speed, margin_x, game_width)
+        self.anim_key = ("croc",)
+        self.anim = still(self.anim_key)
+        self._head = Box(0, 0, 40, 40)
+        # Con máscaras: el cuerpo del cuadro en pantalla es la plataforma y la mandíbula
+        # abierta, la parte letal. `shape` es la clave con la boca cerrada
+        self.shape = ("croc", self.rect.w, self.rect.h, speed > 0, "CLOSED")
+        self.head_shape = ("croc_head", self.rect.w, self.rect.h, speed > 0)
+
+    def head(self):
+        # Zona letal de la mandíbula (40x40 en el extremo hacia donde avanza); siempre el mismo Box
+        head = self._head
+        head.x = self.rect.x if self.speed < 0 else self.rect.right - 40
+        head.y = self.rect.y
+        return head
+
+    def shape_key(self):
+        return ("croc", self.rect.w, self.rect.h, self.speed > 0, self.anim.value)
+
+    @property
+    def state(self):
+        return self.anim.value  # "CLOSED" / "OPEN"
+
+
+class Car(Body):
+    inset = (-4, -8)
+
+    def __init__(self, x, y, speed, car_idx, margin_x, game_width, width=45):
+        super().__init__(x, y + 4, width, 32, speed, margin_x, game_width)
+        self.car_idx = car_idx
+        self.shape = ("car", self.rect.w, self.rect.h, car_idx, speed < 0)
+
+
+class Log(Body):
+    inset = (6, 0)
+
+    def __init__(self, x, y, speed, margin_x, game_width, width, log_type=1):
+        super().__init__(x, y + 3, width, 34, speed, margin_x, game_width)
+        self.log_type = log_type
+        self.shape = ("log", self.rect.w, self.rect.h, log_type)
+
+
+class Turtle(Body):
+    inset = (2, 0)
+
+    def __init__(self, x, y, speed, margin_x, game_width, group_offset=0):
+        super().__init__(x, y + 4, 40, 32, speed, margin_x, game_width)
+        # Todas las tortugas de un grupo comparten la fase: una sola línea de tiempo
+        self.anim_key = ("turtle", group_offset)
+        self.anim = still(self.anim_key)
+        # Máscara del cuadro en pantalla; cuándo se hunde lo sigue decidiendo is_submerged.
+        # `shape` es la clave a flote (cuadro 0)
+        self.shape = ("turtle", self.rect.w, self.rect.h, 0)
+
+    def shape_key(self):
+        return ("turtle", self.rect.w, self.rect.h, self.anim.value[0])
+
+    @property
+    def frame(self):
+        return self.anim.value[0]  # -1 = bajo el agua (no se dibuja)
+
+    @property
+    def is_submerged(self):
+        return self.anim.value[1]
+
+
+# --- MONEDA AUTÓNOMA (CADA UNA VIVE SUS PROPIOS 15 SEGUNDOS) ---
+class Coin(Body):
+    size = 34
+    lifetime = 15000
+
+    def __init__(self, platforms, rng, now):
+        super().__init__(0, 0, self.size, self.size, 0, MARGIN_X, GAME_WIDTH)
+        # Guarda el momento exacto (reloj de la simulación) en el que nació
+        self.spawn_time = now
+        self.parent_platform = None
+        self.offset_x = 0
+        self._place_coin(platforms, rng)
+
+    @classmethod
+    def restored(cls, spawn_time):
+        """Moneda vacía para llenar desde una foto (simulation/rewind.py), sin tocar el azar."""
+        coin = cls.__new__(cls)
+        Body.__init__(coin, 0, 0, cls.size, cls.size, 0, MARGIN_X, GAME_WIDTH)
+        coin.spawn_time, coin.parent_platform, coin.offset_x = spawn_time, None, 0
+        return coin
+
+    def _place_coin(self, platforms, rng):
+        in_water = rng.choice([True, False])
+
+        if in_water and platforms:
+            plat = rng.choice(platforms)
+            self.parent_platform = plat
+            self.offset_x = (plat.rect.width - self.size) // 2
+            self.follow(plat, self.offset_x)
+            self.rect.y = plat.rect.y + (plat.rect.height - self.size) // 2
+        else:
+            self.parent_platform = None
+            row = rng.randint(6, 13)
+            col = rng.randint(0, 15)
+            self.place(MARGIN_X + (col * TILE_SIZE) + (TILE_SIZE - self.size) // 2)
+            self.rect.y = OFFSET_Y + (row * TILE_SIZE) + (TILE_SIZE - self.size) // 2
+
+        self.hitbox.inflate_from(self.rect, 0, 0)
+
+    def update(self, now):
+        if now - self.spawn_time > self.lifetime:
+            self.alive = False
+            return
+
+        # Si está montada en algo, se mueve con ese algo
+        if self.parent_platform:
+            self.follow(self.parent_platform, self.offset_x)
+            self.hitbox.inflate_from(self.rect, 0, 0)
+
+
+class Frog(Body):
+    inset = (-22, -22)
+    display_size = 36
+
+    def __init__(self, x, y, margin):
+        self.start_pos = (x + 2, y + 2)
+        super().__init__(self.start_pos[0], self.start_pos[1], self.display_size, self.display_size, 0, margin, GAME_WIDTH)
+        self.state, self.direction, self.index = "ALIVE", "UP", 0
+        self.anim_timer, self.death_ticks = 0, 0
+        self.margin, self.step = margin, TILE_SIZE
+        self.is_finished = False
+
+    def shape_key(self):
+        return ("frog", self.rect.w, self.rect.h, self.direction, self.index)
+
+    def die(self):
+        if self.state == "ALIVE":
+            self.state = "DEAD"
+            self.death_ticks = 0
+
+    @property
+    def death_frame(self):
+        # Cuadro de la secuencia de muerte (tabla compartida; el último se queda al terminar)
+        return DEATH.at(min(self.death_ticks, len(DEATH) - 2))
+
+    def update(self):
+        if self.state == "ALIVE":
+            self.index = 1 if self.anim_timer > 0 else 0
+            if self.anim_timer > 0: self.anim_timer -= 1
+        elif self.state == "DEAD":
+            self.death_ticks += 1
+            if DEATH.at(self.death_ticks) is None: self.is_finished = True
+        self.hitbox.inflate_from(self.rect, *self.inset)
+
+    def ride(self, dx):
+        # Arrastre de troncos/tortugas: acumula en float (prev_x lo fija el tick)
+        self.x += dx
+        self.rect.x = round(self.x)
+
+    def move(self, direction, slots=None):
+        res = self._move(direction, slots)
+        # Los saltos son instantáneos: no se interpolan
+        self.place(self.rect.x)
+        return res
+
+    def _move(self, direction, slots=None):
+        if self.state != "ALIVE" or self.is_finished: return None
+        self.direction, self.anim_timer = direction, 10
+        if direction == "UP":
+            if self.rect.y - self.step <= 12:
+                if slots:
+                    for i, (s, e) in enumerate(slots):
+                        if s <= self.rect.centerx <= e:
+                            self.rect.centerx = (s + e) // 2
+                            self.rect.y -= self.step
+                            return i
+                    self.anim_timer = 0; return None
+            if self.rect.top > 40: self.rect.y -= self.step
+        elif direction == "DOWN" and self.rect.bottom < 740: self.rect.y += self.step
+        elif direction == "LEFT" and self.rect.left - self.step >= self.margin: self.rect.x -= self.step
+        elif direction == "RIGHT" and self.rect.right + self.step <= self.margin + 640: self.rect.x += self.step
+        return None
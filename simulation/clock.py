@@ -0,0 +1,16 @@
+from simulation.layout import SIM_HZ
+
+# --- RELOJ DE LA SIMULACION ---
+# Reemplaza a pygame.time.get_ticks(): sólo avanza cuando la simulación da un
+# tick, así que una partida acelerada o pausada mide su propio tiempo.
+class SimClock:
+    def __init__(self, hz=SIM_HZ):
+        self.hz = hz
+        self.ticks = 0
+
+    def advance(self, ticks=1):
+        self.ticks += ticks
+
+    @property
+    def ms(self):
+        return self.ticks * 1000 // self.hz
@@ -0,0 +1,65 @@
+
+# --- RECT ENTERO SIN PYGAME ---
+# Mismo comportamiento que pygame.Rect en lo que usa la simulación
+# (inflate trunca hacia cero y los rects vacíos nunca chocan).
+class Box:
+    __slots__ = ("x", "y", "w", "h")
+
+    def __init__(self, x=0, y=0, w=0, h=0):
+        self.x, self.y, self.w, self.h = x, y, w, h
+
+    @property
+    def width(self): return self.w
+
+    @property
+    def height(self): return self.h
+
+    @property
+    def left(self): return self.x
+
+    @left.setter
+    def left(self, value): self.x = value
+
+    @property
+    def right(self): return self.x + self.w
+
+    @right.setter
+    def right(self, value): self.x = value - self.w
+
+    @property
+    def top(self): return self.y
+
+    @property
+    def bottom(self): return self.y + self.h
+
+    @property
+    def centerx(self): return self.x + self.w // 2
+
+    @centerx.setter
+    def centerx(self, value): self.x = value - self.w // 2
+
+    @property
+    def centery(self): return self.y + self.h // 2
+
+    def copy(self):
+        return Box(self.x, self.y, self.w, self.h)
+
+    def inflate(self, dx, dy):
+        return Box(self.x - int(dx / 2), self.y - int(dy / 2), self.w + dx, self.h + dy)
+
+    def inflate_from(self, src, dx, dy):
+        """Igual que `self = src.inflate(dx, dy)` pero sin crear otro Box."""
+        self.x, self.y = src.x - int(dx / 2), src.y - int(dy / 2)
+        self.w, self.h = src.w + dx, src.h + dy
+        return self
+
+    def colliderect(self, other):
+        if not (self.w and self.h and other.w and other.h): return False
+        return (self.x < other.x + other.w and other.x < self.x + self.w and
+                self.y < other.y + other.h and other.y < self.y + self.h)
+
+    def __iter__(self):
+        yield self.x; yield self.y; yield self.w; yield self.h
+
+    def __repr__(self):
+        return f"Box({self.x}, {self.y}, {self.w}, {self.h})"
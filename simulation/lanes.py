@@ -0,0 +1,38 @@
+
+# --- INDICE DE COLISIONES POR CARRIL ---
+# Cada obstáculo vive en una fila fija de TILE_SIZE, así que se guarda en el
+# cubo de su fila. Una consulta sólo mira las filas que toca el rect de la
+# rana (una o dos), sin importar cuántos carriles u obstáculos haya.
+class LaneIndex:
+    def __init__(self, offset_y, tile_size, rows):
+        self.offset_y, self.tile_size, self.rows = offset_y, tile_size, rows
+        self.buckets = {}
+        self.checks = 0
+
+    def _row_span(self, top, bottom):
+        first = (top - self.offset_y) // self.tile_size
+        last = (bottom - 1 - self.offset_y) // self.tile_size
+        return max(0, int(first)), min(self.rows - 1, int(last))
+
+    def add(self, kind, entity):
+        lanes = self.buckets.get(kind)
+        if lanes is None:
+            lanes = self.buckets[kind] = [[] for _ in range(self.rows)]
+        first, last = self._row_span(entity.hitbox.top, entity.hitbox.bottom)
+        for row in range(first, last + 1): lanes[row].append(entity)
+
+    def hit(self, kind, rect, test=None):
+        """Primer obstáculo de `kind` cuyo hitbox choca con `rect` (y pasa `test`, si hay), o None."""
+        lanes = self.buckets.get(kind)
+        if lanes is None: return None
+        # Igual que _row_span, sin armar la tupla (se llama varias veces por tick)
+        first = max(0, int((rect.y - self.offset_y) // self.tile_size))
+        last = min(self.rows - 1, int((rect.y + rect.h - 1 - self.offset_y) // self.tile_size))
+        for row in range(first, last + 1):
+            for entity in lanes[row]:
+                self.checks += 1
+                if rect.colliderect(entity.hitbox) and (test is None or test(entity)): return entity
+        return None
+
+    def clear(self):
+        self.buckets.clear()
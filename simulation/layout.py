@@ -0,0 +1,19 @@
+# Medidas y tiempos de la simulación. Viven aparte de constants.py para que
+# la simulación se pueda importar sin pygame (el SDK lo importa al cargarse).
+
+BASE_WIDTH = 1024  # = arcade_machine_sdk.BASE_WIDTH
+
+# Dimensiones
+GAME_WIDTH = 640
+MARGIN_X = (BASE_WIDTH - GAME_WIDTH) // 2
+OFFSET_Y = 8
+TILE_SIZE = 40
+ROWS = 15
+
+#Tiempo de vida de la rana
+MAX_TIME = 30  #Segundos
+
+# Simulación a paso fijo (las velocidades están en píxeles por tick)
+SIM_HZ = 60
+SIM_DT = 1.0 / SIM_HZ
+MAX_FRAME_TIME = 0.25  # Un tirón más largo que esto no se intenta recuperar
@@ -0,0 +1,95 @@
+import json
+import os
+from collections import namedtuple
+from simulation.layout import MARGIN_X, OFFSET_Y, TILE_SIZE, ROWS, GAME_WIDTH
+from simulation.bodies import Car, Log, Turtle, Snake, Crocodile
+
+# --- NIVELES DECLARATIVOS ---
+# simulation/levels.json describe cada carril: fila, tipo, velocidad base,
+# posiciones y desde/hasta qué nivel existe. LevelSet lo compila a una tabla
+# por nivel con todo ya resuelto (y en píxeles, x absolutas, tortugas de cada
+# grupo con su fase, si el cocodrilo ya entra en ese carril) y la guarda, así
+# que armar un nivel es recorrer la tabla y construir los cuerpos.
+# Pasado el último nivel que cambia algo (from/to), todos comparten la misma tabla.
+#
+# Claves de un carril:
+#   row, kind (car/log/turtle/snake), speed, x
+#   car: car (fila de la hoja de autos), width     log: width, log (1-3)
+#   turtle: group (tortugas por grupo, una por x), gap, phase (desfase por grupo)
+#   swap: {"kind": "croc", "from": n} -> desde el nivel n uno al azar es cocodrilo
+#   name / rides: una serpiente que viaja sobre un tronco al azar del carril `name`
+#   from / to: niveles en que el carril existe (por defecto, todos)
+Lane = namedtuple("Lane", "kind y speed items params swap name rides")
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels.json")
+KINDS = ("car", "log", "turtle", "croc", "snake")
+_PARAMS = {"car": ("car", "width"), "log": ("width", "log")}
+
+# Constructores por tipo: (x, y, velocidad ya multiplicada, params, fase)
+FACTORIES = {
+    "car": lambda x, y, s, p, ph: Car(x, y, s, p[0], MARGIN_X, GAME_WIDTH, p[1]),
+    "log": lambda x, y, s, p, ph: Log(x, y, s, MARGIN_X, GAME_WIDTH, p[0], p[1]),
+    "turtle": lambda x, y, s, p, ph: Turtle(x, y, s, MARGIN_X, GAME_WIDTH, group_offset=ph),
+    "croc": lambda x, y, s, p, ph: Crocodile(x, y, s, MARGIN_X, GAME_WIDTH),
+    "snake": lambda x, y, s, p, ph: Snake(x, y, s, MARGIN_X, GAME_WIDTH),
+}
+
+class LevelSet:
+    def __init__(self, spec):
+        self.lanes = [self._check(i, lane) for i, lane in enumerate(spec.get("lanes", []))]
+        # Niveles en los que algo cambia; después del último la tabla ya no varía
+        edges = [1]
+        for lane in self.lanes:
+            edges += [lane.get("from", 1), lane.get("swap", {}).get("from", 1)]
+            if "to" in lane: edges.append(lane["to"] + 1)
+        self.last = max(edges)
+        self._tables = {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with open(path, "r") as f: return cls(json.load(f))
+
+    def _check(self, i, lane):
+        where = f"levels.json, carril {i}"
+        if lane.get("kind") not in KINDS: raise ValueError(f"{where}: tipo desconocido {lane.get('kind')!r}")
+        if not 0 <= lane.get("row", -1) < ROWS: raise ValueError(f"{where}: fila fuera de la pista")
+        if "rides" in lane: return lane
+        for key in ("speed", "x") + _PARAMS.get(lane["kind"], ()):
+            if key not in lane: raise ValueError(f"{where}: falta '{key}'")
+        swap = lane.get("swap")
+        if swap and swap.get("kind") not in KINDS: raise ValueError(f"{where}: swap a un tipo desconocido")
+        return lane
+
+    def table(self, level):
+        """Tabla de carriles (tupla de Lane) del nivel, compilada una sola vez."""
+        key = max(1, min(level, self.last))
+        table = self._tables.get(key)
+        if table is None: table = self._tables[key] = self._compile(key)
+        return table
+
+    def _compile(self, level):
+        table = []
+        for lane in self.lanes:
+            if not lane.get("from", 1) <= level <= lane.get("to", level): continue
+            y = OFFSET_Y + lane["row"] * TILE_SIZE
+            if "rides" in lane:
+                table.append(Lane("snake", y, 0.0, (), (), None, None, lane["rides"]))
+                continue
+            if lane["kind"] == "turtle":
+                size, gap, phase = lane.get("group", 1), lane.get("gap", 0), lane.get("phase", 0.0)
+                items = tuple((MARGIN_X + gx + k * gap, g * phase) for g, gx in enumerate(lane["x"]) for k in range(size))
+            else:
+                items = tuple((MARGIN_X + px, 0) for px in lane["x"])
+            swap = lane.get("swap")
+            swap = swap["kind"] if swap and level >= swap.get("from", 1) else None
+            params = tuple(lane[k] for k in _PARAMS.get(lane["kind"], ()))
+            table.append(Lane(lane["kind"], y, lane["speed"], items, params, swap, lane.get("name"), None))
+        return tuple(table)
+
+
+_default = None
+
+def default_levels():
+    global _default
+    if _default is None: _default = LevelSet.load()
+    return _default
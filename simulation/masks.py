@@ -0,0 +1,65 @@
+# --- MASCARAS DE COLISION POR PIXEL (DATOS PUROS) ---
+# Una máscara es una fila de bits por cada línea de la imagen (bit x = píxel
+# x opaco), así que probar si dos cuerpos se tocan es un AND de enteros por
+# cada línea que comparten. La simulación no sabe de imágenes: la vista arma
+# cada máscara una sola vez desde el cuadro ya escalado/volteado (ver
+# entities/shapes.py) y ShapeSet las guarda por clave (tipo, cuadro, orientación).
+class Mask:
+    __slots__ = ("w", "h", "rows")
+
+    def __init__(self, w, h, rows):
+        self.w, self.h, self.rows = w, h, tuple(rows)
+
+    @classmethod
+    def box(cls, w, h):
+        return cls(w, h, [(1 << w) - 1] * h)
+
+    def clip(self, x0, x1):
+        """Sólo las columnas [x0, x1) (p. ej. la cabeza del cocodrilo)."""
+        keep = ((1 << (x1 - x0)) - 1) << x0
+        return Mask(self.w, self.h, [r & keep for r in self.rows])
+
+    def overlap(self, other, dx, dy):
+        """¿Se tocan? `other` está corrido (dx, dy) píxeles respecto de esta máscara."""
+        y0, y1 = max(0, dy), min(self.h, dy + other.h)
+        if y0 >= y1 or dx >= self.w or dx + other.w <= 0: return False
+        a, b = self.rows, other.rows
+        if dx >= 0:
+            for y in range(y0, y1):
+                if (a[y] >> dx) & b[y - dy]: return True
+        else:
+            for y in range(y0, y1):
+                if a[y] & (b[y - dy] >> -dx): return True
+        return False
+
+    def columns(self, y0=0, y1=None):
+        """(primera, última) columna con algún píxel opaco entre las líneas y0 e y1, o None."""
+        bits = 0
+        for row in self.rows[max(0, y0):y1]: bits |= row
+        if not bits: return None
+        return (bits & -bits).bit_length() - 1, bits.bit_length() - 1
+
+    def count(self):
+        return sum(bin(r).count("1") for r in self.rows)
+
+
+class ShapeSet:
+    """Máscaras por clave de forma (Body.shape_key()). `build(key)` arma las que faltan."""
+    def __init__(self, build):
+        self._build = build
+        self._masks = {}
+        self._boxes = {}
+
+    def get(self, key):
+        mask = self._masks.get(key)
+        if mask is None: mask = self._masks[key] = self._build(key)
+        return mask
+
+    def box(self, w, h):
+        # Rectángulos llenos (los pies de la rana contra una plataforma)
+        mask = self._boxes.get((w, h))
+        if mask is None: mask = self._boxes[(w, h)] = Mask.box(w, h)
+        return mask
+
+    def __len__(self):
+        return len(self._masks)
@@ -0,0 +1,138 @@
+import struct
+from simulation.session import Session
+from simulation.world import World, ACTIONS
+
+# --- GRABACION Y REPRODUCCION DE PARTIDAS ---
+# Una partida queda definida por su estado inicial (semilla, nivel, vidas...)
+# y por las acciones que entraron a World.apply() con el tick en que entraron.
+# Formato (little endian):
+#   cabecera  "FRRP", versión, semilla, nivel, vidas, puntaje, dificultad,
+#             banderas (bit 0 modo dios, bit 1 choques por píxel), metas
+#             ocupadas (bits), tick final, CRC final
+#   eventos   un varint por acción: (ticks desde la anterior << 3) | acción
+# La versión sube con cada cambio que altere cómo se simula una partida
+# grabada, así from_bytes rechaza las grabaciones viejas en vez de
+# reproducirlas mal:
+#   2  choques por máscara y reglas de hitbox nuevas (bit 1 de banderas)
+#   3  animaciones por reloj compartido (tortugas, cocodrilo, serpientes)
+#   4  máscaras de tortugas y cocodrilo según el cuadro de su animación
+MAGIC = b"FRRP"
+VERSION = 4
+HEADER = struct.Struct("<4sBQHHIdBBII")
+
+class Recording:
+    def __init__(self, seed, level=1, lives=5, score=0, difficulty=1.0, god_mode=False, slots=0, pixel=False):
+        self.seed, self.level, self.lives, self.score = seed, level, lives, score
+        self.difficulty, self.god_mode, self.slots = difficulty, god_mode, slots
+        self.pixel = pixel  # se jugó con máscaras por píxel (World.shapes)
+        self.events = []  # (tick, índice en ACTIONS)
+        self.end_tick = 0
+        self.digest = 0
+
+    @classmethod
+    def from_session(cls, session):
+        slots = sum(1 << i for i, oc in enumerate(session.slots_ocupados) if oc)
+        return cls(session.seed, session.level, session.lives, session.score,
+                   session.difficulty_multiplier, session.god_mode, slots)
+
+    def restore(self, session):
+        """Deja `session` en el estado en que empezó la grabación."""
+        session.reset(self.seed)
+        session.level, session.lives, session.score = self.level, self.lives, self.score
+        session.difficulty_multiplier, session.god_mode = self.difficulty, self.god_mode
+        session.slots_ocupados = [bool(self.slots >> i & 1) for i in range(5)]
+        return session
+
+    def new_session(self):
+        return self.restore(Session(self.seed))
+
+    # --- ARCHIVO ---
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed & 0xFFFFFFFFFFFFFFFF, self.level, self.lives, self.score,
+                                    self.difficulty, self.god_mode | self.pixel << 1, self.slots, self.end_tick, self.digest))
+        last = 0
+        for tick, code in self.events:
+            v = ((tick - last) << 3) | code
+            last = tick
+            while v >= 0x80:
+                out.append((v & 0x7F) | 0x80)
+                v >>= 7
+            out.append(v)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, level, lives, score, difficulty, god, slots, end_tick, digest = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION: raise ValueError("No es una grabación de Frogger compatible")
+        rec = cls(seed, level, lives, score, difficulty, bool(god & 1), slots, bool(god & 2))
+        rec.end_tick, rec.digest = end_tick, digest
+        tick, v, shift = 0, 0, 0
+        for byte in data[HEADER.size:]:
+            v |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            tick += v >> 3
+            rec.events.append((tick, v & 7))
+            v, shift = 0, 0
+        return rec
+
+    def save(self, path):
+        with open(path, "wb") as f: f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f: return cls.from_bytes(f.read())
+
+
+class Recorder:
+    """Se cuelga de World.recorder y anota cada acción con su tick."""
+    def __init__(self, world):
+        self.world = world
+        self.recording = Recording.from_session(world.session)
+        self.recording.pixel = world.shapes is not None
+        world.recorder = self
+
+    def log(self, tick, action):
+        self.recording.events.append((tick, ACTIONS.index(action)))
+
+    def finish(self):
+        self.world.recorder = None
+        rec = self.recording
+        rec.end_tick, rec.digest = self.world.clock.ticks, self.world.digest()
+        return rec
+
+
+class Replayer:
+    """Vuelve a meter las acciones en sus ticks. Sirve igual con o sin vista."""
+    def __init__(self, recording, world):
+        self.recording, self.world = recording, world
+        self._next = 0
+
+    @property
+    def done(self):
+        return self.world.clock.ticks >= self.recording.end_tick
+
+    def feed(self):
+        # Acciones que entraron antes de simular el tick actual
+        events, tick = self.recording.events, self.world.clock.ticks
+        while self._next < len(events) and events[self._next][0] <= tick:
+            self.world.apply(ACTIONS[events[self._next][1]])
+            self._next += 1
+
+
+def replay_headless(recording, vector_lanes=False, shapes=None):
+    """Reproduce sin pygame y lo más rápido posible. Devuelve el World final.
+
+    Si la partida se jugó con choques por píxel hacen falta las mismas máscaras (`shapes`)."""
+    if recording.pixel and shapes is None: raise ValueError("La grabación usa choques por píxel: faltan las máscaras")
+    world = World(recording.new_session(), vector_lanes=vector_lanes)
+    world.shapes = shapes if recording.pixel else None
+    world.start()
+    player = Replayer(recording, world)
+    while True:
+        player.feed()
+        if player.done: break
+        world.step()
+        world.drain_events()
+    return world
@@ -0,0 +1,317 @@
+import struct
+from simulation.bodies import Coin
+from simulation.world import ACTIONS
+from simulation import soa
+
+# --- REBOBINADO: UNA FOTO DEL MUNDO POR TICK EN UN ANILLO FIJO ---
+# Cada tick, antes de simular, el estado completo de la partida se empaqueta
+# en binario (structs, sin objetos) dentro de un único bytearray que se
+# reusa como anillo: sesión, transición, reloj de animación, rana, x/prev_x
+# de cada obstáculo, serpientes y monedas. Lo que no cambia dentro de un
+# nivel (carriles, anchos, velocidades) sale de volver a armarlo: se guarda
+# una vez por nivel el nivel, la dificultad y el azar con que se armó. El
+# estado del azar (2.5 KB) tampoco va en cada foto: sólo cambia al armar el
+# nivel o al sembrar una moneda, así que las fotos apuntan a una tabla chica.
+# Con eso cinco segundos de historia entran en unos 300 KB.
+#
+# Las acciones que entran a World.apply entre una foto y la siguiente van
+# en la siguiente (3 bits cada una). Así un volcado (dump) vuelve a jugar tick
+# por tick desde la foto más vieja y comprueba cada una (ver reproduce()).
+#
+# Volcado (little endian):
+#   cabecera  "FRRW", versión, semilla, banderas (bit 0 choques por píxel,
+#             bit 1 motor NumPy), Hz, cantidad de armados, de azares y de fotos,
+#             acciones que entraron después de la última foto
+#   armados   id, nivel, dificultad, azar antes de armar
+#   azares    id, estado
+#   fotos     largo + bytes, de la más vieja a la más nueva
+MAGIC = b"FRRW"
+VERSION = 1
+FILE = struct.Struct("<4sBQBHIIIQ")
+PAUSES = (None, "LEVEL_TRANSITION", "GOAL_TRANSITION", "GAME_OVER_TRANSITION")
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+FROG_STATES = ("ALIVE", "DEAD", "SAFE")
+CAUSES = ("car", "snake", "water", "time")
+# tick, armado, azar, acciones | cuerpos, monedas | sesión y mundo | rana
+HEAD = struct.Struct("<IIIQ" "HB" "iiHdBBBdqBbIdHHHH" "ddiiiiBBBBHB")
+IDS = slice(4, 20)  # armado, azar y acciones: no son estado de la partida
+COIN = struct.Struct("<qddiihhB")
+BUILD = struct.Struct("<Hd")
+RNG = struct.Struct("<625I")
+SPARE_COINS = 4
+
+class RewindBuffer:
+    """Las últimas `seconds` de partida, una foto por tick. Se cuelga de World.rewind para anotar las acciones."""
+    def __init__(self, world, seconds=5.0):
+        self.world = world
+        self.capacity = max(1, round(seconds * world.clock.hz))
+        self.slot = 0                 # bytes por foto; crece si un nivel trae más cuerpos
+        self.ring = bytearray()
+        self.sizes = [0] * self.capacity
+        self.head = 0                 # dónde va la próxima foto
+        self.count = 0
+        self.builds = {}              # id -> nivel, dificultad y azar antes de armarlo
+        self.rngs = {}                # id -> estado del azar
+        self.pending = 0              # acciones desde la última foto (código + 1, 3 bits cada una)
+        self._acts = 0
+        self._gen = self._bound = None
+        self._build = self._rng = 0
+        self._mark = None
+        self._bodies = self._snakes = ()
+        self._index = {}
+        world.rewind = self
+
+    def log(self, tick, action):
+        self.pending |= (ACTIONS.index(action) + 1) << (3 * self._acts)
+        self._acts += 1
+
+    def _bind(self):
+        # Orden fijo de los cuerpos del nivel, igual con o sin motor NumPy: los
+        # del motor (autos, troncos, tortugas, cocodrilos) y al final las serpientes
+        w = self.world
+        self._bound = w.generation
+        self._snakes = list(w.snakes)
+        self._bodies = [b for group in (w.cars, w.logs, w.turtles, w.crocodiles) for b in group] + self._snakes
+        self._index = {id(b): i for i, b in enumerate(self._bodies)}
+        n, s = len(self._bodies), len(self._snakes)
+        self._xs = struct.Struct(f"<{2 * n}d")            # todos los x y después todos los prev_x
+        self._sn = struct.Struct(f"<{s}d{s}i")            # velocidad y x del hitbox de cada serpiente
+        if w.engine:
+            # Con el motor los x salen directo de sus columnas (sin pasar por los objetos)
+            np = soa.np
+            self._perm = np.array([b.soa_index for b in self._bodies[:n - s]], dtype=np.int64)
+            self._cols = np.empty(2 * n)
+            self._raw = memoryview(self._cols).cast("B")
+
+    def _oldest(self):
+        return (self.head - self.count) % self.capacity
+
+    def _prune(self):
+        # Armados y azares que ya no nombra ninguna foto
+        if not self.count: return
+        build, rng = struct.unpack_from("<4xII", self.ring, self._oldest() * self.slot)
+        for table, first in ((self.builds, build), (self.rngs, rng)):
+            for key in [k for k in table if k < first]: del table[key]
+
+    def _grow(self, size):
+        slot = size + SPARE_COINS * COIN.size
+        ring = bytearray(self.capacity * slot)
+        for i, n in enumerate(self.sizes):
+            if n: ring[i * slot:i * slot + n] = self.ring[i * self.slot:i * self.slot + n]
+        self.ring, self.slot = ring, slot
+
+    # --- FOTO ---
+    def capture(self):
+        w = self.world
+        if w.generation != self._gen:
+            self._gen = w.generation
+            self._build += 1
+            level, difficulty, state = w.build
+            self.builds[self._build] = BUILD.pack(level, difficulty) + RNG.pack(*state[1])
+            self._prune()
+        # El azar sólo se usa al armar el nivel y al sembrar una moneda (que mueve next_coin_spawn_time)
+        mark = (w.generation, w.next_coin_spawn_time)
+        if mark != self._mark:
+            self._mark = mark
+            self._rng += 1
+            self.rngs[self._rng] = RNG.pack(*w.rng.getstate()[1])
+            self._prune()
+        size = self._size()
+        if size > self.slot: self._grow(size)
+        self._pack_into(self.ring, self.head * self.slot)
+        self.sizes[self.head] = size
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.pending = self._acts = 0
+
+    def pack(self):
+        """Foto del mundo tal como está, fuera del anillo."""
+        buf = bytearray(self._size())
+        self._pack_into(buf, 0)
+        return bytes(buf)
+
+    def _size(self):
+        if self.world.generation != self._bound: self._bind()
+        return HEAD.size + self._xs.size + self._sn.size + COIN.size * len(self.world.coins)
+
+    def _pack_into(self, buf, off):
+        w = self.world
+        s, f, d, bodies, snakes = w.session, w.frog, w.deaths, self._bodies, self._snakes
+        slots = 0
+        for i, oc in enumerate(s.slots_ocupados):
+            if oc: slots |= 1 << i
+        HEAD.pack_into(buf, off, w.clock.ticks, self._build, self._rng, self.pending, len(bodies), len(w.coins),
+                       s.score, s.lives, s.level, s.difficulty_multiplier, slots, s.god_mode, PAUSES.index(w.pause_state),
+                       w.pause_timer, w.next_coin_spawn_time, w.time_warning_played, w.max_row_reached, w.anim.ticks,
+                       s.time_left, d.get("car", 0), d.get("snake", 0), d.get("water", 0), d.get("time", 0),
+                       f.x, f.prev_x, f.rect.x, f.rect.y, f.hitbox.x, f.hitbox.y, FROG_STATES.index(f.state),
+                       DIRECTIONS.index(f.direction), f.index, f.anim_timer, f.death_ticks, f.is_finished)
+        off += HEAD.size
+        if w.engine:
+            cols, n, m = self._cols, len(bodies), len(bodies) - len(snakes)
+            soa.np.take(w.engine.x, self._perm, out=cols[:m])
+            soa.np.take(w.engine.px, self._perm, out=cols[n:n + m])
+            for j, b in enumerate(snakes): cols[m + j], cols[n + m + j] = b.x, b.prev_x
+            buf[off:off + self._xs.size] = self._raw
+        else: self._xs.pack_into(buf, off, *[b.x for b in bodies], *[b.prev_x for b in bodies])
+        off += self._xs.size
+        # La serpiente que va sobre el tronco se corre después de su update: su hitbox queda atrás del rect
+        self._sn.pack_into(buf, off, *[b.speed for b in snakes], *[b.hitbox.x for b in snakes])
+        off += self._sn.size
+        for c in w.coins:
+            COIN.pack_into(buf, off, c.spawn_time, c.x, c.prev_x, c.rect.x, c.rect.y,
+                           self._index.get(id(c.parent_platform), -1), c.offset_x, c.alive)
+            off += COIN.size
+
+    # --- VUELTA ATRAS ---
+    def pop(self):
+        """Saca la foto más nueva y deja el mundo como estaba en ella. False si ya no queda historia."""
+        if not self.count: return False
+        self.head = (self.head - 1) % self.capacity
+        self.count -= 1
+        off = self.head * self.slot
+        self.restore(bytes(self.ring[off:off + self.sizes[self.head]]))
+        self.sizes[self.head] = 0
+        self.pending = self._acts = 0
+        return True
+
+    def snapshots(self):
+        """Las fotos guardadas, de la más vieja a la más nueva."""
+        out = []
+        for k in range(self.count):
+            i = (self._oldest() + k) % self.capacity
+            out.append(bytes(self.ring[i * self.slot:i * self.slot + self.sizes[i]]))
+        return out
+
+    def restore(self, data):
+        w = self.world
+        h = HEAD.unpack_from(data)
+        build, rng = h[1], h[2]
+        if build != self._build or w.generation != self._gen:
+            # Otro nivel (o un mundo recién creado): se vuelve a armar con el azar de entonces
+            b = self.builds[build]
+            w.session.level, w.session.difficulty_multiplier = BUILD.unpack_from(b)
+            w.rng.setstate((3, RNG.unpack_from(b, BUILD.size), None))
+            w.reset_level_entities()
+            self._gen, self._build = w.generation, build
+        s, f = w.session, w.frog
+        (w.clock.ticks, _, _, _, n, coins, s.score, s.lives, s.level, s.difficulty_multiplier, slots, god, pause,
+         w.pause_timer, w.next_coin_spawn_time, warned, w.max_row_reached, anim, s.time_left) = h[:19]
+        w.rng.setstate((3, RNG.unpack_from(self.rngs[rng]), None))
+        self._rng, self._mark = rng, (w.generation, w.next_coin_spawn_time)
+        w.anim.set(anim)
+        s.god_mode, s.slots_ocupados = bool(god), [bool(slots >> i & 1) for i in range(5)]
+        w.pause_state, w.time_warning_played = PAUSES[pause], bool(warned)
+        w.deaths.clear()
+        for cause, k in zip(CAUSES, h[19:23]):
+            if k: w.deaths[cause] = k
+        (f.x, f.prev_x, f.rect.x, f.rect.y, f.hitbox.x, f.hitbox.y, state, direction, f.index, f.anim_timer,
+         f.death_ticks, finished) = h[23:]
+        f.state, f.direction, f.is_finished = FROG_STATES[state], DIRECTIONS[direction], bool(finished)
+
+        if w.generation != self._bound: self._bind()
+        bodies, snakes = self._bodies, self._snakes
+        if n != len(bodies): raise ValueError(f"La foto tiene {n} cuerpos y el nivel armado {len(bodies)}")
+        off = HEAD.size
+        xs = self._xs.unpack_from(data, off)
+        for i, b in enumerate(bodies):
+            b.x, b.prev_x = xs[i], xs[n + i]
+            b.rect.x = round(b.x)
+            b.hitbox.inflate_from(b.rect, *b.inset)
+        off += self._xs.size
+        sn = self._sn.unpack_from(data, off)
+        for i, b in enumerate(snakes): b.speed, b.hitbox.x = sn[i], sn[len(snakes) + i]
+        off += self._sn.size
+        if w.engine: w.engine.reload()
+
+        # Las monedas que siguen vivas conservan su objeto (y su vista); las demás mueren
+        old = {c.spawn_time: c for c in w.coins}
+        w.coins.clear()
+        for _ in range(coins):
+            spawn, x, px, rx, ry, parent, offset_x, alive = COIN.unpack_from(data, off)
+            off += COIN.size
+            c = old.pop(spawn, None) or Coin.restored(spawn)
+            c.x, c.prev_x, c.rect.x, c.rect.y = x, px, rx, ry
+            c.parent_platform, c.offset_x, c.alive = bodies[parent] if parent >= 0 else None, offset_x, bool(alive)
+            c.hitbox.inflate_from(c.rect, 0, 0)
+            w.coins.append(c)
+        for c in old.values(): c.alive = False
+
+    # --- VOLCADO ---
+    def save(self, path):
+        w = self.world
+        flags = (w.shapes is not None) | (w.engine is not None) << 1
+        snaps = self.snapshots()
+        out = [FILE.pack(MAGIC, VERSION, w.session.seed & 0xFFFFFFFFFFFFFFFF, flags, w.clock.hz,
+                         len(self.builds), len(self.rngs), len(snaps), self.pending)]
+        out += [struct.pack("<I", k) + b for k, b in self.builds.items()]
+        out += [struct.pack("<I", k) + b for k, b in self.rngs.items()]
+        out += [struct.pack("<I", len(snap)) + snap for snap in snaps]
+        with open(path, "wb") as f: f.write(b"".join(out))
+
+
+class Dump:
+    """Un volcado leído de disco; `load_into(world)` lo pasa a un RewindBuffer sobre ese mundo."""
+    def __init__(self, data):
+        magic, version, self.seed, flags, self.hz, builds, rngs, snaps, self.pending = FILE.unpack_from(data)
+        if magic != MAGIC or version != VERSION: raise ValueError("No es un volcado de Frogger compatible")
+        self.pixel, self.vector = bool(flags & 1), bool(flags & 2)
+        off = FILE.size
+        self.builds, self.rngs, self.snapshots = {}, {}, []
+        for table, count, size in ((self.builds, builds, BUILD.size + RNG.size), (self.rngs, rngs, RNG.size)):
+            for _ in range(count):
+                table[struct.unpack_from("<I", data, off)[0]] = data[off + 4:off + 4 + size]
+                off += 4 + size
+        for _ in range(snaps):
+            n = struct.unpack_from("<I", data, off)[0]
+            self.snapshots.append(data[off + 4:off + 4 + n])
+            off += 4 + n
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f: return cls(f.read())
+
+    def ticks(self):
+        return [struct.unpack_from("<I", snap)[0] for snap in self.snapshots]
+
+    def load_into(self, world):
+        buf = RewindBuffer(world, max(1, len(self.snapshots)) / world.clock.hz)
+        buf.builds.update(self.builds)
+        buf.rngs.update(self.rngs)
+        if self.snapshots: buf._grow(max(len(snap) for snap in self.snapshots))
+        for i, snap in enumerate(self.snapshots):
+            buf.ring[i * buf.slot:i * buf.slot + len(snap)] = snap
+            buf.sizes[i] = len(snap)
+        buf.count = len(self.snapshots)
+        buf.head = buf.count % buf.capacity
+        return buf
+
+
+def _apply(world, actions):
+    while actions:
+        world.apply(ACTIONS[(actions & 7) - 1])
+        actions >>= 3
+
+
+def reproduce(dump, world):
+    """Vuelve a jugar el volcado sobre `world` desde su foto más vieja.
+
+    Cada tick se simula, entran sus acciones y el resultado se compara con la
+    foto grabada. Devuelve el primer tick que no coincide (None si todos). Al
+    final simula el tick en que se cortó la partida: si el error venía de la
+    simulación, salta de nuevo acá."""
+    buf = dump.load_into(world)
+    world.rewind = None  # acá sólo se compara: las acciones no se vuelven a anotar
+    snaps = dump.snapshots
+    buf.restore(snaps[0])
+    for snap in snaps[1:]:
+        world.step()
+        _apply(world, HEAD.unpack_from(snap)[3])
+        world.drain_events()
+        mine = buf.pack()
+        if mine[:IDS.start] + mine[IDS.stop:] != snap[:IDS.start] + snap[IDS.stop:]:
+            return world.clock.ticks
+    world.step()
+    _apply(world, dump.pending)
+    world.drain_events()
+    return None
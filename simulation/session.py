@@ -0,0 +1,35 @@
+import random
+from simulation.layout import MAX_TIME
+from simulation.clock import SimClock
+
+# --- DATOS DE LA PARTIDA (VIDAS, NIVEL, PUNTAJE, METAS, TIEMPO) ---
+# La sesión es dueña del azar y del reloj: con la misma semilla y las mismas
+# entradas en los mismos ticks, la partida se repite exacta (ver replay.py).
+class Session:
+    def __init__(self, seed=None):
+        self.god_mode = False
+        self.rng = random.Random()
+        self.clock = SimClock()
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.lives = 5
+        self.level = 1
+        self.score = 0
+        self.time_left = MAX_TIME
+        self.difficulty_multiplier = 1.0
+        self.slots_ocupados = [False] * 5
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        # Semilla nueva en cada partida salvo que se pida una (replays, benchmarks)
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng.seed(self.seed)
+        self.clock.ticks = 0
+
+    def add_score(self, points):
+        # Cada 5000 puntos se gana una vida
+        old_score = self.score
+        self.score += points
+        if (self.score // 5000) > (old_score // 5000):
+            self.lives += (self.score // 5000) - (old_score // 5000)
@@ -0,0 +1,137 @@
+try:
+    import numpy as np
+except ImportError:  # El motor vectorizado es opcional: sin NumPy se usa el camino normal
+    np = None
+
+AVAILABLE = np is not None
+
+# --- MOTOR DE CARRILES EN ARREGLOS (NUMPY) ---
+# Autos, troncos, tortugas y cocodrilos guardados como columnas (posición,
+# velocidad, ancho, hitbox). Un tick avanza y da la vuelta a todos con un
+# puñado de operaciones sobre arreglos, y las colisiones prueban de una vez
+# todo lo que hay en las filas de la rana. La animación no pasa por acá: es
+# de las líneas de tiempo compartidas (simulation/timelines.py).
+#
+# Los cuerpos (simulation/bodies.py) siguen existiendo, pero mientras el motor
+# está activo los arreglos mandan: sync()/sync_all() copian de vuelta a los
+# objetos sólo lo que alguien va a leer (la plataforma bajo la rana, el tronco
+# de una moneda, la vista una vez por frame).
+# Las cuentas son las mismas que las de Body.update (float64, round al par),
+# así que un replay da el mismo CRC con o sin motor.
+KINDS = ("car", "log", "turtle", "croc")
+
+class LaneEngine:
+    def __init__(self, offset_y, tile_size, rows):
+        self.offset_y, self.tile_size, self.rows = offset_y, tile_size, rows
+        self.bodies = []
+        self.dirty = False
+        self.checks = 0
+
+    def _row(self, top):
+        return max(0, min(self.rows - 1, (top - self.offset_y) // self.tile_size))
+
+    def build(self, entries):
+        """`entries`: lista de (tipo, cuerpo). Ordena por tipo y fila para que cada consulta sea un slice."""
+        entries = sorted(((KINDS.index(k), self._row(b.hitbox.top), i, b) for i, (k, b) in enumerate(entries)),
+                         key=lambda e: e[:3])
+        self.bodies = [e[3] for e in entries]
+        for i, b in enumerate(self.bodies): b.soa_index = i
+        kinds = np.array([e[0] for e in entries], dtype=np.int64)
+        rows = np.array([e[1] for e in entries], dtype=np.int64)
+
+        # Inicio de cada (tipo, fila) dentro de los arreglos: starts[k][r] .. starts[k][r+1]
+        keys = kinds * self.rows + rows
+        self.starts = np.searchsorted(keys, np.arange(len(KINDS) * self.rows + 1)).tolist()
+
+        col = lambda f, dt=np.float64: np.array([f(b) for b in self.bodies], dtype=dt)
+        self.x, self.px = col(lambda b: b.x), col(lambda b: b.prev_x)
+        self.rx = col(lambda b: b.rect.x, np.int64)
+        self.speed, self.w = col(lambda b: b.speed), col(lambda b: b.rect.w, np.int64)
+        self.left_edge = col(lambda b: b.margin_x, np.int64)
+        self.right_edge = col(lambda b: b.margin_x + b.game_width, np.int64)
+        self.wrap_pos = col(lambda b: b.margin_x - b.wrap_gap - b.rect.w)
+        self.wrap_neg = col(lambda b: b.margin_x + b.game_width + b.wrap_gap)
+        self.hb_dx = col(lambda b: b.hitbox.x - b.rect.x, np.int64)
+        self._hb_dx = self.hb_dx.tolist()  # fijo: sync_all lo lee sin pasar por NumPy
+        self.hb_y, self.hb_w, self.hb_h = (col(lambda b: b.hitbox.y, np.int64), col(lambda b: b.hitbox.w, np.int64),
+                                           col(lambda b: b.hitbox.h, np.int64))
+
+        # Buffers de trabajo: step() escribe siempre en los mismos arreglos
+        n = len(self.bodies)
+        self._fx, self._ix = np.empty(n), np.empty(n, dtype=np.int64)
+        self._fwd, self._back = self.speed > 0, self.speed < 0
+        self._wrap, self._mask = np.empty(n, dtype=bool), np.empty(n, dtype=bool)
+        self.dirty = False
+
+    # --- UN TICK ---
+    def step(self):
+        if not self.bodies: return
+        x, rx, wrap, mask = self.x, self.rx, self._wrap, self._mask
+        self.px[:] = x
+        x += self.speed
+        np.rint(x, out=self._fx)
+        rx[:] = self._fx
+
+        # Vuelta al otro lado (Body._wrap): se coloca sin interpolar
+        np.greater(rx, self.right_edge, out=wrap)
+        wrap &= self._fwd
+        np.add(rx, self.w, out=self._ix)
+        np.less(self._ix, self.left_edge, out=mask)
+        mask &= self._back
+        wrap |= mask
+        if wrap.any():
+            x[wrap] = np.where(self._fwd[wrap], self.wrap_pos[wrap], self.wrap_neg[wrap])
+            self.px[wrap] = x[wrap]
+            rx[wrap] = np.rint(x[wrap])
+        # Tortugas y cocodrilos no tienen nada más por cuerpo: su fase es la línea de tiempo compartida
+        self.dirty = True
+
+    # --- COLISIONES ---
+    def hit(self, kind, box, test=None):
+        """Primer cuerpo de `kind` cuyo hitbox choca con `box` (y pasa `test`), en el orden de LaneIndex, o None."""
+        if not (box.w and box.h) or not self.bodies: return None
+        k = KINDS.index(kind)
+        base = k * self.rows
+        a = self.starts[base + self._row(box.y)]
+        b = self.starts[base + self._row(box.y + box.h - 1) + 1]
+        if a >= b: return None
+        self.checks += b - a
+        hx = self.rx[a:b] + self.hb_dx[a:b]
+        hy = self.hb_y[a:b]
+        mask = (hx < box.x + box.w) & (box.x < hx + self.hb_w[a:b]) & (hy < box.y + box.h) & (box.y < hy + self.hb_h[a:b])
+        idx = np.flatnonzero(mask)
+        if not len(idx): return None
+        if test is None:
+            body = self.bodies[a + int(idx[0])]
+            self.sync(body)
+            return body
+        # Fase fina: sólo los candidatos que dejó pasar la caja
+        for i in idx.tolist():
+            body = self.bodies[a + i]
+            self.sync(body)
+            if test(body): return body
+        return None
+
+    # --- COPIA A LOS OBJETOS ---
+    def sync(self, body):
+        i = body.soa_index
+        body.x, body.prev_x, body.rect.x = float(self.x[i]), float(self.px[i]), int(self.rx[i])
+        body.hitbox.x = body.rect.x + int(self.hb_dx[i])
+
+    def reload(self):
+        """Vuelve a leer las posiciones de los cuerpos (después de restaurar una foto, ver simulation/rewind.py)."""
+        if not self.bodies: return
+        self.x[:] = [b.x for b in self.bodies]
+        self.px[:] = [b.prev_x for b in self.bodies]
+        self.rx[:] = [b.rect.x for b in self.bodies]
+        self.dirty = False
+
+    def sync_all(self):
+        if not self.dirty: return
+        # Elemento por elemento: sin listas intermedias por frame
+        x, px, rx, hb_dx = self.x.item, self.px.item, self.rx.item, self._hb_dx
+        for i, b in enumerate(self.bodies):
+            b.x, b.prev_x = x(i), px(i)
+            b.rect.x = r = rx(i)
+            b.hitbox.x = r + hb_dx[i]
+        self.dirty = False
@@ -0,0 +1,131 @@
+import math
+
+# --- RELOJ DE ANIMACION Y LINEAS DE TIEMPO PRECOMPILADAS ---
+# Lo que se anima igual para muchos (todas las tortugas de un grupo, todos los
+# cocodrilos, todas las serpientes, los pulsos del HUD) es una sola línea de
+# tiempo: una tabla con el valor de cada tick, armada una vez. AnimClock la
+# evalúa una vez por tick y los cuerpos sólo guardan la referencia (`anim`) y
+# leen `anim.value`; el costo va con las líneas distintas, no con los sprites.
+# Las tablas se calculan con aritmética exacta (sin ir sumando floats).
+class Timeline:
+    __slots__ = ("table", "loop", "value")
+
+    def __init__(self, table, loop=True):
+        self.table, self.loop = tuple(table), loop
+        self.value = self.table[0]
+
+    def at(self, tick):
+        """Valor en el tick `tick` (desde que arrancó la línea)."""
+        if self.loop: return self.table[tick % len(self.table)]
+        return self.table[min(tick, len(self.table) - 1)]
+
+    def __len__(self):
+        return len(self.table)
+
+
+class AnimClock:
+    """Líneas de tiempo compartidas por clave; todas arrancan en el tick 0 del reloj."""
+    def __init__(self):
+        self.ticks = 0
+        self._timelines = {}
+        self._live = []
+
+    def reset(self):
+        self.ticks = 0
+        self._timelines.clear()
+        self._live.clear()
+
+    def timeline(self, key):
+        """La línea de `key` (("turtle", fase), ("croc",), ...), compilada la primera vez."""
+        tl = self._timelines.get(key)
+        if tl is None:
+            tl = self._timelines[key] = Timeline(table(key))
+            tl.value = tl.at(self.ticks)
+            self._live.append(tl)
+        return tl
+
+    def advance(self, ticks=1):
+        self.ticks += ticks
+        t = self.ticks
+        for tl in self._live: tl.value = tl.table[t % len(tl.table)] if tl.loop else tl.at(t)
+
+    def set(self, ticks):
+        """Salta a `ticks` (reloj de pantalla: milisegundos de pygame.time.get_ticks())."""
+        self.advance(ticks - self.ticks)
+
+    def __getitem__(self, key):
+        return self.timeline(key).value
+
+    def __len__(self):
+        return len(self._live)
+
+
+# --- TABLAS ---
+# Tortuga: ciclo de 18 unidades a 0.06 por tick (300 ticks). Cada tick da
+# (cuadro, hundida): 0-4 -> cuadro c (hundida en 4), 5-8 -> bajo el agua (-1),
+# 9-12 -> c - 4, 13-17 -> 0. La fase del grupo corre el ciclo.
+TURTLE_CYCLE, TURTLE_STEP = 18, 0.06
+# Cocodrilo: el sprite original sumaba 0.02 dos veces por frame, o sea 0.04
+# por tick -> un entero del timer cada 25 ticks; impar = boca abierta
+CROC_STEP = 0.04
+CROC_HALF = round(1 / CROC_STEP)
+# Serpiente y muerte de la rana: 0.15 cuadros por tick -> 3 cuadros cada 20 ticks
+FRAME_NUM, FRAME_DEN = 3, 20
+DEATH_FRAMES = 7
+
+
+def _turtle(phase):
+    period = round(TURTLE_CYCLE / TURTLE_STEP)
+    table = []
+    for k in range(period):
+        c = int((phase + k * TURTLE_STEP) % TURTLE_CYCLE + 1e-9)
+        if c < 5: table.append((c, c == 4))
+        elif c < 9: table.append((-1, True))
+        elif c < 13: table.append((c - 4, False))
+        else: table.append((0, False))
+    return table
+
+
+def death_table():
+    # Cuadro de la muerte por tick desde que murió; el último valor (None) = terminó
+    n = -(-DEATH_FRAMES * FRAME_DEN // FRAME_NUM)
+    return [k * FRAME_NUM // FRAME_DEN for k in range(n)] + [None]
+
+
+def _pulse(speed, steps, period_ms):
+    # round(|sin(ms * speed)| * steps) / steps, como los pulsos de texto de los menús
+    return [round(abs(math.sin(ms * speed)) * steps) / steps for ms in range(period_ms)]
+
+
+def _compile(key):
+    kind = key[0]
+    if kind == "turtle": return _turtle(key[1])
+    if kind == "croc": return ["CLOSED"] * CROC_HALF + ["OPEN"] * CROC_HALF
+    if kind == "snake": return [k * FRAME_NUM // FRAME_DEN for k in range(FRAME_DEN)]
+    # Pantalla (milisegundos): ("pulse", velocidad, escalones), ("blink", período), ("frames", cuadros, ms por cuadro)
+    if kind == "pulse": return _pulse(key[1], key[2], round(math.pi / key[1]))
+    if kind == "blink": return [True] * (key[1] // 2) + [False] * (key[1] - key[1] // 2)
+    if kind == "frames": return [i for i in range(key[1]) for _ in range(key[2])]
+    raise KeyError(f"Línea de tiempo desconocida: {key!r}")
+
+
+_tables = {}
+_still = {}
+
+def table(key):
+    """Tabla de `key`; se compila una sola vez por proceso."""
+    t = _tables.get(key)
+    if t is None: t = _tables[key] = tuple(_compile(key))
+    return t
+
+
+def still(key):
+    """Línea de `key` que no avanza (cuerpos sueltos, antes de engancharlos a un reloj)."""
+    tl = _still.get(key)
+    if tl is None: tl = _still[key] = Timeline(table(key))
+    return tl
+
+
+# La muerte de la rana no se comparte (empieza cuando muere): la rana cuenta
+# sus ticks y lee esta tabla
+DEATH = Timeline(death_table(), loop=False)
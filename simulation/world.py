@@ -0,0 +1,363 @@
+import struct
+import zlib
+from simulation.layout import MARGIN_X, OFFSET_Y, TILE_SIZE, ROWS, GAME_WIDTH, MAX_TIME, SIM_DT
+from simulation.bodies import Snake, Coin, Frog
+from simulation.lanes import LaneIndex
+from simulation.levels import FACTORIES, default_levels
+from simulation.timelines import AnimClock
+from simulation import soa
+
+# --- MUNDO DE JUEGO SIN PYGAME ---
+# Toda la lógica de una partida: obstáculos, rana, colisiones, puntaje, metas,
+# tortugas que se hunden y el tiempo. Avanza con step() a paso fijo y con su
+# propio reloj, así que corre igual en pantalla que sin ventana ni audio.
+# Lo que la vista tiene que reflejar (sonidos, textos, cambio de estado) sale
+# como eventos en `self.events`: tuplas (nombre, *datos).
+# El azar y el reloj son los de la sesión, para que una partida sea repetible.
+ACTIONS = ("UP", "DOWN", "LEFT", "RIGHT", "GOD", "LIVES")
+
+class World:
+    def __init__(self, session, rng=None, clock=None, vector_lanes=False, levels=None):
+        self.session = session
+        self.levels = levels or default_levels()  # carriles de cada nivel (simulation/levels.json)
+        self.rng = rng or session.rng
+        self.clock = clock or session.clock
+        # Dos listas de eventos que se turnan: drain_events no crea una nueva en cada tick
+        self.events = []
+        self._spare_events = []
+
+        self.slots_rangos = [(MARGIN_X + 59 + (i*120), MARGIN_X + 99 + (i*120)) for i in range(5)]
+        self.start_x = MARGIN_X + 300
+        self.start_y = OFFSET_Y + (14 * TILE_SIZE)
+
+        self.cars, self.logs, self.turtles, self.snakes, self.crocodiles, self.coins = [], [], [], [], [], []
+        self._groups = (self.cars, self.logs, self.turtles, self.snakes, self.crocodiles)
+        self.trunk_snake = None
+        self.target_log = None
+        # Colisiones por fila: cada consulta sólo recorre los carriles que pisa la rana
+        self.lanes = LaneIndex(OFFSET_Y, TILE_SIZE, ROWS)
+        self.generation = 0  # sube cada vez que se rearma el nivel
+        # Fases de animación (tortugas, cocodrilos, serpientes): una línea de tiempo por fase distinta
+        self.anim = AnimClock()
+        # Motor NumPy opcional para autos/troncos/tortugas/cocodrilos (simulation/soa.py)
+        self.vector_lanes = vector_lanes
+        self.engine = None
+        self._engine_entries = []
+
+        self.frog = None
+        self.next_coin_spawn_time = 0
+        self.time_warning_played = False
+        self.max_row_reached = 14
+        self.pause_state = None
+        self.pause_timer = 0.0
+        self.profiler = None  # opcional: algo con push(nombre)/pop() para medir colisiones
+        self.recorder = None  # opcional: recibe (tick, acción) de cada entrada (ver replay.py)
+        self.rewind = None    # opcional: lo mismo, para las fotos por tick (ver simulation/rewind.py)
+        self.build = None     # (nivel, dificultad, estado del azar) con que se armó el nivel actual
+        self.deaths = {}  # causa -> muertes en la partida (car, snake, water, time)
+        # Opcional: máscaras por píxel (simulation.masks.ShapeSet). Sin ellas valen los hitbox a mano
+        self.shapes = None
+
+    def emit(self, name, *data):
+        self.events.append((name,) + data)
+
+    def drain_events(self):
+        """Eventos del tick; la lista vale hasta la próxima llamada (después se reutiliza)."""
+        events = self.events
+        self._spare_events.clear()
+        self.events, self._spare_events = self._spare_events, events
+        return events
+
+    def obstacle_groups(self):
+        return self._groups
+
+    # --- ARMADO DEL NIVEL ---
+    def start(self):
+        self.pause_state = None
+        self.deaths.clear()
+        self.reset_level_entities()
+
+    def reset_level_entities(self):
+        self.build = (self.session.level, self.session.difficulty_multiplier, self.rng.getstate())
+        for group in self.obstacle_groups(): group.clear()
+        self.coins.clear()
+        self.lanes.clear()
+        self.anim.reset()
+        self.trunk_snake = None
+        self.target_log = None
+        self._engine_entries = []
+        self._setup_entities()
+        if self.vector_lanes and soa.AVAILABLE:
+            if self.engine is None: self.engine = soa.LaneEngine(OFFSET_Y, TILE_SIZE, ROWS)
+            self.engine.build(self._engine_entries)
+        else: self.engine = None
+        self.generation += 1
+        self.next_coin_spawn_time = self.clock.ms + self.rng.randint(8000, 15000)
+        self.spawn_frog()
+
+    def _setup_entities(self):
+        # Se instancia desde la tabla ya compilada del nivel (simulation/levels.py)
+        m = self.session.difficulty_multiplier
+        groups = {"car": self.cars, "log": self.logs, "turtle": self.turtles, "croc": self.crocodiles, "snake": self.snakes}
+        named = {}
+        for lane in self.levels.table(self.session.level):
+            if lane.rides:
+                # Serpiente sobre un tronco al azar del carril nombrado
+                carriers = named.get(lane.rides)
+                if not carriers: continue
+                self.target_log = self.rng.choice(carriers)
+                self.trunk_snake = self._spawn(self.snakes, "snake", Snake(self.target_log.rect.x, lane.y, self.target_log.speed, MARGIN_X, GAME_WIDTH))
+                continue
+            speed = lane.speed * m
+            pick = self.rng.randint(0, len(lane.items) - 1) if lane.swap else -1
+            carriers = named.setdefault(lane.name, []) if lane.name else None
+            for i, (x, phase) in enumerate(lane.items):
+                kind = lane.swap if i == pick else lane.kind
+                body = self._spawn(groups[kind], kind, FACTORIES[kind](x, lane.y, speed, lane.params, phase))
+                if carriers is not None and kind == lane.kind: carriers.append(body)
+
+    def _spawn(self, group, kind, body):
+        if self.shapes is not None:
+            # Con máscaras el hitbox es el rect entero: sólo filtra candidatos, decide la máscara
+            body.inset = (0, 0)
+            body.hitbox.inflate_from(body.rect, 0, 0)
+        if body.anim_key: body.anim = self.anim.timeline(body.anim_key)
+        group.append(body)
+        self.lanes.add(kind, body)
+        if kind in soa.KINDS: self._engine_entries.append((kind, body))
+        return body
+
+    def _hit(self, kind, box, test=None):
+        if self.engine and kind in soa.KINDS: return self.engine.hit(kind, box, test)
+        return self.lanes.hit(kind, box, test)
+
+    def _touches(self, body):
+        """Fase fina de los choques: ¿se tocan los píxeles de la rana y los de `body`?"""
+        frog, shapes = self.frog, self.shapes
+        return shapes.get(frog.shape_key()).overlap(shapes.get(body.shape_key()), body.hitbox.x - frog.rect.x, body.hitbox.y - frog.rect.y)
+
+    def _under(self, body, key=None):
+        """Fase fina del río: ¿los pies de la rana (su hitbox) pisan píxeles de `body`?"""
+        hb, shapes = self.frog.hitbox, self.shapes
+        return shapes.get(key or body.shape_key()).overlap(shapes.box(hb.w, hb.h), hb.x - body.hitbox.x, hb.y - body.hitbox.y)
+
+    @property
+    def collision_checks(self):
+        return self.lanes.checks + (self.engine.checks if self.engine else 0)
+
+    def sync_bodies(self):
+        """Con el motor NumPy activo, deja los cuerpos al día para quien los vaya a leer."""
+        if self.engine: self.engine.sync_all()
+
+    def spawn_frog(self):
+        self.frog = Frog(self.start_x, self.start_y, MARGIN_X)
+        self.session.time_left = MAX_TIME
+        self.time_warning_played = False
+        self.max_row_reached = 14
+
+    # --- UN TICK DE SIMULACION ---
+    def step(self, dt=SIM_DT):
+        self.clock.advance()
+        current_time = self.clock.ms
+        session = self.session
+        old_lives = session.lives
+        self.frog.prev_x = self.frog.x
+
+        if self.pause_state is not None:
+            self.pause_timer -= dt
+            self._update_obstacles(current_time)
+            if self.pause_timer <= 0:
+                if self.pause_state == "LEVEL_TRANSITION":
+                    session.level += 1
+                    session.lives = min(session.lives + 1, 9)
+                    self.emit("extralife")
+                    session.difficulty_multiplier += 0.15
+                    session.slots_ocupados = [False]*5
+                    self.reset_level_entities()
+                elif self.pause_state == "GOAL_TRANSITION":
+                    self.spawn_frog()
+                elif self.pause_state == "GAME_OVER_TRANSITION":
+                    self.emit("game_over")
+                self.pause_state = None
+            return
+
+        if current_time >= self.next_coin_spawn_time:
+            self.sync_bodies()
+            self.coins.append(Coin(self.logs + self.crocodiles, self.rng, current_time))
+            self.next_coin_spawn_time = current_time + self.rng.randint(8000, 15000)
+
+        frog = self.frog
+        if frog.state == "ALIVE":
+            session.time_left -= dt
+            if session.time_left <= 5 and not self.time_warning_played:
+                self.time_warning_played = True
+                self.emit("time_warning")
+            if session.time_left <= 0 and self.kill_frog("time"): return
+
+            prof = self.profiler
+            if prof: prof.push("collision")
+            died = self._collide(frog)
+            if prof: prof.pop()
+            if died: return
+
+            if session.lives > old_lives: self.emit("extralife")
+
+        if frog.is_finished:
+            if session.lives <= 0:
+                if self.pause_state != "GAME_OVER_TRANSITION":
+                    self.emit("music_stop")
+                    self.pause_state = "GAME_OVER_TRANSITION"
+                    self.pause_timer = 1.5
+            else:
+                self.spawn_frog()
+            return
+
+        frog.update()
+        self._update_obstacles(current_time)
+
+        if self.engine and self.target_log: self.engine.sync(self.target_log)
+        for s in self.snakes:
+            if s == self.trunk_snake and self.target_log: s.follow(self.target_log, 10)
+            else:
+                if s.rect.left <= MARGIN_X: s.speed = abs(s.speed)
+                elif s.rect.right >= MARGIN_X + GAME_WIDTH: s.speed = -abs(s.speed)
+
+    def _collide(self, frog):
+        """Choques, monedas y río. Devuelve True si la rana murió en este tick."""
+        if self.shapes is None:
+            hb, test = frog.hitbox, None
+        else:
+            # El sprite entero como fase gruesa; la máscara decide
+            hb, test = frog.rect, self._touches
+        hit = "car" if self._hit("car", hb, test) else "snake" if self._hit("snake", hb, test) else None
+        if hit and self.kill_frog(hit): return True
+
+        for c in self.coins:
+            if c.alive and frog.rect.colliderect(c.hitbox):
+                self.session.add_score(100)
+                c.alive = False
+                self.emit("coin", c.rect.x, c.rect.y)
+
+        if self.in_river(frog):
+            platform = self.platform_under(frog)
+            if platform: frog.ride(platform.speed)
+            elif self.kill_frog("water"): return True
+        return False
+
+    def _update_obstacles(self, now):
+        self.anim.advance()
+        if self.engine:
+            self.engine.step()
+            for body in self.snakes: body.update()
+            for c in self.coins:
+                if c.parent_platform: self.engine.sync(c.parent_platform)
+        else:
+            for group in self._groups:
+                for body in group: body.update()
+        # Las monedas muertas se compactan en la misma lista
+        coins, alive = self.coins, 0
+        for c in coins:
+            c.update(now)
+            if c.alive:
+                coins[alive] = c
+                alive += 1
+        if alive < len(coins): del coins[alive:]
+
+    def in_river(self, frog):
+        river_top, river_bottom = OFFSET_Y + TILE_SIZE, OFFSET_Y + 6 * TILE_SIZE
+        return river_top <= frog.hitbox.centery < river_bottom
+
+    def platform_under(self, frog):
+        """Tronco, tortuga a flote o cocodrilo (fuera de su boca) que sostiene a la rana."""
+        hb = frog.hitbox
+        test = self._under if self.shapes is not None else None
+        l = self._hit("log", hb, test)
+        if l: return l
+        t = self._hit("turtle", hb, test)
+        if t and not t.is_submerged: return t
+        c = self._hit("croc", hb, test)
+        if c and not (c.state == "OPEN" and self._in_jaws(c, hb)): return c
+        return None
+
+    def _in_jaws(self, croc, hb):
+        if self.shapes is None: return hb.colliderect(croc.head())
+        return self._under(croc, croc.head_shape)
+
+    def kill_frog(self, cause):
+        """Devuelve True si la rana murió (en modo dios sólo se repone el tiempo)."""
+        if self.frog.state != "ALIVE": return False
+        if self.session.god_mode:
+            if self.session.time_left <= 0:
+                self.session.time_left = MAX_TIME
+                self.time_warning_played = False
+                self.emit("time_stop")
+            return False
+        self.session.lives -= 1
+        self.deaths[cause] = self.deaths.get(cause, 0) + 1
+        self.emit("time_stop")
+        self.emit("squash")
+        self.frog.die()
+        return True
+
+    # --- ENTRADA DEL JUGADOR ---
+    def apply(self, action):
+        """Única puerta de entrada a la simulación: saltos y teclas de depuración."""
+        if self.recorder: self.recorder.log(self.clock.ticks, action)
+        if self.rewind: self.rewind.log(self.clock.ticks, action)
+        if action == "GOD": self.session.god_mode = not self.session.god_mode
+        elif action == "LIVES": self.session.lives += 5
+        else: return self.move(action)
+        return True
+
+    def can_move(self):
+        """¿Se tomaría un salto en este tick? (no hay transición y la rana está viva)"""
+        return self.pause_state is None and self.frog.state == "ALIVE"
+
+    def move(self, direction):
+        """Salto de la rana. Devuelve False si se ignoró (transición o rana muerta)."""
+        if not self.can_move(): return False
+        session, frog = self.session, self.frog
+        old_lives = session.lives
+        old_y = frog.rect.y
+
+        res = frog.move(direction, self.slots_rangos if direction == "UP" else None)
+        self.emit("jump")
+
+        if direction == "UP" and frog.rect.y < old_y:
+            current_row = (frog.rect.y - OFFSET_Y) // TILE_SIZE
+            if current_row < self.max_row_reached:
+                session.add_score(10)
+                self.max_row_reached = current_row
+
+        if res is not None:
+            if not session.slots_ocupados[res]:
+                session.slots_ocupados[res] = True
+                session.add_score(100)
+                self.emit("time_stop")
+                self.emit("slot", res)
+
+                frog.state = "SAFE"
+                frog.place(-1000)
+                frog.rect.y = -1000
+
+                if all(session.slots_ocupados):
+                    session.add_score(1000)
+                    self.pause_state = "LEVEL_TRANSITION"
+                    self.pause_timer = 2.0
+                else:
+                    self.pause_state = "GOAL_TRANSITION"
+                    self.pause_timer = 0.5
+            else: frog.rect.y += TILE_SIZE
+
+        if session.lives > old_lives: self.emit("extralife")
+        return True
+
+    def digest(self):
+        """CRC del estado de la partida, para comprobar que un replay salió idéntico."""
+        self.sync_bodies()
+        s, f = self.session, self.frog
+        data = [struct.pack("<IiiidQ", self.clock.ticks, s.score, s.lives, s.level, s.time_left, s.seed & 0xFFFFFFFFFFFFFFFF),
+                struct.pack("<ddi", f.x, f.prev_x, f.rect.y), f.state.encode()]
+        for group in self.obstacle_groups() + (self.coins,):
+            for b in group: data.append(struct.pack("<ddi", b.x, b.speed, b.rect.y))
+        return zlib.crc32(b"".join(data))
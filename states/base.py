@@ -2,7 +2,9 @@ class State:
     def __init__(self, game):
         self.game = game
 
+    def preload(self): pass
     def on_enter(self): pass
+    def on_exit(self): pass
     def update(self, dt): pass
     def render(self, surface): pass
     def handle_events(self, events): pass
\ No newline at end of file
@@ -1,12 +1,21 @@
 import pygame
-import random
 import os
-import math 
+import time
 from states.base import State
-from constants import MARGIN_X, OFFSET_Y, TILE_SIZE, MAP_PATH, GOAL_PATH, MAX_TIME, GAME_WIDTH, GAME_MUSIC_PATH, COIN_SOUND_PATH, JUMP_SOUND_PATH, SQUASH_SOUND_PATH, TIME_SOUND_PATH, EXTRALIFE_SOUND_PATH, SELECT_SOUND_PATH, SLOT_SOUND_PATH
+from constants import BASE_PATH, MARGIN_X, OFFSET_Y, MAP_PATH, GOAL_PATH, MAX_TIME, GAME_WIDTH, GAME_MUSIC_PATH, COIN_SOUND_PATH, JUMP_SOUND_PATH, SQUASH_SOUND_PATH, TIME_SOUND_PATH, EXTRALIFE_SOUND_PATH, SELECT_SOUND_PATH, SLOT_SOUND_PATH
 from arcade_machine_sdk import BASE_WIDTH, BASE_HEIGHT
-from entities.frog import Frog
-from entities.obstacles import Car, Log, Turtle, Snake, Crocodile, Coin
+from assets import ASSETS
+from entities.frog import FrogSprite
+from entities.obstacles import CarSprite, LogSprite, TurtleSprite, SnakeSprite, CrocodileSprite, CoinSprite
+from entities.shapes import make_shapes, warm
+from simulation.world import World
+from simulation.session import Session
+from simulation.replay import Recorder
+from simulation.rewind import RewindBuffer
+from simulation.autopilot import Autopilot, LIVE_BUDGET
+from profiler import ProfilerOverlay
+from effects import EffectPool
+from inputs import MoveBuffer
 
 class GameplayState(State):
     def __init__(self, game):
@@ -14,15 +23,35 @@ class GameplayState(State):
         self.background = None
         self.goal_image = None
         
-        self.slots_rangos = [(MARGIN_X + 59 + (i*120), MARGIN_X + 99 + (i*120)) for i in range(5)]
-        self.start_x = MARGIN_X + 300
-        self.start_y = OFFSET_Y + (14 * TILE_SIZE)
+        # Toda la lógica vive en la simulación; este estado sólo la dibuja y la hace sonar
+        self.world = World(game.session)
+        self.world.profiler = game.profiler
+        # Máscaras por píxel de cada cuadro (se comparten entre partidas; ver simulation/masks.py)
+        self.shapes = make_shapes()
+        self.recorder = None
+        self.replay_dir = os.path.join(BASE_PATH, "replays")
+        self.replays_kept = 20
+        # Fotos del mundo por tick: Backspace (mantenida) rebobina y un error las vuelca en crashes/
+        self.rewind = None
+        self.rewinding = False
+        self._rewind_from = None
+        self.crash_dir = os.path.join(BASE_PATH, "crashes")
+        # Piloto automático (demo del menú o F2): planea con este tope de CPU por cuadro
+        self.autopilot = None
+        self.pilot_budget = LIVE_BUDGET
+        # Saltos pendientes (ver inputs.py): a lo sumo uno por tick
+        self.moves = MoveBuffer()
+        self._move_tick = None
+        self.slots_rangos = self.world.slots_rangos
         
         self.cars, self.logs, self.turtles, self.snakes, self.crocodiles, self.coins = [pygame.sprite.Group() for _ in range(6)]
-        self.trunk_snake = None
-        self.target_log = None
+        self.all_sprites = pygame.sprite.Group()
+        self.frog_view = None
+        self._coin_views = {}
+        self._views_generation = None
+        # Vistas en orden de dibujo; se rearma sólo cuando cambian (no en cada frame)
+        self._draw_list = []
         
-        self.next_coin_spawn_time = 0 
         self.coin_sound = None 
         self.jump_sound = None 
         self.squash_sound = None
@@ -30,390 +59,475 @@ class GameplayState(State):
         self.extralife_sound = None 
         self.select_sound = None 
         self.slot_sound = None
-        self.time_warning_played = False 
-        
-        self.pause_state = None 
-        self.pause_timer = 0.0
         
         self.is_paused = False
         self.pause_options = ["RESUME", "RESTART", "MENU"]
         self.pause_selected_index = 0
         
         self.display_score = 0.0      
-        self.floating_texts = []      
+        self.effects = EffectPool()   # textos flotantes y estallidos de partículas
+        self.update_allocs = 0
+        
+        # --- RENDER POR RECTANGULOS SUCIOS ---
+        self._static = None
+        self._static_key = None
+        self._playfield = pygame.Rect(MARGIN_X, 0, GAME_WIDTH, BASE_HEIGHT)
+        self._prev_rects = []
+        self._hud = {}
+        self._full_redraw = True
+        
+        # --- PANEL DE PERFILADO (F3) ---
+        self.profiler_overlay = None
+        self._profiler_pos = (MARGIN_X + GAME_WIDTH + 4, 8)
+
+    def preload(self):
+        self.background = ASSETS.opaque(MAP_PATH)
+        self.goal_image = ASSETS.get(GOAL_PATH, size=(34, 34))
+        self.coin_sound = ASSETS.sound(COIN_SOUND_PATH)
+        self.jump_sound = ASSETS.sound(JUMP_SOUND_PATH)
+        self.squash_sound = ASSETS.sound(SQUASH_SOUND_PATH)
+        self.time_sound = ASSETS.sound(TIME_SOUND_PATH)
+        self.extralife_sound = ASSETS.sound(EXTRALIFE_SOUND_PATH)
+        self.select_sound = ASSETS.sound(SELECT_SOUND_PATH)
+        self.slot_sound = ASSETS.sound(SLOT_SOUND_PATH)
+        # Cuadros escalados/volteados de todas las vistas, con un nivel de prueba que tiene de todo
+        scratch = World(Session(0))
+        scratch.session.level = 4
+        scratch.start()
+        for bodies, view in ((scratch.cars, CarSprite), (scratch.logs, LogSprite), (scratch.turtles, TurtleSprite),
+                             (scratch.snakes, SnakeSprite), (scratch.crocodiles, CrocodileSprite)):
+            for body in bodies: view(body)
+        FrogSprite(scratch.frog)
+        warm(self.shapes, scratch)
+        # Fundidos de estallidos y textos flotantes: la primera moneda o muerte no arma superficies en juego
+        self.effects.prepare((self.SQUASH_COLOR, self.LIFE_COLOR, self.SLOT_COLOR),
+                             [(("+100", c), self.game.text.surface("+100", c, "ui", "shadow_small"))
+                              for c in (self.COIN_COLOR, self.SLOT_COLOR)])
+        self._build_static_layer()
 
     def on_enter(self):
         self.is_paused = False 
         self.pause_selected_index = 0
         self.display_score = self.game.score 
-        self.floating_texts.clear()
+        self.effects.clear()
+        self.moves.clear()
+        self._move_tick = None
+        self._full_redraw = True
         
-        if not self.background:
-            self.background = pygame.image.load(MAP_PATH).convert()
-        if not self.goal_image:
-            self.goal_image = pygame.transform.scale(pygame.image.load(GOAL_PATH).convert_alpha(), (34, 34))
-            
-        if self.coin_sound is None:
-            if os.path.exists(COIN_SOUND_PATH): self.coin_sound = pygame.mixer.Sound(COIN_SOUND_PATH)
-        if self.jump_sound is None:
-            if os.path.exists(JUMP_SOUND_PATH): self.jump_sound = pygame.mixer.Sound(JUMP_SOUND_PATH)
-        if self.squash_sound is None:
-            if os.path.exists(SQUASH_SOUND_PATH): self.squash_sound = pygame.mixer.Sound(SQUASH_SOUND_PATH)
-        if self.time_sound is None:
-            if os.path.exists(TIME_SOUND_PATH): self.time_sound = pygame.mixer.Sound(TIME_SOUND_PATH)
-        if self.extralife_sound is None:
-            if os.path.exists(EXTRALIFE_SOUND_PATH): self.extralife_sound = pygame.mixer.Sound(EXTRALIFE_SOUND_PATH)
-        if self.select_sound is None:
-            if os.path.exists(SELECT_SOUND_PATH): self.select_sound = pygame.mixer.Sound(SELECT_SOUND_PATH)
-        if self.slot_sound is None:
-            if os.path.exists(SLOT_SOUND_PATH): self.slot_sound = pygame.mixer.Sound(SLOT_SOUND_PATH)
-
-        if os.path.exists(GAME_MUSIC_PATH):
-            pygame.mixer.music.load(GAME_MUSIC_PATH)
-            pygame.mixer.music.set_volume(self.game.volume * 0.2) 
-            pygame.mixer.music.play(-1) 
-            
-        self.reset_level_entities()
-
-    def reset_level_entities(self):
-        for group in [self.cars, self.logs, self.turtles, self.snakes, self.crocodiles, self.coins]: group.empty()
-        self.trunk_snake = None
-        self.target_log = None
-        self._setup_entities()
-        self.next_coin_spawn_time = pygame.time.get_ticks() + random.randint(8000, 15000)
-        self.spawn_frog()
-
-    def _setup_entities(self):
-        m = self.game.difficulty_multiplier
-        traffic = [(7, -2.2*m, 0, 45, [100, 350, 550]), (8, 1.6*m, 1, 40, [50, 400]), 
-                   (9, -1.8*m, 2, 40, [150, 210, 270]), (10, 1.3*m, 3, 55, [0, 350]), 
-                   (11, -1.5*m, 1, 40, [0, 160, 320, 480]), (12, 1.9*m, 2, 40, [20, 280, 520])]
-        for r, s, idx, w, pos in traffic:
-            y = OFFSET_Y + (r * TILE_SIZE)
-            for px in pos: self.cars.add(Car(MARGIN_X + px, y, s, idx, MARGIN_X, GAME_WIDTH, w))
-        
-        y_r = [OFFSET_Y + (i * TILE_SIZE) for i in range(5, 0, -1)]
-        row1_logs = []
-        for i in range(4): 
-            l = Log(MARGIN_X + (i*160), y_r[0], -1.2*m, MARGIN_X, GAME_WIDTH, 95, 2)
-            self.logs.add(l)
-            row1_logs.append(l)
+        if not self.background: self.preload()
+
+        self.game.audio.play_music(GAME_MUSIC_PATH, -1)
             
-        for g in range(3): 
-            for i in range(2): self.turtles.add(Turtle(MARGIN_X + (g*220) + (i*46), y_r[1], 2.0*m, MARGIN_X, GAME_WIDTH, group_offset=g*6.0))
-        
-        pos_f3 = [0, 220, 440]
-        c_idx = random.randint(0, 2) if self.game.level >= 2 else -1
-        for i, px in enumerate(pos_f3):
-            if i == c_idx: self.crocodiles.add(Crocodile(MARGIN_X + px, y_r[2], -1.8*m, MARGIN_X, GAME_WIDTH))
-            else: self.logs.add(Log(MARGIN_X + px, y_r[2], -1.8*m, MARGIN_X, GAME_WIDTH, 180, 3))
-
-        for g in range(3): 
-            for i in range(3): self.turtles.add(Turtle(MARGIN_X + (g*210) + (i*46), y_r[3], 1.5*m, MARGIN_X, GAME_WIDTH, group_offset=g*5.0))
-        for i in range(3): self.logs.add(Log(MARGIN_X + (i*250), y_r[4], -2.2*m, MARGIN_X, GAME_WIDTH, 120, 1))
-
-        if self.game.level >= 2: self.snakes.add(Snake(MARGIN_X + 100, OFFSET_Y + (6 * TILE_SIZE), 2.0*m, MARGIN_X, GAME_WIDTH))
-        if self.game.level >= 3: self.snakes.add(Snake(MARGIN_X + 400, OFFSET_Y + (13 * TILE_SIZE), 2.0*m, MARGIN_X, GAME_WIDTH))
-        if self.game.level >= 4 and row1_logs:
-            self.target_log = random.choice(row1_logs)
-            self.trunk_snake = Snake(self.target_log.rect.x, y_r[0], self.target_log.speed, MARGIN_X, GAME_WIDTH)
-            self.snakes.add(self.trunk_snake)
-
-    def spawn_frog(self):
-        self.frog = Frog(self.start_x, self.start_y, MARGIN_X)
-        self.all_sprites = pygame.sprite.Group(self.frog)
-        self.game.time_left = MAX_TIME
-        self.time_warning_played = False 
-        self.max_row_reached = 14 
+        # La partida arranca siempre desde su semilla: así se puede repetir tal cual
+        self.game.session.reseed(self.game.session.seed)
+        self.world.vector_lanes = self.game.vector_lanes
+        self.world.shapes = self.shapes if self.game.pixel_collisions else None
+        self.world.start()
+        self.world.rewind = None
+        self.rewind = RewindBuffer(self.world, self.game.rewind_seconds) if self.game.rewind_seconds > 0 else None
+        self.rewinding = False
+        # La demo no se graba ni entra a la tabla de puntajes
+        self.autopilot = Autopilot(self.world, budget=self.pilot_budget) if self.game.attract else None
+        if self.game.record_replays and not self.game.attract: self.recorder = Recorder(self.world)
+        self._sync_views()
+
+    def on_exit(self):
+        self.game.audio.stop("warning")
+        self._finish_recording()
+        self.autopilot = None
+        self.game.attract = False
+
+    def _finish_recording(self):
+        if self.recorder is None: return
+        rec, self.recorder = self.recorder.finish(), None
+        if rec.end_tick == 0: return
+        try:
+            os.makedirs(self.replay_dir, exist_ok=True)
+            rec.save(os.path.join(self.replay_dir, time.strftime("%Y%m%d_%H%M%S") + f"_{rec.seed:08x}.rep"))
+            old = sorted(f for f in os.listdir(self.replay_dir) if f.endswith(".rep"))
+            for f in old[:-self.replays_kept]: os.remove(os.path.join(self.replay_dir, f))
+        except OSError as e:
+            print(f"Error guardando la grabación: {e}")
+
+    @property
+    def frog(self):
+        return self.world.frog
+
+    @property
+    def pause_state(self):
+        return self.world.pause_state
+
+    def _sync_views(self):
+        """Crea/quita sprites para que coincidan con los cuerpos de la simulación."""
+        w = self.world
+        changed = False
+        if w.generation != self._views_generation:
+            changed = True
+            for group, bodies, view in ((self.cars, w.cars, CarSprite), (self.logs, w.logs, LogSprite),
+                                        (self.turtles, w.turtles, TurtleSprite), (self.snakes, w.snakes, SnakeSprite),
+                                        (self.crocodiles, w.crocodiles, CrocodileSprite)):
+                group.empty()
+                group.add(*[view(b) for b in bodies])
+            self.coins.empty()
+            self._coin_views.clear()
+            self._views_generation = w.generation
+
+        if self.frog_view is None:
+            self.frog_view = FrogSprite(w.frog)
+            self.all_sprites = pygame.sprite.Group(self.frog_view)
+            changed = True
+        elif self.frog_view.body is not w.frog:
+            # Rana nueva (reapareció): la misma vista, así no quedan sprite y grupo viejos
+            # enlazados entre sí esperando al recolector
+            self.frog_view.body = w.frog
+            changed = True
+
+        for c in w.coins:
+            if c not in self._coin_views:
+                view = self._coin_views[c] = CoinSprite(c)
+                self.coins.add(view)
+                changed = True
+        for c in self._coin_views:
+            if not c.alive:
+                # Una moneda pudo morir en el mismo tick en que nació otra: se mira cada una
+                for dead in [c for c in self._coin_views if not c.alive]: self._coin_views.pop(dead).kill()
+                changed = True
+                break
+
+        if changed:
+            self._draw_list = [spr for gp in (self.turtles, self.logs, self.crocodiles, self.coins, self.snakes, self.cars, self.all_sprites)
+                               for spr in gp]
+
+    # Prioridad de cada efecto: si se llenan los canales del juego, cae el de menor valor
+    SFX_PRIORITY = {"jump": 0, "coin": 1, "slot": 2, "extralife": 3, "squash": 3}
+    SQUASH_COLOR, LIFE_COLOR, COIN_COLOR, SLOT_COLOR = (120, 200, 60), (255, 50, 50), (255, 215, 0), (0, 255, 255)
+
+    def _play(self, sound, name, gain=1.0):
+        if sound:
+            self.game.profiler.push("audio")
+            self.game.audio.play(sound, "game", self.SFX_PRIORITY[name], gain)
+            self.game.profiler.pop()
+
+    def _handle_world_events(self):
+        for ev in self.world.drain_events():
+            name = ev[0]
+            if name == "jump": self._play(self.jump_sound, name)
+            elif name == "squash":
+                self.effects.burst(self.frog.rect.centerx, self.frog.rect.centery, self.SQUASH_COLOR, 14)
+                self._play(self.squash_sound, name)
+            elif name == "extralife":
+                self.effects.burst(70, 185, self.LIFE_COLOR, 10, speed=60.0, gravity=0.0)
+                self._play(self.extralife_sound, name)
+            elif name == "time_warning": self.game.audio.loop(self.time_sound)
+            elif name == "time_stop": self.game.audio.stop("warning")
+            elif name == "coin":
+                self.spawn_floating_text("+100", ev[1], ev[2], self.COIN_COLOR)
+                self._play(self.coin_sound, name, 0.15)
+            elif name == "slot":
+                slot_x = (self.slots_rangos[ev[1]][0] + self.slots_rangos[ev[1]][1]) // 2 - 17
+                self.spawn_floating_text("+100", slot_x, OFFSET_Y + 10, self.SLOT_COLOR)
+                self.effects.burst(slot_x + 17, OFFSET_Y + 17, self.SLOT_COLOR, 12)
+                self._play(self.slot_sound, name)
+            elif name == "music_stop": self.game.audio.stop_music()
+            elif name == "game_over": self.game.change_state("START" if self.game.attract else "GAME_OVER")
 
     def spawn_floating_text(self, text, x, y, color=(255, 255, 255)):
-        self.floating_texts.append({
-            'text': text,
-            'x': x,
-            'y': y,
-            'timer': 1.0, 
-            'color': color
-        })
+        # La superficie se compone una vez (cache de texto); el pool guarda sus copias ya fundidas
+        key = (text, color)
+        self.effects.text(key, self.game.text.surface(text, color, "ui", "shadow_small"), x, y)
 
     def update(self, dt):
+        # Surfaces creadas durante este update (debe quedar en 0 en juego estable)
+        alloc_mark = ASSETS.allocations
+        try:
+            self._update(dt)
+        except Exception:
+            self._dump_crash()
+            raise
+        self.update_allocs = ASSETS.allocations - alloc_mark
+
+    def _update(self, dt):
         if self.is_paused:
             return
+        if self.rewinding:
+            self._rewind_tick()
+            return
 
-        current_time = pygame.time.get_ticks()
-        old_lives = self.game.lives 
-        
         if self.display_score < self.game.score:
             self.display_score += (self.game.score - self.display_score) * 10 * dt
             if self.game.score - self.display_score < 0.5:
                 self.display_score = self.game.score
                 
-        for ft in self.floating_texts:
-            ft['y'] -= 40 * dt  
-            ft['timer'] -= dt
-        self.floating_texts = [ft for ft in self.floating_texts if ft['timer'] > 0]
-        
-        if self.pause_state is not None:
-            self.pause_timer -= dt
-            for group in [self.cars, self.logs, self.turtles, self.snakes, self.crocodiles, self.coins]: group.update()
-            if self.pause_timer <= 0:
-                if self.pause_state == "LEVEL_TRANSITION":
-                    self.game.level += 1
-                    self.game.lives = min(self.game.lives + 1, 9)
-                    if self.extralife_sound:
-                        self.extralife_sound.set_volume(self.game.sfx_volume)
-                        self.extralife_sound.play()
-                    self.game.difficulty_multiplier += 0.15 
-                    self.game.slots_ocupados = [False]*5
-                    self.reset_level_entities()
-                elif self.pause_state == "GOAL_TRANSITION":
-                    self.spawn_frog()
-                elif self.pause_state == "GAME_OVER_TRANSITION":
-                    self.game.change_state("GAME_OVER")
-                self.pause_state = None
-            return 
+        self.effects.update(dt)
         
-        if current_time >= self.next_coin_spawn_time:
-            platforms = list(self.logs) + list(self.crocodiles)
-            new_coin = Coin(platforms)
-            self.coins.add(new_coin)
-            self.next_coin_spawn_time = current_time + random.randint(8000, 15000)
-
-        if self.frog.state == "ALIVE":
-            self.game.time_left -= dt
-            if self.game.time_left <= 5 and not self.time_warning_played:
-                self.time_warning_played = True
-                if self.time_sound:
-                    self.time_sound.set_volume(self.game.sfx_volume)
-                    self.time_sound.play(-1) 
-            if self.game.time_left <= 0: self.handle_death(); return
-            
-            enemies = list(self.cars) + list(self.snakes)
-            for e in enemies:
-                if self.frog.hitbox.colliderect(e.hitbox):
-                    self.handle_death(); return
-
-            for c in self.coins:
-                if self.frog.rect.colliderect(c.hitbox):
-                    self.game._add_score(100) 
-                    self.spawn_floating_text("+100", c.rect.x, c.rect.y, (255, 215, 0))
-                    c.kill() 
-                    if self.coin_sound:
-                        self.coin_sound.set_volume(self.game.sfx_volume * 0.15) 
-                        self.coin_sound.play()
-                    
-            frog_center_y = self.frog.hitbox.centery
-            river_top, river_bottom = OFFSET_Y + TILE_SIZE, OFFSET_Y + 6 * TILE_SIZE
-            
-            if river_top <= frog_center_y < river_bottom:
-                on_safe_ground, platform_speed = False, 0
-                for l in self.logs:
-                    if self.frog.hitbox.colliderect(l.hitbox):
-                        on_safe_ground, platform_speed = True, l.speed
-                        break
-                if not on_safe_ground:
-                    for t in self.turtles:
-                        if self.frog.hitbox.colliderect(t.hitbox):
-                            if not t.is_submerged: on_safe_ground, platform_speed = True, t.speed
-                            break
-                if not on_safe_ground:
-                    for c in self.crocodiles:
-                        if self.frog.hitbox.colliderect(c.hitbox):
-                            h_x = c.rect.x if c.speed < 0 else c.rect.right - 40
-                            head = pygame.Rect(h_x, c.rect.y, 40, 40)
-                            if c.state == "OPEN" and self.frog.hitbox.colliderect(head): on_safe_ground = False 
-                            else: on_safe_ground, platform_speed = True, c.speed
-                            break
-                if on_safe_ground: self.frog.rect.x += platform_speed
-                else: self.handle_death(); return
-
-            if self.game.lives > old_lives and self.extralife_sound:
-                self.extralife_sound.set_volume(self.game.sfx_volume)
-                self.extralife_sound.play()
-
-        if self.frog.is_finished:
-            if self.game.lives <= 0:
-                if self.pause_state != "GAME_OVER_TRANSITION":
-                    pygame.mixer.music.stop() 
-                    self.pause_state = "GAME_OVER_TRANSITION"
-                    self.pause_timer = 1.5
-            else:
-                self.spawn_frog()
-            return 
-
-        self.all_sprites.update()
-        for group in [self.cars, self.logs, self.turtles, self.snakes, self.crocodiles, self.coins]: group.update()
-
-        for s in self.snakes:
-            if s == self.trunk_snake and self.target_log: s.rect.x = self.target_log.rect.x + 10 
-            else:
-                if s.rect.left <= MARGIN_X: s.speed = abs(s.speed)
-                elif s.rect.right >= MARGIN_X + GAME_WIDTH: s.speed = -abs(s.speed)
+        if self.rewind: self.rewind.capture()
+        self.world.step(dt)
+        # El próximo salto pendiente entra en el tick que sigue (o apenas termina una transición)
+        self._feed_moves()
+        self._handle_world_events()
+        self._sync_views()
 
     def handle_events(self, events):
+        if self.autopilot is not None:
+            if self.game.attract and any(e.type == pygame.KEYDOWN for e in events):
+                # Cualquier tecla corta la demo
+                self.game.audio.stop_music()
+                self.game.change_state("START")
+                return
+            events = self._pilot_events(events)
+        # Todas las teclas de este lote se leyeron ahora: es su hora de llegada
+        now = self.moves.clock()
         for e in events:
+            if e.type == pygame.KEYUP and e.key == pygame.K_BACKSPACE and self.rewinding:
+                self._end_rewind()
             if e.type == pygame.KEYDOWN:
                 
                 if e.key in [pygame.K_p, pygame.K_ESCAPE]:
                     if self.pause_state is None:
                         self.is_paused = not self.is_paused
                         self.pause_selected_index = 0
-                        if self.is_paused: pygame.mixer.music.pause()
-                        else: pygame.mixer.music.unpause()
+                        self.moves.clear()
+                        self.game.audio.pause_music(self.is_paused)
                 
                 if self.is_paused:
                     if e.key == self.game.controls["UP"]:
                         self.pause_selected_index -= 1
                         if self.pause_selected_index < 0: self.pause_selected_index = len(self.pause_options) - 1
-                        if self.select_sound:
-                            self.select_sound.set_volume(self.game.sfx_volume * 0.15)
-                            self.select_sound.play()
+                        self.game.audio.play(self.select_sound, "ui", gain=0.15)
                     elif e.key == self.game.controls["DOWN"]:
                         self.pause_selected_index += 1
                         if self.pause_selected_index >= len(self.pause_options): self.pause_selected_index = 0
-                        if self.select_sound:
-                            self.select_sound.set_volume(self.game.sfx_volume * 0.15)
-                            self.select_sound.play()
+                        self.game.audio.play(self.select_sound, "ui", gain=0.15)
                     elif e.key == pygame.K_RETURN:
-                        if self.select_sound:
-                            self.select_sound.set_volume(self.game.sfx_volume * 0.15)
-                            self.select_sound.play()
+                        self.game.audio.play(self.select_sound, "ui", gain=0.15)
                         selected = self.pause_options[self.pause_selected_index]
                         if selected == "RESUME":
                             self.is_paused = False
-                            pygame.mixer.music.unpause()
+                            self.game.audio.pause_music(False)
                         elif selected == "RESTART":
-                            self.game.lives = 5
-                            self.game.level = 1
-                            self.game.score = 0
-                            self.game.difficulty_multiplier = 1.0
-                            self.game.slots_ocupados = [False] * 5
-                            pygame.mixer.music.stop()
+                            self._finish_recording()
+                            self.game.session.reset()
+                            self.game.audio.stop_music()
                             self.game.change_state("PLAYING")
                         elif selected == "MENU":
-                            pygame.mixer.music.stop()
+                            self.game.audio.stop_music()
                             self.game.change_state("START")
                     continue 
                 
-                if self.pause_state is not None:
-                    return 
-                    
-                old_lives = self.game.lives 
+                # --- TECLAS DE DEPURACION ---
+                if e.key == pygame.K_g:
+                    self.world.apply("GOD")
+                    continue
+                elif e.key == pygame.K_l:
+                    self.world.apply("LIVES")
+                    continue
+                elif e.key == pygame.K_F2:
+                    self.autopilot = None if self.autopilot else Autopilot(self.world, budget=self.pilot_budget)
+                    continue
+                elif e.key == pygame.K_F3:
+                    self.game.profiler.toggle()
+                    continue
+                elif e.key == pygame.K_F4:
+                    if self.game.profiler.history:
+                        print(f"Perfil exportado a {self.game.profiler.export_csv(os.path.join(BASE_PATH, 'profiles'))}")
+                    continue
+                elif e.key == pygame.K_BACKSPACE:
+                    if self.rewind is not None: self._start_rewind()
+                    continue
                 
-                if self.frog.state == "ALIVE":
-                    old_y = self.frog.rect.y
-                    res = None
-                    is_movement_key = False 
-                    
-                    if e.key == self.game.controls["UP"]: 
-                        res = self.frog.move("UP", self.slots_rangos)
-                        is_movement_key = True
-                    elif e.key == self.game.controls["DOWN"]: 
-                        res = self.frog.move("DOWN")
-                        is_movement_key = True
-                    elif e.key == self.game.controls["LEFT"]: 
-                        res = self.frog.move("LEFT")
-                        is_movement_key = True
-                    elif e.key == self.game.controls["RIGHT"]: 
-                        res = self.frog.move("RIGHT")
-                        is_movement_key = True
-                    
-                    if is_movement_key and self.jump_sound:
-                        self.jump_sound.set_volume(self.game.sfx_volume) 
-                        self.jump_sound.play()
-
-                    if e.key == self.game.controls["UP"] and self.frog.rect.y < old_y:
-                        current_row = (self.frog.rect.y - OFFSET_Y) // TILE_SIZE
-                        if current_row < self.max_row_reached:
-                            self.game._add_score(10)
-                            self.max_row_reached = current_row
-
-                    if res is not None:
-                        if not self.game.slots_ocupados[res]:
-                            self.game.slots_ocupados[res] = True
-                            self.game._add_score(100)
-                            
-                            slot_x = (self.slots_rangos[res][0] + self.slots_rangos[res][1]) // 2 - 17
-                            self.spawn_floating_text("+100", slot_x, OFFSET_Y + 10, (0, 255, 255))
-                            
-                            if self.time_sound: self.time_sound.stop()
-                                
-                            self.frog.state = "SAFE" 
-                            self.frog.rect.x = -1000
-                            self.frog.rect.y = -1000
-                            
-                            if self.slot_sound:
-                                self.slot_sound.set_volume(self.game.sfx_volume)
-                                self.slot_sound.play()
-                                
-                            if all(self.game.slots_ocupados): 
-                                self.game._add_score(1000)
-                                self.pause_state = "LEVEL_TRANSITION"
-                                self.pause_timer = 2.0 
-                            else: 
-                                self.pause_state = "GOAL_TRANSITION"
-                                self.pause_timer = 0.5 
-                        else: self.frog.rect.y += TILE_SIZE 
-                        
-                    if self.game.lives > old_lives and self.extralife_sound:
-                        self.extralife_sound.set_volume(self.game.sfx_volume)
-                        self.extralife_sound.play()
-
-    def handle_death(self):
-        if self.frog.state == "ALIVE":
-            self.game.lives -= 1
-            if self.time_sound: self.time_sound.stop()
-            if self.squash_sound:
-                self.squash_sound.set_volume(self.game.sfx_volume)
-                self.squash_sound.play()
-            self.frog.die()
+                # En una transición el salto queda en espera en vez de perderse
+                for direction in ("UP", "DOWN", "LEFT", "RIGHT"):
+                    if e.key == self.game.controls[direction]:
+                        self.moves.push(direction, now)
+                        self._feed_moves()
+                        break
 
-    def render(self, surface):
-        surface.blit(self.background, (0, 0))
-        
-        clip_rect = pygame.Rect(MARGIN_X, 0, GAME_WIDTH, BASE_HEIGHT)
-        surface.set_clip(clip_rect)
+    def _feed_moves(self):
+        """Aplica el próximo salto pendiente si la rana puede saltar y todavía no saltó en este tick."""
+        w = self.world
+        if not self.moves or self._move_tick == w.clock.ticks or not w.can_move(): return
+        move = self.moves.pop()
+        if move is None: return
+        w.apply(move[1])
+        self._move_tick = w.clock.ticks
+        self.moves.applied(move[0])
+        self._handle_world_events()
+
+    # --- REBOBINADO (DEPURACION) ---
+    def _start_rewind(self):
+        self.rewinding = True
+        self._rewind_from = self.pause_state
+        self.moves.clear()
+        self.game.audio.stop("warning")
+        if self.recorder is not None:
+            # Lo grabado ya no lleva a este estado: la partida deja de grabarse
+            self.world.recorder = self.recorder = None
+            print("Rebobinado: esta partida ya no se graba")
+
+    def _rewind_tick(self):
+        # Una foto por tick, hacia atrás; sin historia queda quieta hasta soltar la tecla
+        if not self.rewind.pop(): return
+        self.world.drain_events()
+        self.effects.clear()
+        self.display_score = self.game.score
+        self._sync_views()
+
+    def _end_rewind(self):
+        self.rewinding = False
+        if self.autopilot is not None: self.autopilot = Autopilot(self.world, budget=self.pilot_budget)
+        if self._rewind_from == "GAME_OVER_TRANSITION" and self.pause_state != "GAME_OVER_TRANSITION":
+            self.game.audio.play_music(GAME_MUSIC_PATH, -1)
+
+    def _dump_crash(self):
+        """Vuelca las últimas fotos para reproducir el error sin ventana (python replay.py --crash ARCHIVO)."""
+        if self.rewind is None or not self.rewind.count: return
+        try:
+            os.makedirs(self.crash_dir, exist_ok=True)
+            path = os.path.join(self.crash_dir, time.strftime("%Y%m%d_%H%M%S") + f"_{self.game.session.seed:08x}.snap")
+            self.rewind.save(path)
+            print(f"Últimos {self.rewind.count} ticks guardados en {path}")
+        except OSError as e:
+            print(f"Error guardando el volcado: {e}")
+
+    def _pilot_events(self, events):
+        """El piloto "aprieta" la tecla configurada: su salto entra por el mismo camino que el del jugador."""
+        if self.is_paused: return events
+        self.game.profiler.push("autopilot")
+        action = self.autopilot.next_action()
+        self.game.profiler.pop()
+        if action is None: return events
+        return list(events) + [pygame.event.Event(pygame.KEYDOWN, key=self.game.controls[action])]
+
+    def _build_static_layer(self):
+        # Fondo + metas ocupadas: es lo que se "restaura" debajo de cada sprite
+        self._static = self.background.copy()
         if self.goal_image:
             for i, oc in enumerate(self.game.slots_ocupados):
                 if oc:
                     x_p = (self.slots_rangos[i][0] + self.slots_rangos[i][1]) // 2 - 17
-                    surface.blit(self.goal_image, (x_p, OFFSET_Y + 3))
-        
-        for gp in [self.turtles, self.logs, self.crocodiles, self.coins, self.snakes, self.cars, self.all_sprites]:
-            gp.draw(surface)
-            
+                    self._static.blit(self.goal_image, (x_p, OFFSET_Y + 3))
+        self._static_key = tuple(self.game.slots_ocupados)
+
+    def render(self, surface):
+        self._render(surface)
+        # Los saltos aplicados desde el frame anterior ya están en pantalla
+        self.moves.presented()
+
+    def _render(self, surface):
+        if self._static is None or self._static_key != tuple(self.game.slots_ocupados):
+            self._build_static_layer()
+            self._full_redraw = True
+
+        overlay = self.is_paused or self.pause_state == "LEVEL_TRANSITION"
+        if self.game.dirty_rendering and not overlay and not self._full_redraw:
+            # Modo rect-sucio: se repone el fondo sólo donde hubo algo el frame anterior
+            dirty = self._prev_rects
+            for r in dirty: surface.blit(self._static, r, r)
+            self._invalidate_hud(dirty)
+            rects = []
+            self._draw_scene(surface, rects, dirty, full=False)
+            self._draw_profiler(surface, rects)
+            self.game.dirty_rects = dirty + rects
+            self._prev_rects = rects
+            return
+
+        surface.blit(self._static, (0, 0))
+        self._prev_rects = []
+        self._draw_scene(surface, self._prev_rects, [], full=True)
+        self._draw_profiler(surface, self._prev_rects)
+        # Después de un overlay hay que volver a pintar toda la pantalla una vez
+        self._full_redraw = overlay
+        self._render_overlays(surface)
+
+    def _draw_scene(self, surface, rects, dirty, full):
+        """Dibuja sprites y HUD. `rects` recibe lo que se mueve cada frame y `dirty` los cambios del HUD."""
+        # Entre dos ticks de simulación se dibuja interpolando (en pausa, la posición real)
+        alpha = 1.0 if self.is_paused else self.game.alpha
+        self.world.sync_bodies()
+        surface.set_clip(self._playfield)
+        for spr in self._draw_list:
+            spr.update()
+            rects.append(surface.blit(spr.image, (spr.body.draw_x(alpha), spr.body.rect.y)))
         surface.set_clip(None)
         
-        for ft in self.floating_texts:
-            alpha = max(0, min(255, int(ft['timer'] * 255)))
-            txt_surf = self.game.font_ui.render(ft['text'], False, ft['color'])
-            txt_border = self.game.font_ui.render(ft['text'], False, (0, 0, 0))
-            txt_surf.set_alpha(alpha)
-            txt_border.set_alpha(alpha)
-            surface.blit(txt_border, (int(ft['x']) + 2, int(ft['y']) + 2))
-            surface.blit(txt_surf, (int(ft['x']), int(ft['y'])))
-            
-        self.game._draw_text_with_shadow(surface, f"LEVEL: {self.game.level}", (17, 63))
-        self.game._draw_text_with_shadow(surface, f"SCORE: {int(self.display_score):05d}", (16, 119))
-        self.game._draw_text_with_shadow(surface, f"LIVES: {self.game.lives}", (17, 175), (255, 50, 50))
+        self.game.profiler.push("hud")
+        self._hud_text(surface, "level", f"LEVEL: {self.game.level}", (17, 63), (255, 255, 255), full, dirty)
+        self._hud_text(surface, "score", f"SCORE: {int(self.display_score):05d}", (16, 119), (255, 255, 255), full, dirty)
+        self._hud_text(surface, "lives", f"LIVES: {self.game.lives}", (17, 175), (255, 50, 50), full, dirty)
+        labels = (("pilot", self.autopilot is not None, "DEMO" if self.game.attract else "AUTOPILOT", (17, 300), (255, 255, 0)),
+                  ("rewind", self.rewinding, "<< REWIND", (17, 330), (0, 255, 255)),
+                  ("god", self.game.god_mode, "GOD MODE", (17, 360), (255, 0, 255)))
+        for key, shown, text, pos, color in labels:
+            if shown: self._hud_text(surface, key, text, pos, color, full, dirty)
+            elif key in self._hud:
+                r = self._hud.pop(key)[2]
+                if not full:
+                    surface.blit(self._static, r, r)
+                    dirty.append(r)
         
         pct = max(0, self.game.time_left / MAX_TIME)
         
         time_color = (255, 255, 255)
         if pct <= 0.25:
-            pulse = abs(math.sin(pygame.time.get_ticks() * 0.01))
+            # El pulso va en 8 escalones para que el cache de texto no componga un color por frame
+            pulse = self.game.ui_clock[("pulse", 0.01, 8)]
             time_color = (255, int(255 * pulse), int(255 * pulse))
             
-        self.game._draw_text_with_shadow(surface, "TIME", (17, 231), time_color)
+        self._hud_text(surface, "time", "TIME", (17, 231), time_color, full, dirty)
         t_max_w, t_h = 120, 15  
         t_x, t_y = 17, 258     
         
         if pct > 0.5: t_color = (0, 255, 0)
         elif pct > 0.25: t_color = (255, 255, 0)
-        else: t_color = (255, 0, 0) if pygame.time.get_ticks() % 500 < 250 else (150, 0, 0)
+        else: t_color = (255, 0, 0) if self.game.ui_clock[("blink", 500)] else (150, 0, 0)
 
-        pygame.draw.rect(surface, (40, 40, 40), (t_x - 2, t_y - 2, t_max_w + 4, t_h + 4))
-        pygame.draw.rect(surface, t_color, (t_x, t_y, t_max_w * pct, t_h))
-            
+        bar = (int(t_max_w * pct), t_color)
+        entry = self._hud.get("time_bar")
+        if full or entry is None or entry[0] != bar:
+            r = pygame.draw.rect(surface, (40, 40, 40), (t_x - 2, t_y - 2, t_max_w + 4, t_h + 4))
+            pygame.draw.rect(surface, t_color, (t_x, t_y, t_max_w * pct, t_h))
+            self._hud["time_bar"] = (bar, None, r)
+            dirty.append(r)
+        # Partículas al final, encima del HUD: así el rect-sucio y el redibujado completo coinciden
+        self.effects.draw(surface, rects)
+        self.game.profiler.pop()
+
+    def _draw_profiler(self, surface, rects):
+        if not self.game.profiler.enabled: return
+        if self.profiler_overlay is None:
+            self.profiler_overlay = ProfilerOverlay(self.game.profiler, pygame.font.Font(None, 16))
+        groups = (("cars", self.cars), ("logs", self.logs), ("turtles", self.turtles), ("snakes", self.snakes),
+                  ("crocs", self.crocodiles), ("coins", self.coins), ("frog", self.all_sprites))
+        assets, text = ASSETS.stats(), self.game.text.stats()
+        extra = (f"cache surf {assets['surfaces']} sheets {assets['sheets']}", f"textos {text['strings']} slots {text['slots']}",
+                 f"god {'ON' if self.game.god_mode else 'OFF'}  F4 = CSV", self._input_stats())
+        rects.append(self.profiler_overlay.draw(surface, self._profiler_pos, groups, extra))
+
+    def _input_stats(self):
+        lat = self.moves.latency()
+        head = f"input {lat[0]:4.1f}/{lat[1]:4.1f} ms" if lat else "input  -- ms"
+        return f"{head} buf {len(self.moves)} x{self.moves.dropped}"
+
+    def _invalidate_hud(self, restored):
+        # Lo que se repuso desde _static (partículas sobre el panel, el F3) borró el HUD de
+        # abajo: esas entradas se vuelven a dibujar enteras aunque su valor no haya cambiado
+        if not restored: return
+        hud = self._hud
+        for key, entry in hud.items():
+            if entry[0] is not None and entry[2].collidelist(restored) != -1:
+                hud[key] = (None, None, entry[2])
+
+    def _hud_text(self, surface, key, text, pos, color, full, dirty):
+        entry = self._hud.get(key)
+        if not full and entry is not None and entry[0] == text and entry[1] == color: return
+        if not full and entry is not None:
+            surface.blit(self._static, entry[2], entry[2])
+            dirty.append(entry[2])
+        r = self.game._draw_text_with_shadow(surface, text, pos, color)
+        self._hud[key] = (text, color, r)
+        dirty.append(r)
+
+    def _render_overlays(self, surface):
         if self.pause_state == "LEVEL_TRANSITION":
             txt = f"LEVEL {self.game.level} CLEARED!"
             txt_w, txt_h = self.game.font_menu.size(txt)
@@ -424,22 +538,16 @@ class GameplayState(State):
             overlay.fill((0, 0, 0, 180))
             surface.blit(overlay, (0, y_pos - 10))
             
-            txt_borde = self.game.font_menu.render(txt, False, (0, 0, 0))
-            txt_color = self.game.font_menu.render(txt, False, (50, 255, 50))
-            surface.blit(txt_borde, (x_pos + 3, y_pos + 3))
-            surface.blit(txt_color, (x_pos, y_pos))
+            self.game.text.draw(surface, txt, (x_pos, y_pos), (50, 255, 50), "menu", "shadow")
 
         if self.is_paused:
             overlay = pygame.Surface((BASE_WIDTH, BASE_HEIGHT), pygame.SRCALPHA)
             overlay.fill((0, 0, 0, 200))
             surface.blit(overlay, (0, 0))
             
-            txt_paused_borde = self.game.font_big.render("PAUSED", False, (0, 0, 0))
-            txt_paused_color = self.game.font_big.render("PAUSED", False, (255, 255, 0))
-            x_title = (BASE_WIDTH // 2) - (txt_paused_color.get_width() // 2)
+            x_title = (BASE_WIDTH // 2) - (self.game.font_big.size("PAUSED")[0] // 2)
             y_title = (BASE_HEIGHT // 2) - 100
-            surface.blit(txt_paused_borde, (x_title + 3, y_title + 3))
-            surface.blit(txt_paused_color, (x_title, y_title))
+            self.game.text.draw(surface, "PAUSED", (x_title, y_title), (255, 255, 0), "big", "shadow")
             
             start_y = (BASE_HEIGHT // 2) - 10
             spacing = 50
@@ -452,10 +560,6 @@ class GameplayState(State):
                     text_str = opt
                     color = (255, 255, 255)
                     
-                txt_borde = self.game.font_menu.render(text_str, False, (0, 0, 0))
-                txt_color = self.game.font_menu.render(text_str, False, color)
-                x_pos = (BASE_WIDTH // 2) - (txt_color.get_width() // 2)
+                x_pos = (BASE_WIDTH // 2) - (self.game.font_menu.size(text_str)[0] // 2)
                 y_pos = start_y + (i * spacing)
-                
-                surface.blit(txt_borde, (x_pos + 3, y_pos + 3))
-                surface.blit(txt_color, (x_pos, y_pos))
\ No newline at end of file
+                self.game.text.draw(surface, text_str, (x_pos, y_pos), color, "menu", "shadow")
\ No newline at end of file
@@ -0,0 +1,71 @@
+import os
+import time
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from states.base import State
+from assets import ASSETS, decode_image, decode_sound, read_bytes
+from constants import PRELOAD_IMAGES, PRELOAD_SOUNDS, PRELOAD_MUSIC
+from arcade_machine_sdk import BASE_WIDTH, BASE_HEIGHT
+
+# --- PANTALLA DE CARGA ---
+# Decodifica imágenes, sonidos y música en un pool de hilos mientras muestra
+# el progreso. Lo que toca la pantalla (convert_alpha) se hace aquí en el hilo
+# principal al ir llegando cada archivo, con un tope de tiempo por frame.
+# Al final cada estado arma lo suyo desde el cache (preload) y se pasa al menú.
+class LoadingState(State):
+    def __init__(self, game, next_state="START"):
+        super().__init__(game)
+        self.next_state = next_state
+        self.pool = None
+        self.jobs = []
+        self.total = 0
+        self.done = 0
+        self.pending_states = []
+        self.frame_budget = 0.008  # segundos por frame para integrar lo decodificado
+
+    def on_enter(self):
+        kinds = [(p, decode_image, ASSETS.put_sheet) for p in PRELOAD_IMAGES if not ASSETS.has_sheet(p)]
+        kinds += [(p, decode_sound, ASSETS.put_sound) for p in PRELOAD_SOUNDS]
+        kinds += [(p, read_bytes, ASSETS.put_music) for p in PRELOAD_MUSIC]
+        kinds.append((self.game.leaderboard.path, lambda path: self.game.leaderboard.load(), lambda path, board: None))
+        self.pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 2), thread_name_prefix="preload")
+        self.jobs = [(path, put, self.pool.submit(decode, path)) for path, decode, put in kinds]
+        self.pending_states = [s for s in self.game.states.values() if s is not self]
+        self.total = len(self.jobs) + len(self.pending_states)
+        self.done = 0
+
+    def update(self, dt):
+        deadline = time.perf_counter() + self.frame_budget
+        while self.jobs and time.perf_counter() < deadline:
+            # Se integran en orden; si el siguiente no terminó, se espera al próximo frame
+            path, put, future = self.jobs[0]
+            if not future.done(): return
+            self.jobs.pop(0)
+            try: put(path, future.result())
+            except Exception as e:
+                print(f"Error precargando {path}: {e}")
+                put(path, None)
+            self.done += 1
+        if self.jobs: return
+
+        if self.pool:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+        # Un estado por frame para que la barra siga moviéndose
+        if self.pending_states:
+            self.pending_states.pop(0).preload()
+            self.done += 1
+            return
+        self.game.change_state(self.next_state)
+
+    def render(self, surface):
+        surface.fill((0, 0, 0))
+        txt = "LOADING..."
+        x = BASE_WIDTH // 2 - self.game.font_menu.size(txt)[0] // 2
+        self.game.text.draw(surface, txt, (x, BASE_HEIGHT // 2 - 60), (255, 255, 255), "menu", "shadow")
+
+        bar_w, bar_h = 400, 20
+        bar_x, bar_y = BASE_WIDTH // 2 - bar_w // 2, BASE_HEIGHT // 2
+        pct = self.done / self.total if self.total else 1.0
+        pygame.draw.rect(surface, (40, 40, 40), (bar_x - 2, bar_y - 2, bar_w + 4, bar_h + 4))
+        pygame.draw.rect(surface, (0, 255, 0), (bar_x, bar_y, int(bar_w * pct), bar_h))
@@ -1,8 +1,8 @@
 import pygame
 import os
-import math
 import sys
 from states.base import State
+from assets import ASSETS
 from constants import MENU_IMG_PATH, MENU_MUSIC_PATH, SELECT_SOUND_PATH
 from arcade_machine_sdk import BASE_WIDTH, BASE_HEIGHT
 
@@ -13,46 +13,44 @@ class MenuState(State):
         self.selected_index = 0
         self.bg_image = None
         self.select_sound = None
+        # Sin tocar nada durante este tiempo, arranca la demo (el piloto automático juega)
+        self.idle = 0.0
+        self.attract_after = 20.0
+
+    def preload(self):
+        # Fondo y sonido salen del cache: se arman una vez, no en cada visita
+        self.bg_image = ASSETS.opaque(MENU_IMG_PATH, (BASE_WIDTH, BASE_HEIGHT))
+        self.select_sound = ASSETS.sound(SELECT_SOUND_PATH)
 
     def on_enter(self):
         self.selected_index = 0
-        if os.path.exists(MENU_IMG_PATH):
-            img = pygame.image.load(MENU_IMG_PATH) # <-- Sin el .convert() para que no crashee
-            self.bg_image = pygame.transform.scale(img, (BASE_WIDTH, BASE_HEIGHT))
-        
-        if os.path.exists(SELECT_SOUND_PATH):
-            self.select_sound = pygame.mixer.Sound(SELECT_SOUND_PATH)
+        self.idle = 0.0
+        if self.bg_image is None or self.select_sound is None: self.preload()
             
-        if os.path.exists(MENU_MUSIC_PATH):
-            pygame.mixer.music.load(MENU_MUSIC_PATH)
-            pygame.mixer.music.set_volume(self.game.volume * 0.2)
-            pygame.mixer.music.play(-1)
+        self.game.audio.play_music(MENU_MUSIC_PATH, -1)
 
     def update(self, dt):
-        pass
+        self.idle += dt
+        if self.idle >= self.attract_after:
+            self.game.attract = True
+            self.game.change_state("PLAYING")
 
     def handle_events(self, events):
         for e in events:
             if e.type == pygame.KEYDOWN:
+                self.idle = 0.0
                 if e.key == self.game.controls["UP"]:
                     self.selected_index -= 1
                     if self.selected_index < 0:
                         self.selected_index = len(self.options) - 1
-                    if self.select_sound:
-                        self.select_sound.set_volume(self.game.sfx_volume * 0.15)
-                        self.select_sound.play()
+                    self.game.audio.play(self.select_sound, "ui", gain=0.15)
                 elif e.key == self.game.controls["DOWN"]:
                     self.selected_index += 1
                     if self.selected_index >= len(self.options):
                         self.selected_index = 0
-                    if self.select_sound:
-                        self.select_sound.set_volume(self.game.sfx_volume * 0.15)
-                        self.select_sound.play()
+                    self.game.audio.play(self.select_sound, "ui", gain=0.15)
                 elif e.key == pygame.K_RETURN:
-                    if self.select_sound:
-                        self.select_sound.set_volume(self.game.sfx_volume * 0.15)
-                        self.select_sound.play()
-                        
+                    self.game.audio.play(self.select_sound, "ui", gain=0.15)
                     selected = self.options[self.selected_index]
                     if selected == "PLAY" or selected == "START":
                         self.game.change_state("PLAYING")
@@ -81,25 +79,17 @@ class MenuState(State):
                 text_str = opt
                 color = (255, 255, 255)
                 
-            txt_borde = self.game.font_menu.render(text_str, False, (0, 0, 0))
-            txt_color = self.game.font_menu.render(text_str, False, color)
-            x_pos = (BASE_WIDTH // 2) - (txt_color.get_width() // 2)
+            x_pos = (BASE_WIDTH // 2) - (self.game.font_menu.size(text_str)[0] // 2)
             y_pos = start_y + (i * spacing)
-            
-            surface.blit(txt_borde, (x_pos + 3, y_pos + 3))
-            surface.blit(txt_color, (x_pos, y_pos))
+            self.game.text.draw(surface, text_str, (x_pos, y_pos), color, "menu", "shadow")
 
         # --- TEXTO DE INSTRUCCIONES EN LA PARTE INFERIOR (INTACTO) ---
         instrucciones = "USE ARROW KEYS TO NAVIGATE  -  PRESS ENTER TO SELECT"
         
-        pulse = abs(math.sin(pygame.time.get_ticks() * 0.003))
+        # Pulso en 16 escalones: el cache de texto guarda cada tono una sola vez
+        pulse = self.game.ui_clock[("pulse", 0.003, 16)]
         color_inst = (int(100 + 155 * pulse), int(100 + 155 * pulse), int(100 + 155 * pulse)) 
         
-        txt_borde_inst = self.game.font_ui.render(instrucciones, False, (0, 0, 0))
-        txt_color_inst = self.game.font_ui.render(instrucciones, False, color_inst)
-        
-        x_inst = (BASE_WIDTH // 2) - (txt_color_inst.get_width() // 2)
+        x_inst = (BASE_WIDTH // 2) - (self.game.font_ui.size(instrucciones)[0] // 2)
         y_inst = BASE_HEIGHT - 40  
-        
-        surface.blit(txt_borde_inst, (x_inst + 2, y_inst + 2))
-        surface.blit(txt_color_inst, (x_inst, y_inst))
\ No newline at end of file
+        self.game.text.draw(surface, instrucciones, (x_inst, y_inst), color_inst, "ui", "shadow_small")
\ No newline at end of file
@@ -1,6 +1,7 @@
 import pygame
 import os
 from states.base import State
+from assets import ASSETS
 from constants import OPTIONS_IMG_PATH, SELECT_SOUND_PATH
 from arcade_machine_sdk import BASE_WIDTH, BASE_HEIGHT
 
@@ -16,28 +17,18 @@ class OptionsState(State):
         self.select_sound = None
         self.last_play_time = 0
 
+    def preload(self):
+        self.bg = ASSETS.opaque(OPTIONS_IMG_PATH, (BASE_WIDTH, BASE_HEIGHT))
+        self.select_sound = ASSETS.sound(SELECT_SOUND_PATH)
+
     def on_enter(self):
-        if self.bg is None:
-            if os.path.exists(OPTIONS_IMG_PATH):
-                img = pygame.image.load(OPTIONS_IMG_PATH).convert()
-                self.bg = pygame.transform.scale(img, (BASE_WIDTH, BASE_HEIGHT))
-            else:
-                print("Warning: Options.png not found")
-                
-        # Cargar efecto de sonido
-        if self.select_sound is None:
-            if os.path.exists(SELECT_SOUND_PATH):
-                self.select_sound = pygame.mixer.Sound(SELECT_SOUND_PATH)
-            else:
-                print(f"Advertencia: No se encontró {SELECT_SOUND_PATH}")
+        if self.bg is None or self.select_sound is None: self.preload()
 
     # --- FUNCIÓN DE SONIDO CON DELAY (COOLDOWN) ---
     def play_select_sound(self):
         current_time = pygame.time.get_ticks()
         if current_time - self.last_play_time > 150:
-            if self.select_sound:
-                self.select_sound.set_volume(self.game.sfx_volume * 0.15) 
-                self.select_sound.play()
+            self.game.audio.play(self.select_sound, "ui", gain=0.15)
             self.last_play_time = current_time
 
     def handle_events(self, events):
@@ -64,12 +55,10 @@ class OptionsState(State):
                     if e.key == pygame.K_LEFT:
                         self.game.volume = max(0.0, self.game.volume - 0.1)
                         self.game.save_config() 
-                        pygame.mixer.music.set_volume(self.game.volume * 0.2) 
                         self.play_select_sound()
                     elif e.key == pygame.K_RIGHT:
                         self.game.volume = min(1.0, self.game.volume + 0.1)
                         self.game.save_config() 
-                        pygame.mixer.music.set_volume(self.game.volume * 0.2) 
                         self.play_select_sound()
                         
                 elif self.options[self.selected_index] == "EFFECTS":
@@ -119,11 +108,6 @@ class OptionsState(State):
             color = (125, 33, 129) if i == self.selected_index else (255, 255, 255)
             if self.waiting_for_key and i == self.selected_index: color = (255, 255, 0) 
 
-            txt_borde = self.game.font_menu.render(text_str, False, (0, 0, 0))
-            txt_color = self.game.font_menu.render(text_str, False, color)
-
-            x = (BASE_WIDTH // 2) - (txt_color.get_width() // 2)
+            x = (BASE_WIDTH // 2) - (self.game.font_menu.size(text_str)[0] // 2)
             y = start_y + (i * spacing)
-
-            surface.blit(txt_borde, (x + 3, y + 3))
-            surface.blit(txt_color, (x, y))
\ No newline at end of file
+            self.game.text.draw(surface, text_str, (x, y), color, "menu", "shadow")
\ No newline at end of file
@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from bench.allocs import run_guard
+from bench.frames import make_game
+
+# --- JUEGO ESTABLE SIN ASIGNAR MEMORIA (ver bench/allocs.py) ---
+TOLERANCE = 12
+
+
+@pytest.fixture(scope="module")
+def game():
+    return make_game()
+
+
+@pytest.mark.parametrize("deaths", [False, True], ids=["dios", "muertes"])
+@pytest.mark.parametrize("render", [False, True], ids=["tick", "render"])
+@pytest.mark.parametrize("vector", [False, True], ids=["objetos", "numpy"])
+def test_steady_state_does_not_grow(game, render, vector, deaths):
+    game.vector_lanes = vector
+    res = run_guard(game, level=4, ticks=2000, warmup=2400, seed=1234, render=render, deaths=deaths)
+    assert res["gc_gen0"] == 0
+    assert res["growth_blocks"] <= TOLERANCE, res["growth"]
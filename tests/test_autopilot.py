@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from simulation.autopilot import Autopilot
+from simulation.session import Session
+from simulation.world import World
+
+# --- FOTO ARMADA DE A PARTES (ver simulation/autopilot.py) ---
+# Con un tope mínimo la foto se lee de a un cuerpo por llamada mientras el
+# nivel sigue andando; tiene que predecir lo mismo que la leída de una vez.
+
+
+def _pilot(budget, vector):
+    world = World(Session(1234), vector_lanes=vector)
+    world.session.level = 6
+    world.start()
+    pilot = Autopilot(world, budget=budget)
+    calls = 1
+    pilot.next_action()
+    while pilot._pending:
+        world.step()
+        pilot.next_action()
+        calls += 1
+    bodies = [b for group in (world.cars, world.logs, world.turtles, world.crocodiles) for b in group]
+    return [pilot._tracks[id(b)] for b in bodies] + pilot._bouncers, calls
+
+
+@pytest.mark.parametrize("vector", [False, True], ids=["objetos", "numpy"])
+def test_sliced_snapshot_matches_whole(vector):
+    whole, calls = _pilot(None, vector)
+    assert calls == 1
+    sliced, calls = _pilot(1e-9, vector)
+    assert calls > 1
+    for n in range(calls, 3000):
+        # Leído más tarde, el redondeo puede correr un píxel; nunca un tick de vuelta
+        assert all(abs(a.rect_x(n) - b.rect_x(n)) <= 1 for a, b in zip(whole, sliced)), n
@@ -0,0 +1,51 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+from bench.frames import make_game
+from simulation.layout import MARGIN_X
+
+# --- RECT-SUCIO CONTRA REDIBUJADO COMPLETO ---
+# Las partículas pueden caer sobre el panel del HUD; cuando el frame siguiente
+# repone ese fondo, el texto de abajo tiene que volver a aparecer.
+
+
+@pytest.fixture(scope="module")
+def game():
+    game = make_game()
+    game.dirty_rendering = True
+    return game
+
+
+def _full_frame(game, state):
+    # Mismo frame redibujado entero en otra superficie, sin tocar el estado del rect-sucio
+    saved = (list(state._prev_rects), dict(state._hud), state._full_redraw)
+    ref = pygame.Surface(game.surface.get_size())
+    state._full_redraw = True
+    state.render(ref)
+    state._prev_rects, state._hud, state._full_redraw = saved
+    return pygame.image.tobytes(ref, "RGB")
+
+
+@pytest.mark.parametrize("event", ["squash", "extralife"])
+def test_burst_over_hud_is_repaired(game, event):
+    game.session.reset(7)
+    game.lives = 5
+    game.change_state("PLAYING")
+    state = game.states["PLAYING"]
+    for _ in range(3):
+        game.update(1 / 60); game.render()
+    # Peor caso: la rana (y el estallido de su muerte) a la altura de LIVES, sobre el panel
+    state.world.frog.rect.x, state.world.frog.rect.y = MARGIN_X // 4, 170
+    state.world.emit(event)
+    state._handle_world_events()
+    assert state.effects.count
+    bad = []
+    for frame in range(60):
+        game.render()
+        if pygame.image.tobytes(game.surface, "RGB") != _full_frame(game, state): bad.append(frame)
+        state.effects.update(1 / 60)
+    assert not bad
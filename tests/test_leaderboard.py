@@ -0,0 +1,43 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import Leaderboard, Run
+
+# --- TABLA DE PUNTAJES: NINGUNA PARTIDA SE PIERDE AL COMPACTAR ---
+
+
+def _fill(board, n, seed=1):
+    rng = random.Random(seed)
+    date = 1700000000
+    for i in range(n):
+        # De vez en cuando el reloj va para atrás
+        date += rng.randint(30, 900) if i % 50 else -rng.randint(1, 60)
+        board.add(rng.randint(0, 3000) * 10, rng.randint(1, 30), rng.randint(1000, 900000), date)
+    board.flush()
+
+
+def test_compaction_keeps_every_run(tmp_path):
+    path = str(tmp_path / "scores.dat")
+    board = Leaderboard(path, keep=20, compact_every=300)
+    _fill(board, 1000)
+    played = list(board.runs())
+    assert len(played) == 1000 and all(isinstance(r, Run) for r in played)
+
+    again = Leaderboard(path, keep=20, compact_every=300).load()
+    assert list(again.runs()) == played
+    assert len(again) == 1000
+    assert again.top(10) == board.top(10)
+    for score in (0, 5000, 15000, 30000):
+        assert again.rank(score) == 1 + sum(r.score > score for r in played)
+
+
+def test_unknown_format_is_replaced(tmp_path):
+    path = str(tmp_path / "scores.dat")
+    with open(path, "wb") as f: f.write(b"FRLB\x01" + bytes(32))
+    board = Leaderboard(path)
+    board.add(120, 2, 45000, 1700000000)
+    board.flush()
+    assert list(Leaderboard(path).load().runs()) == [Run(120, 2, 45000, 1700000000)]
@@ -0,0 +1,47 @@
+import pygame
+from arcade_machine_sdk import BASE_RESOLUTION
+
+# --- LIENZO EN RESOLUCION BASE + UN SOLO ESCALADO ---
+# Con pantallas más grandes que la base (1024x768: el campo de 640 px más el
+# HUD), el juego dibuja igual que siempre en un lienzo de la resolución base y
+# al final del frame lo agranda una sola vez, por un factor entero y sin
+# suavizar (vecino más cercano), centrado con bordes negros. Así cada frame
+# llena 1024x768 píxeles en vez de los de la pantalla y el pixel art no cambia.
+# Con render por rectángulos sucios sólo se escalan las zonas que cambiaron.
+# El lienzo no baja de la base: todos los estados dibujan en coordenadas de
+# 1024x768. Por eso no hace nada cuando la pantalla ya es de la base, que es
+# lo que entrega el Core del SDK; sólo sirve con ventanas más grandes
+# (`window_scale` en run_independently).
+class PixelUpscaler:
+    def __init__(self, target, size=BASE_RESOLUTION):
+        self.target = target
+        tw, th = target.get_size()
+        self.scale = min(tw // size[0], th // size[1])
+        # Mismo formato que la pantalla: los blits al lienzo no convierten nada
+        self.canvas = pygame.Surface(size, 0, target)
+        w, h = size[0] * self.scale, size[1] * self.scale
+        self.offset = ((tw - w) // 2, (th - h) // 2)
+        self.view = target.subsurface((self.offset, (w, h)))
+        self._bounds = self.canvas.get_rect()
+        target.fill((0, 0, 0))
+
+    @staticmethod
+    def fits(target, size=BASE_RESOLUTION):
+        """¿Hace falta (y se puede) escalar? La pantalla tiene que ser al menos el doble de la base."""
+        tw, th = target.get_size()
+        return min(tw // size[0], th // size[1]) >= 2
+
+    def present(self, dirty=None):
+        """Pasa el lienzo a la pantalla. Devuelve las zonas a presentar en pantalla (None = todo)."""
+        k = self.scale
+        if dirty is None:
+            pygame.transform.scale(self.canvas, self.view.get_size(), self.view)
+            return None
+        out = []
+        for r in dirty:
+            r = r.clip(self._bounds)
+            if not (r.w and r.h): continue
+            dst = pygame.Rect(r.x * k, r.y * k, r.w * k, r.h * k)
+            pygame.transform.scale(self.canvas.subsurface(r), dst.size, self.view.subsurface(dst))
+            out.append(dst.move(self.offset))
+        return out